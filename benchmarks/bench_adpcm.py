@@ -0,0 +1,42 @@
+"""
+Measures MS-ADPCM decoding speed, relative to real time.
+
+Run with ``python -m benchmarks.bench_adpcm [seconds of audio] [workers] [minimum real time factor]``.
+Exits with status 1 if decoding is slower than the minimum real time factor (``MIN_REALTIME_FACTOR`` by default).
+"""
+import sys
+import time
+
+from benchmarks.synthetic import generate_ms_adpcm
+from xact_types.utils.adpcm import decode_ms_adpcm, get_adpcm_block_size, get_adpcm_samples_per_block
+
+# Decoding should stay well ahead of playback, even on a single core (it runs at ~20x on a typical one)
+MIN_REALTIME_FACTOR = 10.0
+
+
+def main(audio_seconds: int = 60, workers: int = 1, min_realtime_factor: float = MIN_REALTIME_FACTOR,
+         sample_rate: int = 44100, channels: int = 2, alignment: int = 48) -> int:
+    block_size = get_adpcm_block_size(alignment, channels)
+    samples_per_block = get_adpcm_samples_per_block(block_size, channels)
+    block_count = -(-(audio_seconds * sample_rate) // samples_per_block)
+
+    adpcm_data = generate_ms_adpcm(block_count, channels, block_size)
+
+    start_time = time.perf_counter()
+    pcm_data = decode_ms_adpcm(adpcm_data, channels, block_size, workers=workers)
+    elapsed_seconds = time.perf_counter() - start_time
+
+    decoded_seconds = len(pcm_data) / (2 * channels * sample_rate)
+    realtime_factor = decoded_seconds / elapsed_seconds
+    print(f'Decoded {decoded_seconds:.1f}s of {channels}-channel {sample_rate} Hz ADPCM '
+          f'in {elapsed_seconds:.2f}s with {workers} worker(s) ({realtime_factor:.1f}x real time)')
+
+    if realtime_factor < min_realtime_factor:
+        print(f'REGRESSION: ADPCM decoding ran at {realtime_factor:.1f}x real time, '
+              f'below the minimum of {min_realtime_factor:.1f}x')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:3]), *(float(arg) for arg in sys.argv[3:4])))
@@ -0,0 +1,73 @@
+"""
+Measures how long the event loop is held up while banks load, with `load_many` and with the blocking `from_xwb`.
+
+A ticker task sleeps for 1 ms at a time while the banks load, and the lag is how late each tick wakes up -
+the delay another request handled by the same loop would see.
+
+Run with ``python -m benchmarks.bench_async_loading [bank count] [entry count] [payload size]``.
+"""
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import generate_v45_xwb
+from xact_types.models.wavebank.async_loading import load_many
+from xact_types.models.wavebank.wavebank import WaveBank
+
+_TICK_SECONDS = 0.001
+
+
+async def _measure_lag(load) -> list[float]:
+    lags = []
+    loading = True
+
+    async def tick():
+        while loading:
+            start_time = time.perf_counter()
+            await asyncio.sleep(_TICK_SECONDS)
+            lags.append(time.perf_counter() - start_time - _TICK_SECONDS)
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.sleep(0)
+    try:
+        await load()
+    finally:
+        loading = False
+        await ticker
+
+    return lags
+
+
+def main(bank_count: int = 8, entry_count: int = 256, payload_size: int = 256 * 1024):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        xwb_paths = []
+        for bank_index in range(bank_count):
+            xwb_path = Path(temp_dir) / f'bank_{bank_index}.xwb'
+            xwb_path.write_bytes(generate_v45_xwb(entry_count, payload_size))
+            xwb_paths.append(xwb_path)
+
+        async def load_blocking():
+            for xwb_path in xwb_paths:
+                WaveBank.from_xwb(xwb_path)
+
+        async def load_async():
+            async for _ in load_many(xwb_paths):
+                pass
+
+        print(f'Loading {bank_count} banks of {entry_count} entries of {payload_size} bytes:')
+        for name, load in (('from_xwb', load_blocking), ('load_many', load_async)):
+            start_time = time.perf_counter()
+            lags = sorted(asyncio.run(_measure_lag(load)))
+            seconds = time.perf_counter() - start_time
+
+            p99_lag = lags[min(len(lags) - 1, (99 * len(lags)) // 100)]
+            print(f'  {name:>9}: {seconds * 1000:8.1f} ms, event loop lag '
+                  f'median {statistics.median(lags) * 1000:.2f} ms, p99 {p99_lag * 1000:.2f} ms, '
+                  f'max {lags[-1] * 1000:.2f} ms')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
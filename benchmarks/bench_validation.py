@@ -0,0 +1,29 @@
+"""
+Compares the load time of each `WaveBank` validation mode.
+
+Run with ``python -m benchmarks.bench_validation [entry count] [payload size]``.
+"""
+import sys
+import timeit
+from typing import get_args
+
+from benchmarks.synthetic import generate_v45_xwb
+from xact_types.models.utils import ValidationMode
+from xact_types.models.wavebank.wavebank import WaveBank
+
+
+def main(entry_count: int = 20000, payload_size: int = 64, repeat: int = 5):
+    xwb_bytes = generate_v45_xwb(entry_count, payload_size)
+
+    timings = {
+        mode: min(timeit.repeat(lambda: WaveBank.from_buffer(xwb_bytes, validate=mode), number=1, repeat=repeat))
+        for mode in get_args(ValidationMode)
+    }
+
+    print(f'Loading {entry_count} entries of {payload_size} bytes (best of {repeat}):')
+    for mode, seconds in timings.items():
+        print(f'  {mode:>8}: {seconds * 1000:8.1f} ms ({timings["full"] / seconds:.2f}x vs. full)')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
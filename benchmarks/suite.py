@@ -0,0 +1,247 @@
+"""
+Measures the throughput and peak memory of the main wave bank operations on synthetic banks,
+optionally writing the results as JSON and comparing them against a stored baseline.
+
+Run with ``python -m benchmarks.suite [--output results.json] [--baseline baseline.json] [--threshold 0.2]``.
+Exits with status 1 if any benchmark is slower than its baseline by more than the threshold.
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from benchmarks.synthetic import DEFAULT_CODEC_MIX, generate_ms_adpcm, generate_v45_xwb
+from checksums.crc import calc_crc16b
+from xact_types.models.wavebank.wavebank import WaveBank
+from xact_types.utils.adpcm import decode_ms_adpcm, get_adpcm_block_size, get_adpcm_samples_per_block
+from xact_types.utils.pcm import PcmFormat, convert_sound_effects
+from xact_types.utils.wavebank_audio_format import decode_audio_format
+
+RESULTS_FORMAT_VERSION = 1
+
+# The fraction a benchmark may slow down by, relative to its baseline, before it is flagged
+DEFAULT_REGRESSION_THRESHOLD = 0.2
+# Benchmarks faster than this in the baseline are dominated by timer noise, so aren't compared
+MIN_COMPARED_SECONDS = 0.001
+
+
+class BankConfig(NamedTuple):
+    name: str
+    entry_count: int
+    payload_size: int
+    compact: bool = False
+    mixed_codecs: bool = False
+
+
+DEFAULT_BANK_CONFIGS = (
+    BankConfig('many_small', entry_count=5000, payload_size=256),
+    BankConfig('few_large', entry_count=16, payload_size=1024 * 1024),
+    BankConfig('compact', entry_count=5000, payload_size=256, compact=True),
+    BankConfig('mixed_codecs', entry_count=5000, payload_size=256, mixed_codecs=True),
+)
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    # Best wall time of all repeats
+    seconds: float
+    bytes_processed: int
+    items_processed: int
+    # Peak memory allocated by Python while running once (measured separately, as tracing slows the run down)
+    peak_memory_bytes: int
+    # The duration of the audio processed, for benchmarks that process audio
+    audio_seconds: float = 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return (self.bytes_processed / (1024 * 1024)) / self.seconds if self.seconds else 0.0
+
+    @property
+    def realtime_factor(self) -> float:
+        """Seconds of audio processed per second of wall time."""
+        return self.audio_seconds / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> dict:
+        return dict(self._asdict(), megabytes_per_second=self.megabytes_per_second,
+                    realtime_factor=self.realtime_factor)
+
+
+class Regression(NamedTuple):
+    name: str
+    baseline_seconds: float
+    seconds: float
+
+    @property
+    def slowdown(self) -> float:
+        return self.seconds / self.baseline_seconds
+
+
+def measure(name: str, benchmark: Callable[[], object], bytes_processed: int, items_processed: int = 1,
+            repeat: int = 5, audio_seconds: float = 0.0) -> BenchmarkResult:
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        benchmark()
+        timings.append(time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    try:
+        benchmark()
+        _, peak_memory_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(name, min(timings), bytes_processed, items_processed, peak_memory_bytes, audio_seconds)
+
+
+def run_bank_benchmarks(config: BankConfig, work_dir: Path, repeat: int = 5) -> list[BenchmarkResult]:
+    xwb_bytes = generate_v45_xwb(config.entry_count, config.payload_size, compact=config.compact,
+                                 codec_mix=DEFAULT_CODEC_MIX if config.mixed_codecs else None)
+    xwb_path = work_dir / f'{config.name}.xwb'
+    xwb_path.write_bytes(xwb_bytes)
+
+    wavebank = WaveBank.from_xwb(xwb_path)
+    extract_dir = work_dir / f'{config.name}_extracted'
+    extract_dir.mkdir(exist_ok=True)
+
+    formats = [stream.format for stream in wavebank.streams]
+    version = wavebank.header.version
+
+    results = [
+        measure(f'{config.name}/from_xwb', lambda: WaveBank.from_xwb(xwb_path),
+                len(xwb_bytes), config.entry_count, repeat),
+        measure(f'{config.name}/from_xwb_lazy', lambda: WaveBank.from_xwb(xwb_path, lazy=True),
+                len(xwb_bytes), config.entry_count, repeat),
+    ]
+
+    # The encoder writes full entry metadata, which doesn't fit before the play region of a large compact bank
+    if not config.compact:
+        results.append(measure(f'{config.name}/encode_as_v45_pc_xwb', wavebank.encode_as_v45_pc_xwb,
+                               len(xwb_bytes), config.entry_count, repeat))
+
+    return results + [
+        measure(f'{config.name}/extract_raw_pcm_sounds', lambda: wavebank.extract_raw_pcm_sounds(extract_dir),
+                len(xwb_bytes), config.entry_count, repeat),
+        # Decoding is memoized, so both the cached lookup and the underlying decode are measured
+        measure(f'{config.name}/decode_audio_format',
+                lambda: [decode_audio_format(audio_format, version) for audio_format in formats],
+                4 * len(formats), len(formats), repeat),
+        measure(f'{config.name}/decode_audio_format_uncached',
+                lambda: [decode_audio_format.__wrapped__(audio_format, version) for audio_format in formats],
+                4 * len(formats), len(formats), repeat),
+    ]
+
+
+def run_conversion_benchmarks(entry_count: int = 16, payload_size: int = 64 * 1024,
+                              repeat: int = 5) -> list[BenchmarkResult]:
+    """Measures converting the sounds of a stereo 16-bit 44.1kHz bank to a few common target formats."""
+    wavebank = WaveBank.from_buffer(generate_v45_xwb(entry_count, payload_size))
+    audio_seconds = sum(len(sound.audio_data) / (sound.block_alignment * sound.sample_rate)
+                        for sound in wavebank.sounds)
+    bytes_processed = entry_count * payload_size
+
+    return [
+        measure(f'convert_sounds/{name}', lambda target=target: convert_sound_effects(wavebank.sounds, target),
+                bytes_processed, entry_count, repeat, audio_seconds)
+        for name, target in (
+            ('8_bit', PcmFormat(8)),
+            ('mono', PcmFormat(16, channels=1)),
+            ('22050hz', PcmFormat(16, sample_rate=22050)),
+            ('8_bit_mono_22050hz', PcmFormat(8, sample_rate=22050, channels=1)),
+        )
+    ]
+
+
+def run_adpcm_benchmarks(audio_seconds: int = 5, repeat: int = 5) -> list[BenchmarkResult]:
+    """Measures decoding stereo 44.1kHz MS-ADPCM (see ``benchmarks.bench_adpcm``), so slowdowns are compared too."""
+    channels, sample_rate = 2, 44100
+    block_size = get_adpcm_block_size(48, channels)
+    block_count = -(-(audio_seconds * sample_rate) // get_adpcm_samples_per_block(block_size, channels))
+    adpcm_data = generate_ms_adpcm(block_count, channels, block_size)
+    decoded_seconds = (block_count * get_adpcm_samples_per_block(block_size, channels)) / sample_rate
+
+    return [measure('decode_ms_adpcm', lambda: decode_ms_adpcm(adpcm_data, channels, block_size), len(adpcm_data),
+                    block_count, repeat, decoded_seconds)]
+
+
+def run_benchmarks(bank_configs: tuple[BankConfig, ...] = DEFAULT_BANK_CONFIGS, crc_size: int = 16 * 1024 * 1024,
+                   repeat: int = 5) -> list[BenchmarkResult]:
+    results = []
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for config in bank_configs:
+            results += run_bank_benchmarks(config, Path(temp_dir), repeat)
+
+    results += run_conversion_benchmarks(repeat=repeat)
+    results += run_adpcm_benchmarks(repeat=repeat)
+
+    crc_data = bytes(range(256)) * (crc_size // 256)
+    results.append(measure('calc_crc16b', lambda: calc_crc16b(crc_data), len(crc_data), repeat=repeat))
+
+    return results
+
+
+def get_results_document(results: list[BenchmarkResult]) -> dict:
+    return dict(
+        format_version=RESULTS_FORMAT_VERSION,
+        python=platform.python_version(),
+        implementation=platform.python_implementation(),
+        platform=platform.platform(),
+        results=[result.to_dict() for result in results]
+    )
+
+
+def find_regressions(results: list[BenchmarkResult], baseline: dict,
+                     threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> list[Regression]:
+    """
+    Returns every benchmark more than ``threshold`` slower than in ``baseline`` (a results document).
+    Benchmarks missing from the baseline, or too quick in it to time reliably, are skipped.
+    """
+    baseline_seconds = {
+        result['name']: result['seconds'] for result in baseline['results'] if result['seconds'] >= MIN_COMPARED_SECONDS
+    }
+
+    return [
+        Regression(result.name, baseline_seconds[result.name], result.seconds)
+        for result in results
+        if result.name in baseline_seconds and result.seconds > baseline_seconds[result.name] * (1 + threshold)
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmarks wave bank operations on synthetic banks.')
+    parser.add_argument('--output', type=Path, help='Where to write the results, as JSON.')
+    parser.add_argument('--baseline', type=Path, help='Results to compare against, from a previous --output.')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help='The fraction a benchmark may slow down by before it is flagged.')
+    parser.add_argument('--repeat', type=int, default=5)
+    arguments = parser.parse_args(argv)
+
+    results = run_benchmarks(repeat=arguments.repeat)
+
+    for result in results:
+        print(f'{result.name:<48} {result.seconds * 1000:10.2f} ms {result.megabytes_per_second:10.1f} MiB/s '
+              f'{result.peak_memory_bytes / (1024 * 1024):8.1f} MiB peak'
+              + (f' {result.realtime_factor:8.1f}x realtime' if result.audio_seconds else ''))
+
+    if arguments.output is not None:
+        arguments.output.write_text(json.dumps(get_results_document(results), indent=2))
+
+    if arguments.baseline is None:
+        return 0
+
+    regressions = find_regressions(results, json.loads(arguments.baseline.read_text()), arguments.threshold)
+    for regression in regressions:
+        print(f'REGRESSION: {regression.name} took {regression.seconds * 1000:.2f} ms '
+              f'({regression.slowdown:.2f}x its baseline of {regression.baseline_seconds * 1000:.2f} ms)')
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
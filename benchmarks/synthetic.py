@@ -0,0 +1,96 @@
+import random
+import struct
+from typing import Sequence
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.enums.wavebank_flags import WaveBankFlags
+from xact_types.utils.wavebank_audio_format import encode_v2plus_audio_format, decode_audio_format, \
+    decode_v2plus_bits_per_sample_flag
+
+STEREO_16_BIT_PCM_FORMAT = encode_v2plus_audio_format(
+    codec=MiniFormatTag.Pcm, channels=2, rate=44100, alignment=4, bits_per_sample=1
+)
+MONO_8_BIT_PCM_FORMAT = encode_v2plus_audio_format(
+    codec=MiniFormatTag.Pcm, channels=1, rate=22050, alignment=1, bits_per_sample=0
+)
+STEREO_ADPCM_FORMAT = encode_v2plus_audio_format(
+    codec=MiniFormatTag.Adpcm, channels=2, rate=44100, alignment=48, bits_per_sample=0
+)
+
+# A mix of the codecs and layouts found in typical banks
+DEFAULT_CODEC_MIX = (STEREO_16_BIT_PCM_FORMAT, MONO_8_BIT_PCM_FORMAT, STEREO_ADPCM_FORMAT)
+
+_COMPACT_ALIGNMENT = 4
+
+
+def _get_duration(audio_format: int, payload_size: int) -> int:
+    """The sample count stored for a payload, which is only derived for PCM (as in banks built without durations)."""
+    wave_format = decode_audio_format(audio_format, 45)
+    if wave_format.codec != MiniFormatTag.Pcm:
+        return 0
+    return payload_size // ((decode_v2plus_bits_per_sample_flag(wave_format.bits_per_sample) // 8) * wave_format.channels)
+
+
+def generate_v45_xwb(entry_count: int, payload_size: int, bank_name: str = 'SyntheticBank',
+                     audio_format: int = STEREO_16_BIT_PCM_FORMAT, compact: bool = False,
+                     codec_mix: Sequence[int] | None = None) -> bytes:
+    """
+    Generates a little-endian v45 wave bank with ``entry_count`` entries of ``payload_size`` bytes each.
+
+    Every entry uses ``audio_format``, unless ``codec_mix`` is given, in which case entries cycle through its formats.
+    Compact banks share a single format between entries, so can't be given a mix, and pad each payload to 4 bytes.
+
+    The bank is packed directly rather than with `WaveBank`, so generating it doesn't affect what is measured.
+    """
+    if compact and codec_mix:
+        raise ValueError('Compact banks share one format between every entry, so can not mix codecs.')
+
+    entry_formats = [codec_mix[i % len(codec_mix)] if codec_mix else audio_format for i in range(entry_count)]
+    entry_length = 4 if compact else 24
+    slot_size = -(-payload_size // _COMPACT_ALIGNMENT) * _COMPACT_ALIGNMENT if compact else payload_size
+    play_region_length = (entry_count * slot_size) - (slot_size - payload_size)
+
+    header_length = 4 + 4 + 4 + (5 * 8)
+    data_length = 4 + 4 + 64 + (4 * 4) + 8
+    metadata_offset = header_length + data_length
+    metadata_length = entry_count * entry_length
+    play_region_offset = -(-(metadata_offset + metadata_length) // 2048) * 2048
+
+    xwb = bytearray(b'WBND' + struct.pack('<ii', 45, 43))
+    for offset, length in ((header_length, data_length), (metadata_offset, metadata_length), (0, 0), (0, 0),
+                           (play_region_offset, play_region_length)):
+        xwb += struct.pack('<II', offset, length)
+
+    xwb += struct.pack('<ii', WaveBankFlags.compact_format if compact else 0, entry_count)
+    xwb += bank_name.encode('ascii').ljust(64, b'\0')
+    xwb += struct.pack('<iiiIQ', entry_length, 64, _COMPACT_ALIGNMENT, audio_format if compact else 0, 0)
+
+    for i, entry_format in enumerate(entry_formats):
+        if compact:
+            xwb += struct.pack('<I', (i * slot_size) // _COMPACT_ALIGNMENT)
+        else:
+            xwb += struct.pack('<IIIIII', _get_duration(entry_format, payload_size) << 4, entry_format,
+                               i * payload_size, payload_size, 0, 0)
+
+    xwb += bytes(play_region_offset - len(xwb))
+    payload = (bytes(range(256)) * -(-payload_size // 256))[:payload_size].ljust(slot_size, b'\0')
+    xwb += (payload * entry_count)[:play_region_length]
+
+    return bytes(xwb)
+
+
+def generate_ms_adpcm(block_count: int, channels: int, block_size: int, seed: int = 0) -> bytes:
+    """Generates ``block_count`` MS-ADPCM blocks with valid headers and random nibbles."""
+    rng = random.Random(seed)
+    header_struct = struct.Struct(f'<{channels}B{3 * channels}h')
+
+    blocks = bytearray()
+    for _ in range(block_count):
+        blocks += header_struct.pack(
+            *(rng.randrange(7) for _ in range(channels)),
+            *(rng.randrange(16, 512) for _ in range(channels)),
+            *(rng.randrange(-4096, 4096) for _ in range(2 * channels))
+        )
+        blocks += rng.randbytes(block_size - header_struct.size)
+
+    return bytes(blocks)
@@ -1,6 +1,8 @@
+import binascii
+import functools
 from copy import deepcopy
 
-from typing_extensions import NamedTuple
+from typing_extensions import NamedTuple, Buffer
 
 
 class CrcAlgorithmArguments(NamedTuple):
@@ -31,6 +33,10 @@ def reverse_number_bit_order(initial_value: int, num_bits: int):
     return result
 
 
+# Maps every byte to itself with its bits reversed, for use with `bytes.translate`
+_BYTE_BIT_REVERSAL_TABLE = bytes(reverse_number_bit_order(byte, 8) for byte in range(256))
+
+
 def calc_crc_per_bit(width: int, input: bytes, poly: int, remainder: int,
                      reflect_input_bytes: bool, reflect_final_output: bool, xor_final_output: int):
     # https://github.com/gchq/CyberChef/blob/master/src/core/operations/CRCChecksum.mjs#L787
@@ -59,16 +65,111 @@ def calc_crc_per_bit(width: int, input: bytes, poly: int, remainder: int,
     return remainder ^ xor_final_output
 
 
+@functools.cache
+def get_crc_table(args: CrcAlgorithmArguments) -> tuple[int, ...]:
+    """
+    Returns the 256-entry lookup table for ``args``, computing it on first use.
+
+    Algorithms with reflected input get a table for the reflected (LSB-first) register,
+    so input bytes never need their bits reversed.
+    Registers narrower than 8 bits are widened to 8 bits for non-reflected algorithms.
+    """
+    if args.reflect_input_bytes:
+        poly = reverse_number_bit_order(args.poly, args.width)
+
+        table = []
+        for byte in range(256):
+            value = byte
+            for _ in range(8):
+                value = (value >> 1) ^ poly if value & 1 else value >> 1
+            table.append(value)
+    else:
+        width = max(args.width, 8)
+        top_bit = 1 << (width - 1)
+        mask = (1 << width) - 1
+        poly = args.poly << (width - args.width)
+
+        table = []
+        for byte in range(256):
+            value = byte << (width - 8)
+            for _ in range(8):
+                value = ((value << 1) ^ poly) & mask if value & top_bit else (value << 1) & mask
+            table.append(value)
+
+    return tuple(table)
+
+
+class Crc:
+    """
+    A table-driven CRC with a ``hashlib``-style interface, so data can be checksummed incrementally as it streams.
+
+    ``digest`` returns the CRC as big-endian bytes (matching the convention of other CRC libraries),
+    while ``value`` returns it as an integer.
+    """
+
+    def __init__(self, args: CrcAlgorithmArguments, data: Buffer = b''):
+        self.args = args
+        self.digest_size = (args.width + 7) // 8
+
+        self._table = get_crc_table(args)
+        # The register is kept widened to at least 8 bits for non-reflected algorithms (see `get_crc_table`)
+        self._shift = 0 if args.reflect_input_bytes else max(8 - args.width, 0)
+        self._register = (reverse_number_bit_order(args.remainder, args.width) if args.reflect_input_bytes
+                          else args.remainder << self._shift)
+
+        # `binascii.crc_hqx` implements the non-reflected 0x1021 polynomial in C,
+        # which reflected algorithms can use by reversing each byte's bits (also in C) beforehand.
+        self._uses_crc_hqx = args.width == 16 and args.poly == 0x1021
+
+        self.update(data)
+
+    def update(self, data: Buffer) -> None:
+        if self._uses_crc_hqx:
+            if self.args.reflect_input_bytes:
+                # Convert the register back to its non-reflected form for the duration of the call
+                register = reverse_number_bit_order(self._register, 16)
+                register = binascii.crc_hqx(bytes(data).translate(_BYTE_BIT_REVERSAL_TABLE), register)
+                self._register = reverse_number_bit_order(register, 16)
+            else:
+                self._register = binascii.crc_hqx(data, self._register)
+            return
+
+        table = self._table
+        register = self._register
+
+        if self.args.reflect_input_bytes:
+            for byte in memoryview(data).cast('B'):
+                register = table[(register ^ byte) & 0xFF] ^ (register >> 8)
+        else:
+            width = self.args.width + self._shift
+            top_byte_shift = width - 8
+            mask = (1 << width) - 1
+            for byte in memoryview(data).cast('B'):
+                register = table[((register >> top_byte_shift) ^ byte) & 0xFF] ^ ((register << 8) & mask)
+
+        self._register = register
+
+    def value(self) -> int:
+        register = self._register >> self._shift
+
+        # The register is held in reflected form for reflected input, so only reflect it if the two settings differ
+        if self.args.reflect_input_bytes != self.args.reflect_final_output:
+            register = reverse_number_bit_order(register, self.args.width)
+
+        return register ^ self.args.xor_final_output
+
+    def digest(self) -> bytes:
+        return self.value().to_bytes(length=self.digest_size, byteorder='big')
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+    def copy(self) -> 'Crc':
+        return deepcopy(self)
+
+
 def calc_crc16b(input: bytes):
-    return calc_crc_per_bit(
-        width=CRC_16_B_ARGS.width,
-        input=input,
-        poly=CRC_16_B_ARGS.poly,
-        remainder=CRC_16_B_ARGS.remainder,
-        reflect_input_bytes=CRC_16_B_ARGS.reflect_input_bytes,
-        reflect_final_output=CRC_16_B_ARGS.reflect_final_output,
-        xor_final_output=CRC_16_B_ARGS.xor_final_output
-    )
+    return Crc(CRC_16_B_ARGS, input).value()
 
 
 def calc_soundbank_crc(input: bytes) -> bytes:
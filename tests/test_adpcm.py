@@ -0,0 +1,87 @@
+import struct
+import unittest
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.models.wavebank.wavebank import WaveBank
+from xact_types.utils.adpcm import decode_ms_adpcm, decode_adpcm_sound_effect, get_adpcm_block_size, \
+    get_adpcm_samples_per_block
+from xact_types.utils.wavebank_audio_format import encode_v2plus_audio_format
+from xwb_samples import build_v45_xwb
+
+
+def pack_pcm(samples: list[int]) -> bytes:
+    return struct.pack(f'<{len(samples)}h', *samples)
+
+
+class TestMsAdpcm(unittest.TestCase):
+    def test_mono_block(self):
+        # Predictor 0, delta 16, then sample 1 and sample 2 (stored newest first)
+        block = struct.pack('<Bhhh', 0, 16, 100, 50) + bytes([0x1F])
+
+        self.assertEqual(decode_ms_adpcm(block, 1, len(block)), pack_pcm([50, 100, 116, 100]))
+
+    def test_stereo_block(self):
+        # High nibbles belong to the left channel and low nibbles to the right
+        block = struct.pack('<BBhhhhhh', 0, 1, 16, 32, 100, -100, 50, -50) + bytes([0x1F, 0x70])
+
+        # Left: 100 + 16 = 116, then 116 + (7 * 16) = 228
+        # Right: ((-100 * 512) + (-50 * -256)) / 256 - 32 = -182, then ((-182 * 512) + (-100 * -256)) / 256 = -264
+        self.assertEqual(decode_ms_adpcm(block, 2, len(block)), pack_pcm([50, -50, 100, -100, 116, -182, 228, -264]))
+
+    def test_samples_are_clamped(self):
+        block = struct.pack('<Bhhh', 1, 2048, 32000, 0) + bytes([0x77])
+
+        self.assertEqual(decode_ms_adpcm(block, 1, len(block)), pack_pcm([0, 32000, 32767, 32767]))
+
+    def test_multiple_blocks_and_partial_block(self):
+        block = struct.pack('<Bhhh', 0, 16, 100, 50) + bytes([0x1F])
+        partial_block = struct.pack('<Bhhh', 0, 16, 7, 6)
+
+        self.assertEqual(decode_ms_adpcm(block * 2 + partial_block, 1, len(block)),
+                         pack_pcm([50, 100, 116, 100] * 2 + [6, 7]))
+
+    def test_parallel_decoding_matches_serial(self):
+        block_size = get_adpcm_block_size(alignment=2, channels=2)
+        blocks = b''.join(
+            struct.pack('<BBhhhhhh', i % 7, (i + 3) % 7, 16 + i, 20, i, -i, 2 * i, -2 * i)
+            + bytes((i * 37 + j) % 256 for j in range(block_size - 14))
+            for i in range(20)
+        )
+
+        self.assertEqual(decode_ms_adpcm(blocks, 2, block_size, workers=2, blocks_per_job=3),
+                         decode_ms_adpcm(blocks, 2, block_size))
+
+    def test_invalid_predictor_is_rejected(self):
+        with self.assertRaises(ValueError):
+            decode_ms_adpcm(struct.pack('<Bhhh', 7, 16, 0, 0), 1, 7)
+
+    def test_adpcm_bank_loads_and_decodes(self):
+        alignment = 10
+        block_size = get_adpcm_block_size(alignment, channels=1)
+        adpcm_format = encode_v2plus_audio_format(
+            codec=MiniFormatTag.Adpcm, channels=1, rate=22050, alignment=alignment, bits_per_sample=0
+        )
+        block = struct.pack('<Bhhh', 0, 16, 100, 50) + bytes(block_size - 7)
+
+        wavebank = WaveBank.from_buffer(build_v45_xwb([block * 3], audio_format=adpcm_format))
+        sound = wavebank.sounds[0]
+        pcm_sound = decode_adpcm_sound_effect(sound)
+
+        self.assertEqual(sound.codec, MiniFormatTag.Adpcm)
+        self.assertEqual(pcm_sound.codec, MiniFormatTag.Pcm)
+        self.assertEqual(pcm_sound.block_alignment, 2)
+        self.assertEqual(len(pcm_sound.audio_data), 3 * 2 * get_adpcm_samples_per_block(block_size, 1))
+
+    def test_missing_adpcm_duration_is_calculated_on_write(self):
+        alignment = 10
+        block_size = get_adpcm_block_size(alignment, channels=1)
+        adpcm_format = encode_v2plus_audio_format(
+            codec=MiniFormatTag.Adpcm, channels=1, rate=22050, alignment=alignment, bits_per_sample=0
+        )
+        wavebank = WaveBank.from_buffer(build_v45_xwb([bytes(block_size * 3)], audio_format=adpcm_format))
+        wavebank.streams[0].flags_and_duration = 0
+
+        rewritten = WaveBank.from_buffer(wavebank.encode_as_v45_pc_xwb())
+
+        self.assertEqual(rewritten.streams[0].flags_and_duration >> 4,
+                         3 * get_adpcm_samples_per_block(block_size, 1))
@@ -0,0 +1,103 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from xact_types.models.wavebank.async_loading import load_many
+from xact_types.models.wavebank.wavebank import WaveBank, XwbValidationError
+from xact_types.utils.aio import ByteBudget
+from xwb_samples import build_v45_xwb
+
+
+class TestAsyncLoading(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls._xwb_paths = []
+        for bank_index in range(5):
+            xwb_path = Path(cls._temp_dir.name) / f'bank_{bank_index}.xwb'
+            xwb_path.write_bytes(build_v45_xwb([bytes([bank_index]) * (64 * (i + 1)) for i in range(4)]))
+            cls._xwb_paths.append(xwb_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._temp_dir.cleanup()
+
+    def test_afrom_xwb_matches_from_xwb(self):
+        xwb_path = self._xwb_paths[0]
+        wavebank = WaveBank.from_xwb(xwb_path)
+
+        for lazy in (False, True):
+            with self.subTest(lazy=lazy):
+                async_wavebank = asyncio.run(WaveBank.afrom_xwb(xwb_path, lazy=lazy, read_batch_size=100))
+
+                self.assertEqual(async_wavebank.streams, wavebank.streams)
+                self.assertEqual([bytes(sound.audio_data) for sound in async_wavebank.sounds],
+                                 [sound.audio_data for sound in wavebank.sounds])
+
+    def test_truncated_file_is_rejected(self):
+        truncated_path = Path(self._temp_dir.name) / 'truncated.xwb'
+        truncated_path.write_bytes(self._xwb_paths[0].read_bytes()[:-1])
+
+        with self.assertRaises(XwbValidationError):
+            asyncio.run(WaveBank.afrom_xwb(truncated_path))
+
+    def test_load_many(self):
+        async def load_banks() -> list[WaveBank]:
+            return [wavebank async for wavebank in load_many(self._xwb_paths, concurrency=2, max_bytes_in_flight=700)]
+
+        wavebanks = asyncio.run(load_banks())
+
+        self.assertEqual(sorted(wavebank.file_name for wavebank in wavebanks), sorted(self._xwb_paths))
+        for wavebank in wavebanks:
+            bank_index = self._xwb_paths.index(wavebank.file_name)
+            self.assertEqual(bytes(wavebank.sounds[3].audio_data), bytes([bank_index]) * 256)
+
+    def test_cancellation_closes_file(self):
+        opened_files = []
+
+        def open_file(*args, **kwargs):
+            opened_files.append(open(*args, **kwargs))
+            return opened_files[-1]
+
+        async def cancel_load():
+            # One payload is read at a time, so the load is still reading when it is cancelled
+            load = asyncio.create_task(WaveBank.afrom_xwb(self._xwb_paths[0], read_batch_size=1))
+            while not opened_files:
+                await asyncio.sleep(0)
+            load.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await load
+
+        with mock.patch('xact_types.models.wavebank.wavebank.open', open_file, create=True):
+            asyncio.run(cancel_load())
+
+        self.assertEqual(len(opened_files), 1)
+        self.assertTrue(opened_files[0].closed)
+
+    def test_byte_budget(self):
+        events = []
+
+        async def hold(name: str, size: int, budget: ByteBudget):
+            async with budget.reserve(size):
+                events.append(f'{name} start')
+                await asyncio.sleep(0.01)
+                events.append(f'{name} end')
+
+        async def run_holds():
+            budget = ByteBudget(100)
+            # The oversized reservation waits until nothing else is held, then is held on its own
+            await asyncio.gather(hold('a', 60, budget), hold('b', 60, budget), hold('c', 200, budget),
+                                 hold('d', 40, budget))
+            return budget.bytes_in_flight
+
+        self.assertEqual(asyncio.run(run_holds()), 0)
+        # `d` fits alongside `a`, but `b` has to wait for it
+        self.assertEqual(events[:2], ['a start', 'd start'])
+        self.assertLess(events.index('a end'), events.index('b start'))
+        self.assertEqual(events[events.index('c start') + 1], 'c end')
+
+
+if __name__ == '__main__':
+    unittest.main()
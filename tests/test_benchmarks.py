@@ -0,0 +1,69 @@
+import contextlib
+import io
+import unittest
+
+from benchmarks import bench_adpcm
+from benchmarks.suite import BenchmarkResult, find_regressions, run_adpcm_benchmarks, run_conversion_benchmarks
+from benchmarks.synthetic import DEFAULT_CODEC_MIX, generate_v45_xwb
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.models.wavebank.wavebank import WaveBank
+
+
+class TestSyntheticBanks(unittest.TestCase):
+    def test_compact_bank(self):
+        wavebank = WaveBank.from_buffer(generate_v45_xwb(4, 1002, compact=True))
+
+        # Compact entries run up to the next entry, so all but the last include their padding
+        self.assertEqual([len(sound.audio_data) for sound in wavebank.sounds], [1004, 1004, 1004, 1002])
+
+    def test_codec_mix(self):
+        wavebank = WaveBank.from_buffer(generate_v45_xwb(6, 256, codec_mix=DEFAULT_CODEC_MIX))
+
+        self.assertEqual([sound.codec for sound in wavebank.sounds], [MiniFormatTag.Pcm, MiniFormatTag.Pcm,
+                                                                      MiniFormatTag.Adpcm] * 2)
+        self.assertEqual([sound.channels for sound in wavebank.sounds], [2, 1, 2] * 2)
+
+
+class TestConversionBenchmarks(unittest.TestCase):
+    def test_realtime_factor(self):
+        results = run_conversion_benchmarks(entry_count=2, payload_size=4 * 44100, repeat=1)
+
+        # Each entry holds a second of stereo 16-bit 44.1kHz audio
+        self.assertTrue(all(result.audio_seconds == 2.0 for result in results))
+        self.assertTrue(all(result.realtime_factor > 0 for result in results))
+        self.assertIn('realtime_factor', results[0].to_dict())
+
+    def test_adpcm_realtime_factor(self):
+        (result,) = run_adpcm_benchmarks(audio_seconds=1, repeat=1)
+
+        self.assertAlmostEqual(result.audio_seconds, 1.0, delta=0.01)
+        self.assertGreater(result.realtime_factor, 0)
+
+    def test_adpcm_benchmark_enforces_minimum(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(bench_adpcm.main(1, min_realtime_factor=0), 0)
+            self.assertEqual(bench_adpcm.main(1, min_realtime_factor=float('inf')), 1)
+
+        self.assertIn('REGRESSION', output.getvalue())
+
+
+class TestRegressions(unittest.TestCase):
+    def test_find_regressions(self):
+        baseline = {'results': [
+            dict(name='slower', seconds=1.0),
+            dict(name='similar', seconds=1.0),
+            dict(name='too_quick', seconds=0.0001),
+        ]}
+        results = [
+            BenchmarkResult('slower', 1.5, 0, 0, 0),
+            BenchmarkResult('similar', 1.1, 0, 0, 0),
+            BenchmarkResult('too_quick', 0.01, 0, 0, 0),
+            BenchmarkResult('new', 10.0, 0, 0, 0),
+        ]
+
+        self.assertEqual([regression.name for regression in find_regressions(results, baseline, threshold=0.2)],
+                         ['slower'])
+
+
+if __name__ == '__main__':
+    unittest.main()
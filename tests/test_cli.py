@@ -0,0 +1,137 @@
+import contextlib
+import io
+import json
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+from xact_types.cli import main
+from xact_types.models.wavebank.scan import scan_xwb
+from xwb_samples import build_v45_xwb
+
+_PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _run_python(code: str) -> str:
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=_PACKAGE_ROOT, capture_output=True,
+                            text=True, check=True, env=dict(os.environ, PYTHONPATH=str(_PACKAGE_ROOT)))
+    return result.stdout + result.stderr
+
+
+def _get_import_time(module_name: str) -> int:
+    """Returns the cumulative time (in microseconds) taken to import ``module_name`` in a fresh interpreter."""
+    for line in _run_python(f'import {module_name}').splitlines():
+        fields = [field.strip() for field in line.removeprefix('import time:').split('|')]
+        if fields[-1] == module_name:
+            return int(fields[1])
+    raise AssertionError(f'{module_name} was not imported.')
+
+
+class TestCli(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls._xwb_path = Path(cls._temp_dir.name) / 'test.xwb'
+        cls._payloads = [bytes(range(64)), bytes(range(32))]
+        cls._xwb_path.write_bytes(build_v45_xwb(cls._payloads, entry_names=['intro', 'outro']))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._temp_dir.cleanup()
+
+    def _run(self, *argv: str) -> tuple[int, str]:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = main(argv)
+        return status, output.getvalue()
+
+    def test_info(self):
+        status, output = self._run('info', str(self._xwb_path), '--json')
+        info = json.loads(output)
+
+        self.assertEqual(status, 0)
+        self.assertEqual(info['bank_name'], 'TestBank')
+        self.assertEqual(info['byte_order'], 'little')
+        self.assertEqual((info['entry_count'], info['audio_length']), (2, 96))
+        self.assertEqual(info['play_region_offset'], 2048)
+
+    def test_list(self):
+        status, output = self._run('list', str(self._xwb_path), '--json')
+        rows = json.loads(output)
+
+        self.assertEqual(status, 0)
+        self.assertEqual([row['name'] for row in rows], ['intro', 'outro'])
+        self.assertEqual([(row['file_offset'], row['file_length']) for row in rows], [(0, 64), (64, 32)])
+        self.assertEqual((rows[0]['codec'], rows[0]['channels'], rows[0]['rate'], rows[0]['bits_per_sample']),
+                         ('Pcm', 2, 44100, 16))
+        self.assertEqual(rows[0]['duration'], 16)
+
+    def test_info_matches_model_for_empty_play_region_offset(self):
+        xwb_path = Path(self._temp_dir.name) / 'no_play_region_offset.xwb'
+        xwb_bytes = bytearray(self._xwb_path.read_bytes())
+        # The play region segment's offset, which readers calculate from the entry table when it's 0
+        struct.pack_into('<I', xwb_bytes, 12 + (4 * 8), 0)
+        xwb_path.write_bytes(xwb_bytes)
+
+        info = json.loads(self._run('info', str(xwb_path), '--json')[1])
+
+        self.assertEqual(info['play_region_offset'], scan_xwb(xwb_path).play_region_offset)
+        self.assertEqual(info['play_region_offset'], 148 + (2 * 24))
+
+    def test_pack_extract_and_verify(self):
+        wav_dir = Path(self._temp_dir.name) / 'Packed'
+        wav_dir.mkdir()
+        with wave.open(str(wav_dir / 'tone.wav'), 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(1)
+            wav_file.setframerate(22050)
+            wav_file.writeframes(bytes(range(100)))
+
+        packed_path = Path(self._temp_dir.name) / 'packed.xwb'
+        self.assertEqual(self._run('pack', str(wav_dir), str(packed_path))[0], 0)
+        self.assertEqual(json.loads(self._run('list', str(packed_path), '--json')[1])[0]['name'], 'tone')
+
+        extract_dir = Path(self._temp_dir.name) / 'extracted'
+        self.assertEqual(self._run('extract', str(packed_path), '-o', str(extract_dir), '--workers', '1')[0], 0)
+        self.assertEqual(len(list(extract_dir.glob('*.wav'))), 1)
+
+        self.assertEqual(self._run('verify', str(packed_path), str(self._xwb_path))[0], 0)
+
+    def test_verify_reports_invalid_files(self):
+        invalid_path = Path(self._temp_dir.name) / 'invalid.xwb'
+        invalid_path.write_bytes(self._xwb_path.read_bytes()[:200])
+
+        status, output = self._run('verify', str(self._xwb_path), str(invalid_path))
+
+        self.assertEqual(status, 1)
+        self.assertIn(f'{self._xwb_path}: OK', output)
+        self.assertIn(f'{invalid_path}: segment_bounds: ', output)
+
+    def test_info_and_list_skip_heavy_imports(self):
+        output = _run_python(
+            'import sys\n'
+            'from xact_types.cli import main\n'
+            f'main(["info", {str(self._xwb_path)!r}])\n'
+            f'main(["list", {str(self._xwb_path)!r}])\n'
+            'print("heavy modules:", sorted(name for name in ("pydantic", "xact_types.models.wavebank.wavebank") '
+            'if name in sys.modules))\n'
+        )
+
+        self.assertIn('heavy modules: []', output)
+
+    def test_import_time(self):
+        cli_import_time = _get_import_time('xact_types.cli')
+        models_import_time = _get_import_time('xact_types.models.wavebank.wavebank')
+        print(f'\nxact_types.cli imports in {cli_import_time / 1000:.1f} ms '
+              f'(the wave bank models take {models_import_time / 1000:.1f} ms)')
+
+        self.assertLess(cli_import_time, models_import_time)
+
+
+if __name__ == '__main__':
+    unittest.main()
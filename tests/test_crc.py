@@ -1,6 +1,8 @@
 import unittest
+import zlib
 
-from checksums.crc import reverse_number_bit_order, calc_crc16b, calc_soundbank_crc
+from checksums.crc import reverse_number_bit_order, calc_crc16b, calc_soundbank_crc, calc_crc_per_bit, Crc, \
+    CrcAlgorithmArguments, CRC_16_B_ARGS
 
 
 class TestV2plusAudioFormat(unittest.TestCase):
@@ -39,6 +41,52 @@ class TestV2plusAudioFormat(unittest.TestCase):
         )
 
 
+class TestCrcEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._data = bytes(range(256)) * 3 + b'GM_BGM_911'
+        cls._crc_32_args = CrcAlgorithmArguments(
+            width=32, poly=0x04C11DB7, remainder=0xFFFFFFFF,
+            reflect_input_bytes=True, reflect_final_output=True, xor_final_output=0xFFFFFFFF
+        )
+
+    def test_matches_per_bit_calculation(self):
+        algorithms = (
+            CRC_16_B_ARGS,
+            self._crc_32_args,
+            CrcAlgorithmArguments(16, 0x1021, 0xFFFF, False, False, 0x0000),
+            CrcAlgorithmArguments(16, 0x8005, 0x0000, True, False, 0x0012),
+            CrcAlgorithmArguments(16, 0x8005, 0x1234, False, True, 0x0000),
+            CrcAlgorithmArguments(8, 0x07, 0x00, False, False, 0x00),
+            CrcAlgorithmArguments(5, 0x05, 0x1F, True, True, 0x1F),
+            CrcAlgorithmArguments(5, 0x09, 0x00, False, False, 0x00),
+        )
+
+        for args in algorithms:
+            with self.subTest(args=args):
+                self.assertEqual(Crc(args, self._data).value(), calc_crc_per_bit(args.width, self._data, *args[1:]))
+
+    def test_crc_32_matches_zlib(self):
+        self.assertEqual(Crc(self._crc_32_args, self._data).value(), zlib.crc32(self._data))
+
+    def test_incremental_updates(self):
+        for args in (CRC_16_B_ARGS, self._crc_32_args):
+            with self.subTest(args=args):
+                crc = Crc(args)
+                for i in range(0, len(self._data), 100):
+                    crc.update(self._data[i:i + 100])
+
+                self.assertEqual(crc.digest(), Crc(args, self._data).digest())
+
+    def test_copy_is_independent(self):
+        crc = Crc(CRC_16_B_ARGS, self._data[:10])
+        crc_copy = crc.copy()
+        crc_copy.update(self._data[10:])
+
+        self.assertEqual(crc.value(), calc_crc16b(self._data[:10]))
+        self.assertEqual(crc_copy.value(), calc_crc16b(self._data))
+
+
 def get_int_bit_count(value: int) -> int:
     count = 0
     while value:
@@ -0,0 +1,42 @@
+import unittest
+
+from xact_types.models.wavebank.entry_segments import decode_entry_names, encode_entry_names, decode_seek_tables, \
+    encode_seek_tables, find_seek_packet, get_entry_name_index
+
+
+class TestEntrySegments(unittest.TestCase):
+    def test_entry_names_round_trip(self):
+        names = ('first', '', 'third')
+        segment = encode_entry_names(names)
+
+        self.assertEqual(len(segment), 3 * 64)
+        self.assertEqual(decode_entry_names(segment, 3, 64), names)
+
+    def test_entry_name_too_long(self):
+        with self.assertRaises(ValueError):
+            encode_entry_names(['a' * 64])
+
+    def test_entry_name_index(self):
+        self.assertEqual(get_entry_name_index(['a', '', 'b', 'a']), {'a': 0, 'b': 2})
+
+    def test_seek_tables_round_trip(self):
+        seek_tables = [[4096, 8192], None, [1024]]
+        decoded_tables = decode_seek_tables(encode_seek_tables(seek_tables), 3)
+
+        self.assertEqual([None if table is None else list(table) for table in decoded_tables], seek_tables)
+
+    def test_truncated_seek_table(self):
+        with self.assertRaises(ValueError):
+            decode_seek_tables(encode_seek_tables([[1, 2, 3]])[:-4], 1)
+
+    def test_find_seek_packet(self):
+        seek_table = [4096, 8192, 12288]
+
+        self.assertEqual(find_seek_packet(seek_table, 0), 0)
+        self.assertEqual(find_seek_packet(seek_table, 4095), 0)
+        self.assertEqual(find_seek_packet(seek_table, 4096), 1)
+        self.assertEqual(find_seek_packet(seek_table, 100000), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from xact_types.models.wavebank.extraction import extract_raw_pcm_sounds_from_banks
+from xact_types.models.wavebank.wavebank import WaveBank
+from xwb_samples import build_v45_xwb
+
+
+class TestPcmExtraction(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls._temp_path = Path(cls._temp_dir.name)
+
+        cls._xwb_paths = []
+        for bank_idx in range(2):
+            xwb_path = cls._temp_path / f'bank_{bank_idx}.xwb'
+            payloads = [bytes([bank_idx * 16 + i]) * (256 * (i + 1)) for i in range(5)]
+            xwb_path.write_bytes(build_v45_xwb(payloads, bank_name=f'Bank{bank_idx}'))
+            cls._xwb_paths.append(xwb_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._temp_dir.cleanup()
+
+    def _extract_serially(self, xwb_path: Path) -> tuple[list[Path | None], list[bytes]]:
+        extract_dir = Path(tempfile.mkdtemp(dir=self._temp_path))
+        paths = WaveBank.from_xwb(xwb_path).extract_raw_pcm_sounds(extract_dir)
+        return paths, [path.read_bytes() for path in paths]
+
+    def test_parallel_extraction_matches_serial(self):
+        serial_paths, serial_files = self._extract_serially(self._xwb_paths[0])
+
+        for use_processes in (False, True):
+            with self.subTest(use_processes=use_processes):
+                extract_dir = Path(tempfile.mkdtemp(dir=self._temp_path))
+                paths = WaveBank.from_xwb(self._xwb_paths[0], lazy=True).extract_raw_pcm_sounds(
+                    extract_dir, workers=3, use_processes=use_processes, max_bytes_in_flight=1024
+                )
+
+                self.assertEqual([path.name for path in paths], [path.name for path in serial_paths])
+                self.assertEqual([path.read_bytes() for path in paths], serial_files)
+
+    def test_batch_extraction_matches_serial(self):
+        extract_dir = Path(tempfile.mkdtemp(dir=self._temp_path))
+        bank_paths = extract_raw_pcm_sounds_from_banks(self._xwb_paths, extract_dir, workers=4,
+                                                       max_bytes_in_flight=1024)
+
+        self.assertEqual(len(bank_paths), len(self._xwb_paths))
+        for xwb_path, paths in zip(self._xwb_paths, bank_paths):
+            with self.subTest(xwb_path=xwb_path):
+                serial_paths, serial_files = self._extract_serially(xwb_path)
+
+                self.assertEqual([path.name for path in paths], [path.name for path in serial_paths])
+                self.assertEqual([path.read_bytes() for path in paths], serial_files)
@@ -0,0 +1,107 @@
+import logging
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from xact_types.models.wavebank.wavebank import WaveBank
+from xact_types.utils.instrumentation import DISABLED_INSTRUMENTATION, Instrumentation
+from xwb_samples import build_v45_xwb
+
+
+class TestInstrumentation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._payloads = [bytes([i]) * (300 * (i + 1)) for i in range(3)]
+        cls._xwb_bytes = build_v45_xwb(cls._payloads, entry_names=['a', 'b', 'c'])
+
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls._xwb_path = Path(cls._temp_dir.name) / 'test.xwb'
+        cls._xwb_path.write_bytes(cls._xwb_bytes)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._temp_dir.cleanup()
+
+    def test_load_records_each_phase(self):
+        instrumentation = Instrumentation()
+        WaveBank.from_xwb(self._xwb_path, instrumentation=instrumentation)
+
+        phases = instrumentation.to_dict()
+        self.assertEqual(list(phases), ['header', 'entry_table', 'segments', 'payloads', 'validation'])
+
+        self.assertEqual(phases['entry_table']['items'], 3)
+        self.assertEqual(phases['payloads']['bytes'], sum(map(len, self._payloads)))
+        self.assertEqual(phases['segments']['bytes'], 3 * 64)
+        # Every byte read from the file is counted, along with the reads that fetched it
+        self.assertEqual(sum(phase['io_bytes'] for phase in phases.values()), len(self._xwb_bytes))
+        self.assertGreater(phases['header']['syscalls'], 0)
+        self.assertTrue(all(phase['runs'] == 1 for phase in phases.values()))
+
+    def test_buffer_load_reads_no_files(self):
+        instrumentation = Instrumentation()
+        WaveBank.from_buffer(self._xwb_bytes, instrumentation=instrumentation)
+
+        self.assertEqual(instrumentation.phases['payloads'].bytes, sum(map(len, self._payloads)))
+        self.assertTrue(all(stats.syscalls == 0 for stats in instrumentation.phases.values()))
+
+    def test_encode_records_each_phase(self):
+        wavebank = WaveBank.from_xwb(self._xwb_path)
+
+        instrumentation = Instrumentation()
+        written = wavebank.write_xwb(Path(self._temp_dir.name) / 'encoded.xwb', instrumentation=instrumentation)
+
+        phases = instrumentation.phases
+        self.assertEqual(set(phases), {'segments', 'padding', 'header', 'entry_table', 'payloads'})
+        self.assertEqual(phases['segments'].runs, 2)
+        self.assertEqual(phases['entry_table'].bytes, 3 * 24)
+        self.assertEqual(phases['payloads'].io_bytes, written)
+        self.assertGreater(phases['payloads'].syscalls, 0)
+
+    def test_phase_end_callback_and_logging(self):
+        ended_phases = []
+        instrumentation = Instrumentation(on_phase_end=lambda name, stats: ended_phases.append(name))
+        WaveBank.from_buffer(self._xwb_bytes, instrumentation=instrumentation)
+
+        self.assertEqual(ended_phases, list(instrumentation.phases))
+
+        with self.assertLogs('test_instrumentation', logging.INFO) as logs:
+            instrumentation.log(logging.getLogger('test_instrumentation'))
+        self.assertEqual(len(logs.records), len(ended_phases))
+
+    def test_threads_count_towards_their_own_phases(self):
+        instrumentation = Instrumentation()
+        # Both threads are inside their phases before either counts anything, then each leaves in turn
+        both_started = threading.Barrier(2)
+        first_ended = threading.Event()
+
+        def run_phase(name: str, item_count: int, wait_for_other: bool):
+            with instrumentation.phase(name):
+                both_started.wait()
+                if wait_for_other:
+                    first_ended.wait()
+                instrumentation.count(items=item_count)
+            if not wait_for_other:
+                first_ended.set()
+
+        threads = [threading.Thread(target=run_phase, args=('first', 1, False)),
+                   threading.Thread(target=run_phase, args=('second', 10, True))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual({name: stats.items for name, stats in instrumentation.phases.items()},
+                         {'first': 1, 'second': 10})
+
+    def test_disabled_instrumentation_records_nothing(self):
+        WaveBank.from_xwb(self._xwb_path, instrumentation=DISABLED_INSTRUMENTATION)
+
+        with DISABLED_INSTRUMENTATION.phase('header'):
+            DISABLED_INSTRUMENTATION.count(bytes=1, items=1)
+
+        self.assertEqual(DISABLED_INSTRUMENTATION.to_dict(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
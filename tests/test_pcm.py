@@ -0,0 +1,107 @@
+import struct
+import unittest
+from array import array
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.models.wavebank.wavebank import WaveBank
+from xact_types.utils.pcm import PcmFormat, convert_channels, convert_pcm, convert_sound_effect, \
+    convert_sound_effects, decode_pcm, encode_pcm, resample, swap_pcm16_byte_order
+from xact_types.utils.wavebank_audio_format import decode_audio_format, encode_v2plus_audio_format
+from xwb_samples import build_v45_xwb
+
+
+def pack_pcm(samples: list[int]) -> bytes:
+    return struct.pack(f'<{len(samples)}h', *samples)
+
+
+class TestPcm(unittest.TestCase):
+    def test_swap_pcm16_byte_order(self):
+        self.assertEqual(swap_pcm16_byte_order(b'\x01\x02\x03\x04'), b'\x02\x01\x04\x03')
+        self.assertEqual(swap_pcm16_byte_order(memoryview(b'\x01\x02\x03')), b'\x02\x01\x03')
+        self.assertEqual(swap_pcm16_byte_order(b''), b'')
+
+    def test_bit_depth_conversion(self):
+        # 8-bit PCM is unsigned, centred on 128
+        self.assertEqual(list(decode_pcm(bytes([0, 128, 255]), 8)), [-32768, 0, 32512])
+        self.assertEqual(encode_pcm(array('h', [-32768, 0, 32767, 255]), 8), bytes([0, 128, 255, 128]))
+
+        self.assertEqual(list(decode_pcm(struct.pack('>2h', 1, -2), 16, big_endian=True)), [1, -2])
+        self.assertEqual(encode_pcm(array('h', [1, -2]), 16, big_endian=True), struct.pack('>2h', 1, -2))
+
+    def test_channel_conversion(self):
+        self.assertEqual(list(convert_channels(array('h', [10, 20, -5, -7]), 2, 1)), [15, -6])
+        self.assertEqual(list(convert_channels(array('h', [1, 2, 3, 4, 5, 6]), 3, 1)), [2, 5])
+        self.assertEqual(list(convert_channels(array('h', [1, 2]), 1, 2)), [1, 1, 2, 2])
+
+        with self.assertRaises(ValueError):
+            convert_channels(array('h', [1, 2, 3, 4, 5, 6]), 3, 2)
+
+    def test_resample(self):
+        # Upsampling interpolates between neighbouring frames of each channel, holding the last one
+        self.assertEqual(list(resample(array('h', [0, 100, 10, 200]), 2, 1, 2)), [0, 100, 5, 150, 10, 200, 10, 200])
+        self.assertEqual(list(resample(array('h', [0, 1, 2, 3, 4, 5]), 1, 3, 1)), [0, 3])
+
+    def test_convert_pcm(self):
+        stereo_8_bit = bytes([128, 255, 0, 128])
+        self.assertEqual(convert_pcm(stereo_8_bit, 2, 22050, 8, PcmFormat(16, sample_rate=22050, channels=1)),
+                         pack_pcm([(0 + 32512) >> 1, (-32768 + 0) >> 1]))
+        self.assertEqual(convert_pcm(stereo_8_bit, 2, 22050, 8, PcmFormat(8)), stereo_8_bit)
+
+    def test_convert_adpcm_sound_effect(self):
+        # Predictor 0, delta 16, then sample 1 and sample 2 (stored newest first), padded to a 23 byte block
+        block = struct.pack('<Bhhh', 0, 16, 100, 50) + bytes([0x1F]) + bytes(15)
+        wavebank = WaveBank.from_buffer(build_v45_xwb([block], audio_format=encode_v2plus_audio_format(
+            MiniFormatTag.Adpcm, channels=1, rate=8000, alignment=1, bits_per_sample=0
+        )))
+
+        sound = convert_sound_effect(wavebank.sounds[0], PcmFormat(16, sample_rate=16000))
+
+        self.assertEqual((sound.codec, sound.channels, sound.sample_rate, sound.block_alignment),
+                         (MiniFormatTag.Pcm, 1, 16000, 2))
+        # The block decodes to 34 samples, which are doubled
+        self.assertEqual(len(sound.audio_data), 2 * 68)
+        self.assertEqual(sound.audio_data[:16], pack_pcm([50, 75, 100, 108, 116, 108, 100, 100]))
+
+    def test_convert_wavebank_sounds(self):
+        mono_8_bit_format = encode_v2plus_audio_format(MiniFormatTag.Pcm, channels=1, rate=22050, alignment=1,
+                                                       bits_per_sample=0)
+        payloads = [bytes(range(0, 200, 2)), bytes(range(50))]
+        wavebank = WaveBank.from_buffer(build_v45_xwb(payloads, audio_format=mono_8_bit_format,
+                                                      loop_regions=[(10, 20), (0, 0)]))
+
+        wavebank.convert_sounds(PcmFormat(16, sample_rate=44100, channels=2), indices=[0])
+
+        stream, sound = wavebank.streams[0], wavebank.sounds[0]
+        wave_format = decode_audio_format(stream.format, wavebank.header.version)
+        self.assertEqual((wave_format.channels, wave_format.rate, wave_format.alignment, wave_format.bits_per_sample),
+                         (2, 44100, 4, 1))
+        self.assertEqual(stream.file_length, len(sound.audio_data))
+        self.assertEqual(stream.file_length, 200 * 4)
+        self.assertEqual(stream.flags_and_duration >> 4, 200)
+        self.assertEqual((stream.loop_start, stream.loop_length), (20, 40))
+        self.assertEqual((sound.loop_start, sound.loop_length), (20, 40))
+
+        # Unconverted entries are untouched, and the bank still encodes and loads
+        self.assertEqual(bytes(wavebank.sounds[1].audio_data), payloads[1])
+        reloaded_wavebank = WaveBank.from_buffer(wavebank.encode_as_v45_pc_xwb())
+        self.assertEqual([bytes(sound.audio_data) for sound in reloaded_wavebank.sounds],
+                         [sound.audio_data, payloads[1]])
+
+    def test_convert_uses_format_bit_depth(self):
+        # 16-bit mono audio, whose block alignment doesn't match its bit depth
+        padded_16_bit_format = encode_v2plus_audio_format(MiniFormatTag.Pcm, channels=1, rate=22050, alignment=4,
+                                                          bits_per_sample=1)
+        samples = [100, -100, 200, -200]
+        wavebank = WaveBank.from_buffer(build_v45_xwb([pack_pcm(samples)], audio_format=padded_16_bit_format))
+
+        wavebank.convert_sounds(PcmFormat(8))
+
+        self.assertEqual(wavebank.sounds[0].audio_data, encode_pcm(array('h', samples), 8))
+        self.assertEqual(wavebank.sounds[0].block_alignment, 1)
+
+        with self.assertRaises(ValueError):
+            convert_sound_effects(wavebank.sounds, PcmFormat(16), bits_per_sample=[8, 8])
+
+
+if __name__ == '__main__':
+    unittest.main()
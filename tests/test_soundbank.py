@@ -0,0 +1,100 @@
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+from xact_types.models.soundbank.soundbank import SoundBank, WaveReference, XsbValidationError
+from xsb_samples import EXAMPLE_XSB_CRC_DATA, EXAMPLE_XSB_CRC, build_xsb
+
+
+class TestSoundBank(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._example_xsb = b'SDBK' + struct.pack('<HHHQ', 43, 46, EXAMPLE_XSB_CRC, 0) + EXAMPLE_XSB_CRC_DATA
+        cls._xsb = build_xsb(
+            simple_cues={'music': (0, 3), 'jump': (1, 0)},
+            complex_cues={'footstep': [(0, 1), (0, 2), (1, 4)]},
+            wave_bank_names=('Music', 'Effects')
+        )
+        # One clip with a PlayWave event and a track variation event (which repeats its wave), then another clip
+        cls._complex_sound_xsb = build_xsb(
+            simple_cues={'music': (0, 3)},
+            complex_cues={'footstep': [(1, 4)]},
+            complex_sounds={'explosion': [[(1, 5), [(1, 6), (0, 2), (1, 5)]], [(0, 7)]]},
+            wave_bank_names=('Music', 'Effects')
+        )
+
+    def test_example_soundbank(self):
+        soundbank = SoundBank.from_buffer(self._example_xsb)
+
+        self.assertEqual(soundbank.header.bank_name, '911')
+        self.assertEqual(soundbank.wave_bank_names, ['911'])
+        self.assertEqual(soundbank.cue_names, ['GM_BGM_911'])
+        self.assertEqual(soundbank.get_waves('GM_BGM_911'), (WaveReference(0, '911', 0),))
+
+    def test_resolves_simple_and_complex_cues(self):
+        soundbank = SoundBank.from_buffer(self._xsb)
+
+        self.assertEqual(list(soundbank), ['music', 'jump', 'footstep'])
+        self.assertEqual(soundbank.get_waves('music'), (WaveReference(0, 'Music', 3),))
+        self.assertEqual(soundbank.get_waves('jump'), (WaveReference(1, 'Effects', 0),))
+
+        footstep = soundbank.get_cue('footstep')
+        self.assertEqual(footstep.index, 2)
+        self.assertEqual([variation.waves for variation in footstep.variations],
+                         [(WaveReference(0, 'Music', 1),), (WaveReference(0, 'Music', 2),),
+                          (WaveReference(1, 'Effects', 4),)])
+        self.assertEqual((footstep.variations[0].min_weight, footstep.variations[0].max_weight), (0, 255))
+
+    def test_resolves_complex_sounds(self):
+        soundbank = SoundBank.from_buffer(self._complex_sound_xsb)
+
+        self.assertEqual(list(soundbank), ['music', 'footstep', 'explosion'])
+        explosion = soundbank.get_cue('explosion')
+        self.assertEqual(len(explosion.variations), 1)
+
+        variation = explosion.variations[0]
+        self.assertTrue(variation.sound.complex)
+        self.assertEqual((variation.min_weight, variation.max_weight), (10, 200))
+        self.assertEqual(variation.waves, (WaveReference(1, 'Effects', 5), WaveReference(1, 'Effects', 6),
+                                           WaveReference(0, 'Music', 2), WaveReference(0, 'Music', 7)))
+        self.assertEqual(explosion.waves, variation.waves)
+        self.assertEqual(soundbank.get_waves('footstep'), (WaveReference(1, 'Effects', 4),))
+
+    def test_cues_are_parsed_lazily_and_cached(self):
+        soundbank = SoundBank.from_buffer(self._xsb)
+        self.assertEqual(soundbank._cues, [None, None, None])
+
+        cue = soundbank.get_cue('jump')
+        self.assertIs(soundbank.get_cue(1), cue)
+        self.assertEqual(soundbank._cues[0], None)
+        self.assertEqual(soundbank._cues[2], None)
+
+    def test_unknown_cue(self):
+        soundbank = SoundBank.from_buffer(self._xsb)
+
+        self.assertNotIn('missing', soundbank)
+        with self.assertRaises(KeyError):
+            soundbank.get_cue('missing')
+
+    def test_crc_mismatch(self):
+        corrupt_xsb = build_xsb(simple_cues={'music': (0, 0)}, corrupt_crc=True)
+
+        with self.assertRaises(XsbValidationError):
+            SoundBank.from_buffer(corrupt_xsb)
+        self.assertEqual(SoundBank.from_buffer(corrupt_xsb, verify_crc=False).cue_names, ['music'])
+
+    def test_from_xsb(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xsb_path = Path(temp_dir) / 'test.xsb'
+            xsb_path.write_bytes(self._xsb)
+
+            soundbank = SoundBank.from_xsb(xsb_path)
+
+        self.assertEqual(soundbank.file_name, xsb_path)
+        self.assertEqual(soundbank.header.bank_name, 'TestSounds')
+        self.assertEqual(len(soundbank), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from xact_types.models.wavebank.stream_info import StreamInfo
+from xact_types.models.wavebank.stream_table import StreamTable
+
+
+class TestStreamTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._streams = tuple(
+            StreamInfo(flags_and_duration=i << 4, format=0x100 + (i % 3), file_offset=i * 1000,
+                       file_length=1000, loop_start=i, loop_length=i * 2)
+            for i in range(10)
+        )
+
+    def test_round_trip(self):
+        stream_table = StreamTable.from_stream_infos(self._streams)
+
+        self.assertEqual(len(stream_table), len(self._streams))
+        self.assertEqual(stream_table.to_stream_infos(), self._streams)
+        self.assertEqual(stream_table.nbytes, 24 * len(self._streams))
+
+    def test_rows_match_stream_infos(self):
+        stream_table = StreamTable.from_stream_infos(self._streams)
+
+        for row, stream in zip(stream_table, self._streams):
+            with self.subTest(stream=stream):
+                self.assertEqual(row, stream)
+                self.assertEqual(row.file_offset, stream.file_offset)
+
+    def test_row_writes_go_to_columns(self):
+        stream_table = StreamTable.from_stream_infos(self._streams)
+        stream_table[-1].file_length = 5
+
+        self.assertEqual(stream_table.file_lengths[-1], 5)
+        with self.assertRaises(ValueError):
+            stream_table[0].file_length = -1
+
+    def test_bulk_queries(self):
+        stream_table = StreamTable.from_stream_infos(self._streams)
+
+        self.assertEqual(stream_table.total_file_length(), sum(stream.file_length for stream in self._streams))
+        self.assertEqual(list(stream_table.file_offsets), [stream.file_offset for stream in self._streams])
+        self.assertEqual(stream_table.indices_with_format(0x101), [1, 4, 7])
+        self.assertEqual(stream_table.indices_with_format(0x200), [])
+
+    def test_missing_columns_are_zeroed(self):
+        stream_table = StreamTable({'file_offset': [4, 8]})
+
+        self.assertEqual(stream_table[1], StreamInfo(file_offset=8))
@@ -0,0 +1,120 @@
+import asyncio
+import itertools
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from xact_types.models.wavebank.scan import scan_xwb
+from xact_types.models.wavebank.streaming import iter_entry_chunks, aiter_entry_chunks, iter_chunk_ranges
+from xact_types.utils.file_io import read_at
+from xwb_samples import build_v45_xwb
+
+
+class TestEntryStreaming(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._payloads = [bytes(range(256)) * 4, bytes(range(200))]
+
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        xwb_path = Path(cls._temp_dir.name) / 'streaming.xwb'
+        # The second entry (4-byte stereo samples) loops over bytes 40 to 120
+        xwb_path.write_bytes(build_v45_xwb(cls._payloads, flags=0x1, loop_regions=[(0, 0), (10, 20)]))
+        cls._xwb_scan = scan_xwb(xwb_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._temp_dir.cleanup()
+
+    def test_chunks_are_aligned(self):
+        chunk_ranges = list(iter_chunk_ranges(self._xwb_scan, 0, chunk_size=100))
+
+        self.assertEqual(sum(length for _, length in chunk_ranges), len(self._payloads[0]))
+        for offset, length in chunk_ranges[1:]:
+            self.assertEqual(offset % 100, 0)
+        for offset, length in chunk_ranges[:-1]:
+            self.assertEqual((offset + length) % 100, 0)
+
+    def test_chunks_match_payload(self):
+        self.assertTrue(self._xwb_scan.streaming)
+
+        for index, payload in enumerate(self._payloads):
+            with self.subTest(index=index):
+                self.assertEqual(b''.join(iter_entry_chunks(self._xwb_scan, index, chunk_size=64)), payload)
+
+    def test_finite_loops(self):
+        payload = self._payloads[1]
+        expected_audio = payload[:120] + (payload[40:120] * 2) + payload[120:]
+
+        self.assertEqual(b''.join(iter_entry_chunks(self._xwb_scan, 1, chunk_size=64, loops=2)), expected_audio)
+
+    def test_infinite_loop(self):
+        payload = self._payloads[1]
+        chunks = iter_entry_chunks(self._xwb_scan, 1, chunk_size=64, loops=None)
+
+        audio = b''.join(itertools.islice(chunks, 50))
+        chunks.close()
+
+        self.assertEqual(audio[:120], payload[:120])
+        self.assertEqual(audio[120:200], payload[40:120])
+        self.assertEqual(audio[200:280], payload[40:120])
+
+    def test_async_chunks_match_sync_chunks(self):
+        async def collect_chunks(index: int, loops: int) -> list[bytes]:
+            return [chunk async for chunk in aiter_entry_chunks(self._xwb_scan, index, chunk_size=64, loops=loops,
+                                                                prefetch=3)]
+
+        for index, loops in ((0, 0), (1, 3)):
+            with self.subTest(index=index, loops=loops):
+                self.assertEqual(asyncio.run(collect_chunks(index, loops)),
+                                 list(iter_entry_chunks(self._xwb_scan, index, chunk_size=64, loops=loops)))
+
+    def test_async_infinite_loop_can_stop_early(self):
+        async def take_chunks(count: int) -> list[bytes]:
+            chunks = aiter_entry_chunks(self._xwb_scan, 1, chunk_size=64, loops=None)
+            taken = []
+            async for chunk in chunks:
+                taken.append(chunk)
+                if len(taken) == count:
+                    break
+            await chunks.aclose()
+            return taken
+
+        self.assertEqual(len(asyncio.run(take_chunks(20))), 20)
+
+    def test_async_cancellation_closes_file_after_reads(self):
+        opened_files = []
+        read_started = threading.Event()
+        reads_after_close = []
+
+        def slow_read_at(file, *args):
+            opened_files.append(file)
+            read_started.set()
+            time.sleep(0.05)
+            reads_after_close.append(file.closed)
+            return read_at(file, *args)
+
+        async def cancel_stream():
+            async def consume():
+                async for _ in aiter_entry_chunks(self._xwb_scan, 0, chunk_size=64):
+                    pass
+
+            stream = asyncio.create_task(consume())
+            while not read_started.is_set():
+                await asyncio.sleep(0.001)
+            stream.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await stream
+
+        with mock.patch('xact_types.models.wavebank.streaming.read_at', slow_read_at):
+            asyncio.run(cancel_stream())
+
+            # The file is closed on the stream's thread, once the read that was running has finished
+            deadline = time.monotonic() + 5
+            while not opened_files[0].closed and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.assertTrue(opened_files[0].closed)
+        self.assertEqual(reads_after_close, [False])
@@ -0,0 +1,267 @@
+import datetime
+import io
+import struct
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.models.sound_effect.sound_effect import SoundEffect
+from xact_types.models.wavebank.scan import scan_xwb
+from xact_types.models.wavebank.wavebank import WaveBank, XwbValidationError
+from xact_types.models.wavebank.stream_info import StreamInfo
+from xact_types.models.wavebank.wavebank_data import WaveBankData
+from xact_types.models.wavebank.wavebank_header import WaveBankHeader
+from xact_types.utils.wavebank_audio_format import encode_v2plus_audio_format
+from xact_types.utils.pcm import swap_pcm16_byte_order
+from xwb_samples import build_v45_xwb
+
+
+class TestWaveBank(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._build_date = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        cls._build_time = (int(cls._build_date.timestamp()) * 10000000) + 116444736000000000
+
+        cls._payloads = [bytes([i]) * (400 * (i + 1)) for i in range(4)]
+        cls._xwb_bytes = build_v45_xwb(cls._payloads, build_time=cls._build_time)
+
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls._xwb_path = Path(cls._temp_dir.name) / 'test.xwb'
+        cls._xwb_path.write_bytes(cls._xwb_bytes)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._temp_dir.cleanup()
+
+    def test_eager_load(self):
+        wavebank = WaveBank.from_xwb(self._xwb_path)
+
+        self.assertEqual(wavebank.data.bank_name, 'TestBank')
+        self.assertEqual([bytes(sound.audio_data) for sound in wavebank.sounds], self._payloads)
+
+    def test_lazy_load_matches_eager_load(self):
+        eager_wavebank = WaveBank.from_xwb(self._xwb_path)
+        lazy_wavebank = WaveBank.from_xwb(self._xwb_path, lazy=True)
+
+        self.assertEqual(lazy_wavebank.streams, eager_wavebank.streams)
+        for lazy_sound, eager_sound in zip(lazy_wavebank.sounds, eager_wavebank.sounds):
+            with self.subTest(sound=lazy_sound):
+                self.assertIsInstance(lazy_sound.audio_data, memoryview)
+                self.assertEqual(bytes(lazy_sound.audio_data), eager_sound.audio_data)
+
+    def test_lazy_load_can_be_closed(self):
+        with WaveBank.from_xwb(self._xwb_path, lazy=True) as wavebank:
+            self.assertEqual(bytes(wavebank.sounds[0].audio_data), self._payloads[0])
+            mapping = wavebank._mapping
+
+        self.assertTrue(mapping.closed)
+        with self.assertRaises(ValueError):
+            bytes(wavebank.sounds[0].audio_data)
+        # Closing again, or closing an eagerly loaded bank, does nothing
+        wavebank.close()
+        WaveBank.from_xwb(self._xwb_path).close()
+
+    def test_empty_file_is_rejected_by_both_modes(self):
+        empty_path = Path(self._temp_dir.name) / 'empty.xwb'
+        empty_path.write_bytes(b'')
+
+        for lazy in (False, True):
+            with self.subTest(lazy=lazy):
+                with self.assertRaises(XwbValidationError):
+                    WaveBank.from_xwb(empty_path, lazy=lazy)
+
+    def test_buffer_load_is_zero_copy(self):
+        buffer = bytearray(self._xwb_bytes)
+        wavebank = WaveBank.from_buffer(buffer)
+
+        first_offset = wavebank.play_region_offset + wavebank.streams[0].file_offset
+        buffer[first_offset] = 0xFF
+
+        self.assertEqual(wavebank.sounds[0].audio_data[0], 0xFF)
+
+    def test_truncated_file_is_rejected(self):
+        truncated_path = Path(self._temp_dir.name) / 'truncated.xwb'
+        truncated_path.write_bytes(self._xwb_bytes[:-1])
+
+        with self.assertRaises(XwbValidationError):
+            WaveBank.from_xwb(truncated_path)
+
+    def test_truncated_buffer_is_rejected(self):
+        with self.assertRaises(ValueError):
+            WaveBank.from_buffer(self._xwb_bytes[:-1])
+
+    def test_validation_modes_match(self):
+        full_wavebank = WaveBank.from_buffer(self._xwb_bytes, validate='full')
+
+        for mode in ('deferred', 'none'):
+            with self.subTest(mode=mode):
+                wavebank = WaveBank.from_buffer(self._xwb_bytes, validate=mode)
+
+                self.assertEqual(wavebank.streams, full_wavebank.streams)
+                self.assertEqual(wavebank.sounds, full_wavebank.sounds)
+                self.assertEqual(wavebank.header, full_wavebank.header)
+
+    def test_deferred_validation_rejects_invalid_banks(self):
+        # A format with no channels can't produce a valid `SoundEffect`
+        invalid_xwb = build_v45_xwb(self._payloads, audio_format=0)
+
+        with self.assertRaises(ValueError):
+            WaveBank.from_buffer(invalid_xwb, validate='deferred')
+        with self.assertRaises(ValueError):
+            WaveBank.from_buffer(invalid_xwb, validate='full')
+
+        self.assertEqual(WaveBank.from_buffer(invalid_xwb, validate='none').sounds[0].channels, 0)
+
+    def test_compact_entry_table(self):
+        compact_xwb = build_v45_xwb(self._payloads, compact=True)
+        _, _, stream_table, *_ = WaveBank._read_layout(io.BytesIO(compact_xwb))
+
+        expected_offsets = [sum(len(payload) for payload in self._payloads[:i]) for i in range(len(self._payloads))]
+
+        self.assertEqual(stream_table.to_stream_infos(), tuple(
+            StreamInfo(file_offset=offset, file_length=len(payload))
+            for offset, payload in zip(expected_offsets, self._payloads)
+        ))
+
+    def test_entry_fields_are_unsigned(self):
+        xwb_bytes = bytearray(self._xwb_bytes)
+        # The first entry's flags and duration, with the high bit set (as for very long entries)
+        struct.pack_into('<I', xwb_bytes, 148, 0x80000010)
+        wavebank = WaveBank.from_buffer(xwb_bytes)
+
+        self.assertEqual(wavebank.streams[0].flags_and_duration, 0x80000010)
+        self.assertEqual(wavebank.encode_as_v45_pc_xwb(build_date=self._build_date), xwb_bytes)
+
+        # An offset past 2GB is read as such, and rejected for running past the end of the file
+        struct.pack_into('<I', xwb_bytes, 148 + 8, 0x80000000)
+        with self.assertRaises(XwbValidationError):
+            WaveBank.from_buffer(xwb_bytes)
+
+    def test_truncated_entry_table_is_rejected(self):
+        with self.assertRaises(ValueError):
+            WaveBank.from_buffer(self._xwb_bytes[:200])
+
+    def test_encode_round_trip(self):
+        wavebank = WaveBank.from_xwb(self._xwb_path)
+
+        self.assertEqual(wavebank.encode_as_v45_pc_xwb(build_date=self._build_date), self._xwb_bytes)
+
+    def test_encode_calculates_empty_play_region_offset(self):
+        wavebank = WaveBank.from_xwb(self._xwb_path)
+        wavebank.header.segments[4].offset = 0
+
+        self.assertEqual(wavebank.encode_as_v45_pc_xwb(build_date=self._build_date), self._xwb_bytes)
+
+    def test_hand_built_bank_round_trip(self):
+        audio_data = bytes(range(256)) * 4
+        wavebank = WaveBank(
+            sounds=[SoundEffect(codec=MiniFormatTag.Pcm, audio_data=audio_data, channels=2, sample_rate=22050,
+                                block_alignment=4, loop_start=0, loop_length=0)],
+            streams=(StreamInfo(flags_and_duration=len(audio_data) // 4,
+                                format=encode_v2plus_audio_format(MiniFormatTag.Pcm, 2, 22050, 4, 1),
+                                file_length=len(audio_data)),),
+            file_name=Path('Manual.xwb'), streaming=False, play_region_offset=0,
+            # Every segment of a bank built by hand is left empty, so they're all calculated when it's written
+            header=WaveBankHeader(),
+            data=WaveBankData(bank_name='Manual', entry_count=1)
+        )
+
+        output_path = Path(self._temp_dir.name) / 'manual.xwb'
+        wavebank.write_xwb(output_path)
+        loaded_wavebank = WaveBank.from_xwb(output_path)
+
+        self.assertEqual(loaded_wavebank.data.bank_name, 'Manual')
+        self.assertEqual(loaded_wavebank.streams, wavebank.streams)
+        self.assertEqual(bytes(loaded_wavebank.sounds[0].audio_data), audio_data)
+
+    def test_write_xwb_to_stream_and_path(self):
+        wavebank = WaveBank.from_xwb(self._xwb_path, lazy=True)
+
+        stream = io.BytesIO()
+        stream_bytes_written = wavebank.write_xwb(stream, build_date=self._build_date)
+
+        output_path = Path(self._temp_dir.name) / 'written.xwb'
+        path_bytes_written = wavebank.write_xwb(output_path, build_date=self._build_date)
+
+        self.assertEqual(stream.getvalue(), self._xwb_bytes)
+        self.assertEqual(output_path.read_bytes(), self._xwb_bytes)
+        self.assertEqual(stream_bytes_written, len(self._xwb_bytes))
+        self.assertEqual(path_bytes_written, len(self._xwb_bytes))
+
+    def test_entry_names_and_seek_tables(self):
+        xwb_bytes = build_v45_xwb(self._payloads, build_time=self._build_time,
+                                  entry_names=['intro', 'loop', '', 'outro'],
+                                  seek_tables=[[100, 200, 300], None, [], [50]])
+        wavebank = WaveBank.from_buffer(xwb_bytes)
+
+        self.assertEqual(wavebank.entry_names, ('intro', 'loop', '', 'outro'))
+        self.assertEqual(wavebank.get_entry_index('outro'), 3)
+        with self.assertRaises(KeyError):
+            wavebank.get_entry_index('missing')
+
+        self.assertEqual([None if seek_table is None else list(seek_table) for seek_table in wavebank.seek_tables],
+                         [[100, 200, 300], None, [], [50]])
+
+        self.assertEqual(wavebank.encode_as_v45_pc_xwb(build_date=self._build_date), xwb_bytes)
+
+    def test_dropping_entry_names_clears_flag(self):
+        wavebank = WaveBank.from_buffer(build_v45_xwb(self._payloads, build_time=self._build_time,
+                                                      entry_names=['a', 'b', 'c', 'd']))
+        wavebank.entry_names = ()
+
+        # Without names, the bank is written exactly as one that never had any
+        self.assertEqual(wavebank.encode_as_v45_pc_xwb(build_date=self._build_date), self._xwb_bytes)
+
+    def test_entry_name_index_follows_renames(self):
+        wavebank = WaveBank.from_buffer(build_v45_xwb(self._payloads, entry_names=['a', 'b', 'c', 'd']))
+        self.assertEqual(wavebank.get_entry_index('b'), 1)
+
+        wavebank.entry_names = ('a', 'c', 'b', 'd')
+        self.assertEqual(wavebank.get_entry_index('b'), 2)
+
+    def test_scan_reads_entry_names_without_payloads(self):
+        xwb_path = Path(self._temp_dir.name) / 'named.xwb'
+        xwb_path.write_bytes(build_v45_xwb(self._payloads, entry_names=['a', 'b', 'c', 'd']))
+
+        xwb_scan = scan_xwb(xwb_path)
+
+        self.assertEqual(xwb_scan.entry_name_index, {'a': 0, 'b': 1, 'c': 2, 'd': 3})
+        self.assertEqual(xwb_scan.seek_tables, ())
+
+    def test_big_endian_bank(self):
+        payloads = [bytes(range(16 * i, (16 * i) + 64)) for i in range(4)]
+        segments = dict(entry_names=['a', 'b', 'c', 'd'], seek_tables=[[100, 200], None, [], [50]])
+        pc_xwb_bytes = build_v45_xwb(payloads, build_time=self._build_time, **segments)
+        # Payloads of big-endian banks are stored with their 16-bit samples byte-swapped
+        xwb_bytes = build_v45_xwb([swap_pcm16_byte_order(payload) for payload in payloads],
+                                  build_time=self._build_time, big_endian=True, **segments)
+
+        wavebank = WaveBank.from_buffer(xwb_bytes)
+        pc_wavebank = WaveBank.from_buffer(pc_xwb_bytes)
+
+        self.assertTrue(wavebank.header.big_endian)
+        self.assertEqual(wavebank.streams, pc_wavebank.streams)
+        self.assertEqual(wavebank.entry_names, ('a', 'b', 'c', 'd'))
+        self.assertEqual([None if seek_table is None else list(seek_table) for seek_table in wavebank.seek_tables],
+                         [[100, 200], None, [], [50]])
+
+        # Writing in either byte order swaps the payloads as needed
+        big_endian_stream = io.BytesIO()
+        wavebank.write_xwb(big_endian_stream, build_date=self._build_date, big_endian=True)
+        self.assertEqual(big_endian_stream.getvalue(), xwb_bytes)
+        self.assertEqual(wavebank.encode_as_v45_pc_xwb(build_date=self._build_date), pc_xwb_bytes)
+
+    def test_big_endian_extraction_writes_little_endian_wavs(self):
+        payload = bytes(range(16))
+        wavebank = WaveBank.from_buffer(build_v45_xwb([swap_pcm16_byte_order(payload)], big_endian=True))
+
+        with tempfile.TemporaryDirectory() as extract_dir:
+            (wav_path,) = wavebank.extract_raw_pcm_sounds(Path(extract_dir))
+            with wave.open(str(wav_path), 'rb') as wav_file:
+                self.assertEqual(wav_file.readframes(wav_file.getnframes()), payload)
+
+    def test_unknown_magic_number_is_rejected(self):
+        with self.assertRaises(XwbValidationError):
+            WaveBank.from_buffer(b'XXXX' + self._xwb_bytes[4:])
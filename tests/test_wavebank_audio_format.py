@@ -3,7 +3,7 @@ from copy import deepcopy
 from multiprocessing.spawn import old_main_modules
 
 from xact_types.utils.wavebank_audio_format import decode_audio_format, encode_v2plus_audio_format, \
-    encode_v2plus_audio_format_from_wave_format
+    encode_v2plus_audio_format_from_wave_format, decode_audio_formats, encode_v2plus_audio_formats
 
 
 class TestV2plusAudioFormat(unittest.TestCase):
@@ -47,3 +47,22 @@ class TestV2plusAudioFormat(unittest.TestCase):
                 self.assertEqual(old_round_trip_format, new_round_trip_format)
                 old_round_trip_format = deepcopy(new_round_trip_format)
 
+    def test_batch_round_trip(self):
+        """
+        Tests that many audio formats are encoded identically to the original data after a batch round trip.
+        """
+        format_values = [self._audio_format_value, 0x80158889, self._audio_format_value, 0x0056220D]
+        decoded_formats = decode_audio_formats(format_values, self._wavebank_version)
+
+        self.assertEqual(list(encode_v2plus_audio_formats(decoded_formats)), format_values)
+        self.assertEqual(decoded_formats, [decode_audio_format(value, self._wavebank_version) for value in format_values])
+
+    def test_decoded_formats_are_shared(self):
+        """
+        Tests that repeated formats decode to the same immutable object.
+        """
+        decoded_format = decode_audio_format(self._audio_format_value, self._wavebank_version)
+
+        self.assertIs(decode_audio_format(self._audio_format_value, self._wavebank_version), decoded_format)
+        with self.assertRaises(ValueError):
+            decoded_format.channels = 1
@@ -0,0 +1,178 @@
+import datetime
+import io
+import struct
+import tempfile
+import tracemalloc
+import unittest
+import wave
+from pathlib import Path
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.models.wavebank.builder import WaveBankBuilder, read_wav_source
+from xact_types.models.wavebank.wavebank import WaveBank, XwbValidationError
+
+
+def write_wav(wav_path: Path, frames: bytes, channels: int = 2, sample_width: int = 2, sample_rate: int = 44100):
+    with wave.open(str(wav_path), 'wb') as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(sample_width)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(frames)
+
+
+def write_adpcm_wav(wav_path: Path, frames: bytes, channels: int, block_align: int, sample_rate: int = 22050):
+    """Writes MS ADPCM audio, whose `fmt ` chunk ``wave`` can't write, with the standard coefficient table."""
+    coefficients = ((256, 0), (512, -256), (0, 0), (192, 64), (240, 0), (460, -208), (392, -232))
+    samples_per_block = (((block_align // channels) - 7) * 2) + 2
+    byte_rate = (sample_rate * block_align) // samples_per_block
+    fmt_chunk = struct.pack('<HHIIHHHHH', 0x0002, channels, sample_rate, byte_rate, block_align, 4, 32,
+                            samples_per_block, len(coefficients))
+    fmt_chunk += b''.join(struct.pack('<hh', *coefficient) for coefficient in coefficients)
+
+    chunks = (b'fmt ' + struct.pack('<I', len(fmt_chunk)) + fmt_chunk
+              + b'data' + struct.pack('<I', len(frames)) + frames)
+    wav_path.write_bytes(b'RIFF' + struct.pack('<I', len(chunks) + 4) + b'WAVE' + chunks)
+
+
+class TestWaveBankBuilder(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._wav_dir = Path(self._temp_dir.name) / 'Sounds'
+        self._wav_dir.mkdir()
+
+        self._payloads = {'a_stereo': bytes(range(256)) * 4, 'b_mono': bytes([7]) * 302, 'c_8bit': bytes([128]) * 99}
+        write_wav(self._wav_dir / 'a_stereo.wav', self._payloads['a_stereo'])
+        write_wav(self._wav_dir / 'b_mono.wav', self._payloads['b_mono'], channels=1, sample_rate=22050)
+        write_wav(self._wav_dir / 'c_8bit.wav', self._payloads['c_8bit'], channels=1, sample_width=1)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_read_wav_source_skips_other_chunks(self):
+        wav_path = self._wav_dir / 'a_stereo.wav'
+        wav_bytes = wav_path.read_bytes()
+        # Insert an odd-length chunk (with its padding byte) between the `fmt ` and `data` chunks
+        data_start = wav_bytes.index(b'data')
+        wav_path.write_bytes(wav_bytes[:data_start] + b'LIST' + struct.pack('<I', 3) + b'abc\0' + wav_bytes[data_start:])
+
+        source = read_wav_source(wav_path)
+
+        self.assertEqual(source.name, 'a_stereo')
+        self.assertEqual(source.length, len(self._payloads['a_stereo']))
+        self.assertEqual(wav_path.read_bytes()[source.offset:source.offset + source.length], self._payloads['a_stereo'])
+        self.assertEqual((source.wave_format.channels, source.wave_format.rate, source.wave_format.alignment,
+                          source.wave_format.bits_per_sample), (2, 44100, 4, 1))
+
+    def test_directory_round_trip(self):
+        builder = WaveBankBuilder.from_directory(self._wav_dir)
+        xwb_path = Path(self._temp_dir.name) / 'Sounds.xwb'
+        written = builder.write_xwb(xwb_path, build_date=datetime.datetime(2020, 1, 1))
+
+        self.assertEqual(written, xwb_path.stat().st_size)
+
+        wavebank = WaveBank.from_xwb(xwb_path)
+        self.assertEqual(wavebank.data.bank_name, 'Sounds')
+        self.assertEqual(wavebank.entry_names, tuple(self._payloads))
+        self.assertEqual([bytes(sound.audio_data) for sound in wavebank.sounds], list(self._payloads.values()))
+        self.assertEqual([(sound.codec, sound.channels, sound.sample_rate) for sound in wavebank.sounds],
+                         [(MiniFormatTag.Pcm, 2, 44100), (MiniFormatTag.Pcm, 1, 22050), (MiniFormatTag.Pcm, 1, 44100)])
+        # Durations are in samples, so depend on each entry's channels and bit depth
+        self.assertEqual([stream.flags_and_duration >> 4 for stream in wavebank.streams], [256, 151, 99])
+
+        self.assertEqual(wavebank.play_region_offset % 2048, 0)
+        self.assertTrue(all(stream.file_offset % 4 == 0 for stream in wavebank.streams))
+        self.assertEqual(wavebank.header.segments[4].length,
+                         wavebank.streams[-1].file_offset + wavebank.streams[-1].file_length)
+
+    def test_matches_wavebank_encoding(self):
+        # Both writers pack the header and entry table the same way, so rewriting a built bank reproduces it
+        build_date = datetime.datetime(2020, 1, 1)
+        builder = WaveBankBuilder('Single')
+        builder.add_wav(self._wav_dir / 'a_stereo.wav')
+        destination = io.BytesIO()
+        builder.write_xwb(destination, build_date=build_date)
+
+        xwb_bytes = destination.getvalue()
+        self.assertEqual(WaveBank.from_buffer(xwb_bytes).encode_as_v45_pc_xwb(build_date=build_date), xwb_bytes)
+
+    def test_streaming_banks_align_to_sectors(self):
+        builder = WaveBankBuilder.from_directory(self._wav_dir, bank_name='Streamed', streaming=True,
+                                                 include_entry_names=False)
+        wavebank = WaveBank.from_buffer(self._write_to_bytes(builder))
+
+        self.assertTrue(wavebank.streaming)
+        self.assertEqual(wavebank.entry_names, ())
+        self.assertEqual([stream.file_offset for stream in wavebank.streams], [0, 2048, 4096])
+
+    def test_header_grows_past_one_sector(self):
+        builder = WaveBankBuilder('Many')
+        source = read_wav_source(self._wav_dir / 'b_mono.wav')
+        for i in range(40):
+            builder.add_source(source._replace(name=f'entry_{i}'))
+
+        layout = builder.compute_layout()
+        self.assertGreater(layout.header_length, 2048)
+        self.assertEqual(layout.play_region_offset, 4096)
+
+        wavebank = WaveBank.from_buffer(self._write_to_bytes(builder))
+        self.assertEqual(wavebank.get_entry_index('entry_39'), 39)
+
+    def test_copies_payloads_in_constant_memory(self):
+        payload = bytes(range(256)) * 1024
+        for i in range(8):
+            write_wav(self._wav_dir / f'large_{i}.wav', payload)
+
+        builder = WaveBankBuilder.from_directory(self._wav_dir, pattern='large_*.wav')
+
+        tracemalloc.start()
+        try:
+            builder.write_xwb(Path(self._temp_dir.name) / 'large.xwb', chunk_size=16 * 1024)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(peak_memory, len(payload))
+
+    def test_invalid_entry_name_fails_before_writing(self):
+        builder = WaveBankBuilder('Names')
+        builder.add_wav(self._wav_dir / 'b_mono.wav', name='x' * 64)
+
+        destination = io.BytesIO()
+        with self.assertRaises(XwbValidationError):
+            builder.write_xwb(destination)
+        self.assertEqual(destination.getvalue(), b'')
+
+    def test_adpcm_wav(self):
+        stereo_path = self._wav_dir / 'adpcm_stereo.wav'
+        write_adpcm_wav(stereo_path, bytes(1024), channels=2, block_align=512)
+
+        builder = WaveBankBuilder('Adpcm')
+        builder.add_wav(stereo_path)
+        wavebank = WaveBank.from_buffer(self._write_to_bytes(builder))
+
+        sound = wavebank.sounds[0]
+        self.assertEqual((sound.codec, sound.channels, sound.sample_rate), (MiniFormatTag.Adpcm, 2, 22050))
+        self.assertEqual(bytes(sound.audio_data), bytes(1024))
+        # Each 512 byte block holds 500 samples per channel
+        self.assertEqual(wavebank.streams[0].flags_and_duration >> 4, 1000)
+
+    def test_unrepresentable_formats_are_rejected(self):
+        mono_path = self._wav_dir / 'adpcm_mono.wav'
+        # A 512 byte mono block needs an alignment of 490, which doesn't fit in its 8 bits
+        write_adpcm_wav(mono_path, bytes(1024), channels=1, block_align=512)
+        wide_path = self._wav_dir / 'wide.wav'
+        write_wav(wide_path, bytes(16), channels=8, sample_width=1)
+
+        for wav_path in (mono_path, wide_path):
+            with self.subTest(wav_path=wav_path.name):
+                with self.assertRaisesRegex(ValueError, wav_path.name):
+                    read_wav_source(wav_path)
+
+    def _write_to_bytes(self, builder: WaveBankBuilder) -> bytes:
+        destination = io.BytesIO()
+        builder.write_xwb(destination)
+        return destination.getvalue()
+
+
+if __name__ == '__main__':
+    unittest.main()
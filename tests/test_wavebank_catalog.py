@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.models.wavebank.scan import scan_xwb
+from xact_types.utils.wavebank_audio_format import encode_v2plus_audio_format
+from xact_types.utils.wavebank_catalog import WaveBankCatalog
+from xwb_samples import build_v45_xwb
+
+MONO_8_BIT_22050_FORMAT = encode_v2plus_audio_format(
+    codec=MiniFormatTag.Pcm, channels=1, rate=22050, alignment=1, bits_per_sample=0
+)
+
+
+class TestWaveBankCatalog(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._temp_path = Path(self._temp_dir.name)
+
+        self._stereo_path = self._temp_path / 'stereo.xwb'
+        # 44100 samples per second * 4 bytes per sample, so lengths are 1s and 2s
+        self._stereo_path.write_bytes(build_v45_xwb([bytes(176400), bytes(352800)], bank_name='Stereo'))
+
+        self._mono_path = self._temp_path / 'nested' / 'mono.xwb'
+        self._mono_path.parent.mkdir()
+        self._mono_path.write_bytes(build_v45_xwb([bytes(22050)], bank_name='Mono',
+                                                  audio_format=MONO_8_BIT_22050_FORMAT))
+
+        self._catalog = WaveBankCatalog(self._temp_path / 'catalog.sqlite')
+
+    def tearDown(self):
+        self._catalog.close()
+        self._temp_dir.cleanup()
+
+    def test_scan_reads_layout_only(self):
+        xwb_scan = scan_xwb(self._stereo_path)
+
+        self.assertEqual(xwb_scan.data.bank_name, 'Stereo')
+        self.assertEqual(list(xwb_scan.streams.file_lengths), [176400, 352800])
+
+    def test_queries(self):
+        self._catalog.update_directory(self._temp_path)
+
+        long_stereo_entries = self._catalog.find_entries(sample_rate=44100, channels=2, min_duration=1.5)
+        self.assertEqual([(entry.bank_name, entry.entry_index) for entry in long_stereo_entries], [('Stereo', 1)])
+        self.assertEqual(long_stereo_entries[0].duration, 2.0)
+
+        mono_entries = self._catalog.find_entries(channels=1)
+        self.assertEqual([(entry.bank_name, entry.duration) for entry in mono_entries], [('Mono', 1.0)])
+
+    def test_unchanged_banks_are_not_rescanned(self):
+        self.assertEqual(self._catalog.update_directory(self._temp_path), 2)
+        self.assertEqual(self._catalog.update_directory(self._temp_path), 0)
+
+        self._mono_path.write_bytes(build_v45_xwb([bytes(22050)] * 2, bank_name='Mono',
+                                                  audio_format=MONO_8_BIT_22050_FORMAT))
+        os.utime(self._mono_path, ns=(0, 0))
+
+        self.assertEqual(self._catalog.update_directory(self._temp_path), 1)
+        self.assertEqual(len(self._catalog.find_entries(bank_name='Mono')), 2)
+
+    def test_missing_banks_are_removed(self):
+        self._catalog.update_directory(self._temp_path)
+        self._stereo_path.unlink()
+        self._catalog.update_directory(self._temp_path)
+
+        self.assertEqual(self._catalog.bank_paths(), [self._mono_path.resolve()])
+        self.assertEqual(self._catalog.find_entries(bank_name='Stereo'), [])
+
+    def test_corrupt_bank_is_skipped(self):
+        self._catalog.update_directory(self._temp_path)
+        self._stereo_path.write_bytes(b'XXXX' + bytes(100))
+        os.utime(self._stereo_path, ns=(0, 0))
+        corrupt_path = self._temp_path / 'corrupt.xwb'
+        corrupt_path.write_bytes(build_v45_xwb([bytes(64)])[:100])
+        # Scanned after the corrupt banks, so would be rolled back along with them if they were stored together
+        late_path = self._temp_path / 'z_late.xwb'
+        late_path.write_bytes(build_v45_xwb([bytes(64)], bank_name='Late'))
+
+        self.assertEqual(self._catalog.update_directory(self._temp_path), 1)
+
+        self.assertEqual(self._catalog.bank_paths(), [self._mono_path.resolve(), late_path.resolve()])
+        self.assertEqual([failure.bank_path for failure in self._catalog.failures()],
+                         [corrupt_path.resolve(), self._stereo_path.resolve()])
+        self.assertEqual(self._catalog.find_entries(bank_name='Stereo'), [])
+
+        # Failed banks are only retried once they change
+        self.assertEqual(self._catalog.update_directory(self._temp_path), 0)
+        corrupt_path.write_bytes(build_v45_xwb([bytes(64)], bank_name='Fixed'))
+        os.utime(corrupt_path, ns=(0, 0))
+
+        self.assertEqual(self._catalog.update_directory(self._temp_path), 1)
+        self.assertEqual([failure.bank_path for failure in self._catalog.failures()], [self._stereo_path.resolve()])
+        self.assertEqual(len(self._catalog.find_entries(bank_name='Fixed')), 1)
@@ -0,0 +1,56 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from xact_types.models.wavebank.dedup import find_duplicate_payloads, get_payload_digest
+from xact_types.models.wavebank.wavebank import WaveBank
+from xwb_samples import build_v45_xwb
+
+
+class TestWaveBankDedup(unittest.TestCase):
+    def setUp(self):
+        self._payloads = [bytes(range(64)), bytes(64), bytes(range(64)), bytes(range(32)), bytes(64)]
+
+    def test_find_duplicate_payloads(self):
+        deduplication = find_duplicate_payloads(self._payloads)
+
+        self.assertEqual(deduplication.sources, (0, 1, 0, 3, 1))
+        self.assertEqual(deduplication.saved_bytes, 128)
+        self.assertEqual(deduplication.duplicate_count, 2)
+
+        # Payloads are hashed in chunks, which doesn't change their digest
+        self.assertEqual(get_payload_digest(self._payloads[0], chunk_size=5), get_payload_digest(self._payloads[0]))
+        self.assertEqual(find_duplicate_payloads([b'', b'']).sources, (0, 1))
+
+    def test_encode_deduplicates_payloads(self):
+        wavebank = WaveBank.from_buffer(build_v45_xwb(self._payloads))
+        deduplicated_xwb = wavebank.encode_as_v45_pc_xwb(deduplicate=True)
+
+        self.assertEqual(wavebank.find_duplicate_payloads().saved_bytes, 128)
+        self.assertEqual(len(wavebank.encode_as_v45_pc_xwb()) - len(deduplicated_xwb), 128)
+
+        reloaded_wavebank = WaveBank.from_buffer(deduplicated_xwb)
+        self.assertEqual([bytes(sound.audio_data) for sound in reloaded_wavebank.sounds], self._payloads)
+        self.assertEqual([stream.file_offset for stream in reloaded_wavebank.streams], [0, 64, 0, 128, 64])
+        self.assertEqual(reloaded_wavebank.header.segments[4].length, 160)
+
+    def test_load_shares_duplicate_payloads(self):
+        deduplicated_xwb = WaveBank.from_buffer(build_v45_xwb(self._payloads)).encode_as_v45_pc_xwb(deduplicate=True)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xwb_path = Path(temp_dir) / 'deduplicated.xwb'
+            xwb_path.write_bytes(deduplicated_xwb)
+
+            for wavebank in (WaveBank.from_xwb(xwb_path), WaveBank.from_buffer(deduplicated_xwb)):
+                with self.subTest(audio_data_type=type(wavebank.sounds[0].audio_data)):
+                    sounds = wavebank.sounds
+                    self.assertIs(sounds[0].audio_data, sounds[2].audio_data)
+                    self.assertIs(sounds[1].audio_data, sounds[4].audio_data)
+                    self.assertIsNot(sounds[0].audio_data, sounds[1].audio_data)
+
+                    # Shared payloads are found without hashing, and written once again
+                    self.assertEqual(len(wavebank.encode_as_v45_pc_xwb(deduplicate=True)), len(deduplicated_xwb))
+
+
+if __name__ == '__main__':
+    unittest.main()
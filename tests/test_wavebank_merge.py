@@ -0,0 +1,116 @@
+import datetime
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from xact_types.models.wavebank.merge import merge_xwbs, split_xwb
+from xact_types.models.wavebank.wavebank import WaveBank
+from xact_types.utils.file_io import copy_file_range
+from xwb_samples import build_v45_xwb
+
+
+class TestCopyFileRange(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._source_path = Path(self._temp_dir.name) / 'source.bin'
+        self._source_path.write_bytes(bytes(range(256)) * 16)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _copy_to_file(self) -> bytes:
+        destination_path = Path(self._temp_dir.name) / 'destination.bin'
+        with open(self._source_path, 'rb') as source, open(destination_path, 'wb') as destination:
+            destination.write(b'head')
+            self.assertEqual(copy_file_range(source, destination, 100, 1000), 1000)
+            # The destination carries on from after the copied bytes
+            destination.write(b'tail')
+            self.assertEqual(copy_file_range(source, destination, 4000, 1000), 96)
+
+        return destination_path.read_bytes()
+
+    def test_copies_between_files(self):
+        source_bytes = self._source_path.read_bytes()
+        expected_bytes = b'head' + source_bytes[100:1100] + b'tail' + source_bytes[4000:]
+
+        self.assertEqual(self._copy_to_file(), expected_bytes)
+
+        # Without `copy_file_range`, `sendfile` is used, and without either the copy goes through a buffer
+        with mock.patch('os.copy_file_range', side_effect=OSError, create=True):
+            self.assertEqual(self._copy_to_file(), expected_bytes)
+            with mock.patch('os.sendfile', side_effect=OSError, create=True):
+                self.assertEqual(self._copy_to_file(), expected_bytes)
+
+    def test_copies_to_streams(self):
+        destination = io.BytesIO()
+        with open(self._source_path, 'rb') as source:
+            self.assertEqual(copy_file_range(source, destination, 10, 20, memoryview(bytearray(7))), 20)
+
+        self.assertEqual(destination.getvalue(), bytes(range(10, 30)))
+
+
+class TestWaveBankMerge(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._build_date = datetime.datetime(2020, 1, 1)
+
+        self._payloads = [bytes(range(i, i + 64)) for i in range(5)]
+        self._first_path = Path(self._temp_dir.name) / 'First.xwb'
+        self._second_path = Path(self._temp_dir.name) / 'Second.xwb'
+        self._first_path.write_bytes(build_v45_xwb(self._payloads[:3], entry_names=['a', 'b', 'c'],
+                                                   loop_regions=[(1, 2), (3, 4), (0, 0)]))
+        self._second_path.write_bytes(build_v45_xwb(self._payloads[3:], entry_names=['d', 'e']))
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_merge(self):
+        merged_path = Path(self._temp_dir.name) / 'Merged.xwb'
+        written = merge_xwbs([self._first_path, self._second_path], merged_path, build_date=self._build_date)
+
+        merged_wavebank = WaveBank.from_xwb(merged_path)
+        source_streams = WaveBank.from_xwb(self._first_path).streams + WaveBank.from_xwb(self._second_path).streams
+
+        self.assertEqual(written, merged_path.stat().st_size)
+        self.assertEqual(merged_wavebank.data.bank_name, 'Merged')
+        self.assertEqual(merged_wavebank.entry_names, ('a', 'b', 'c', 'd', 'e'))
+        self.assertEqual([bytes(sound.audio_data) for sound in merged_wavebank.sounds], self._payloads)
+        for merged_stream, source_stream in zip(merged_wavebank.streams, source_streams):
+            with self.subTest(stream=source_stream):
+                self.assertEqual((merged_stream.flags_and_duration, merged_stream.format, merged_stream.loop_start,
+                                  merged_stream.loop_length),
+                                 (source_stream.flags_and_duration, source_stream.format, source_stream.loop_start,
+                                  source_stream.loop_length))
+
+    def test_split(self):
+        output_dir = Path(self._temp_dir.name) / 'split'
+        bank_paths = split_xwb(self._first_path, {'Front': ['c', 0], 'Back': [1]}, output_dir)
+
+        self.assertEqual(bank_paths, [output_dir / 'Front.xwb', output_dir / 'Back.xwb'])
+
+        front_wavebank, back_wavebank = (WaveBank.from_xwb(bank_path) for bank_path in bank_paths)
+        self.assertEqual(front_wavebank.entry_names, ('c', 'a'))
+        self.assertEqual([bytes(sound.audio_data) for sound in front_wavebank.sounds],
+                         [self._payloads[2], self._payloads[0]])
+        self.assertEqual(front_wavebank.streams[1].loop_start, 1)
+        self.assertEqual([bytes(sound.audio_data) for sound in back_wavebank.sounds], [self._payloads[1]])
+
+    def test_split_rejects_unknown_entries_before_writing(self):
+        output_dir = Path(self._temp_dir.name) / 'split'
+
+        with self.assertRaises(KeyError):
+            split_xwb(self._first_path, {'Front': [0], 'Back': ['missing']}, output_dir)
+        self.assertFalse(output_dir.exists())
+
+    def test_big_endian_banks_are_rejected(self):
+        big_endian_path = Path(self._temp_dir.name) / 'BigEndian.xwb'
+        big_endian_path.write_bytes(build_v45_xwb(self._payloads, big_endian=True))
+
+        with self.assertRaises(NotImplementedError):
+            merge_xwbs([self._first_path, big_endian_path], Path(self._temp_dir.name) / 'Merged.xwb')
+
+
+if __name__ == '__main__':
+    unittest.main()
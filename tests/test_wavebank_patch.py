@@ -0,0 +1,99 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.models.wavebank.patch import WaveBankPatcher
+from xact_types.models.wavebank.scan import scan_xwb
+from xact_types.models.wavebank.wavebank import WaveBank
+from xact_types.utils.wavebank_audio_format import encode_v2plus_audio_format
+from xwb_samples import build_v45_xwb
+
+
+class TestWaveBankPatcher(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._payloads = [bytes([i + 1]) * 400 for i in range(4)]
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls._source_path = Path(cls._temp_dir.name) / 'source.xwb'
+        cls._source_path.write_bytes(build_v45_xwb(cls._payloads))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._temp_dir.cleanup()
+
+    def setUp(self):
+        self._xwb_path = Path(self._temp_dir.name) / f'{self._testMethodName}.xwb'
+        shutil.copyfile(self._source_path, self._xwb_path)
+
+    def _load_payloads(self) -> list[bytes]:
+        return [bytes(sound.audio_data) for sound in WaveBank.from_xwb(self._xwb_path).sounds]
+
+    def test_smaller_payload_is_written_in_place(self):
+        original_size = self._xwb_path.stat().st_size
+
+        with WaveBankPatcher(self._xwb_path) as patcher:
+            result = patcher.replace_audio_data(1, b'\xAA' * 200)
+
+        self.assertTrue(result.in_place)
+        self.assertEqual(result.file_offset, 400)
+        self.assertEqual(self._xwb_path.stat().st_size, original_size)
+        self.assertEqual(self._load_payloads(), [self._payloads[0], b'\xAA' * 200, *self._payloads[2:]])
+        self.assertEqual(scan_xwb(self._xwb_path).streams[1].flags_and_duration >> 4, 50)
+
+    def test_larger_payload_is_appended(self):
+        original_size = self._xwb_path.stat().st_size
+
+        with WaveBankPatcher(self._xwb_path) as patcher:
+            result = patcher.replace_audio_data(0, b'\xBB' * 1000)
+
+        self.assertFalse(result.in_place)
+        self.assertEqual(result.file_offset, 1600)
+        self.assertEqual(self._xwb_path.stat().st_size, original_size + 1000)
+        self.assertEqual(scan_xwb(self._xwb_path).header.segments[4].length, 2600)
+        self.assertEqual(self._load_payloads(), [b'\xBB' * 1000, *self._payloads[1:]])
+
+    def test_last_entry_grows_in_place(self):
+        with WaveBankPatcher(self._xwb_path) as patcher:
+            result = patcher.replace_audio_data(-1, b'\xCC' * 800)
+
+        self.assertTrue(result.in_place)
+        self.assertEqual(self._load_payloads(), [*self._payloads[:3], b'\xCC' * 800])
+
+    def test_appended_slot_is_reused(self):
+        with WaveBankPatcher(self._xwb_path) as patcher:
+            patcher.replace_audio_data(0, b'\xDD' * 1000)
+            self.assertEqual(patcher.get_slot_capacity(1), 400)
+            result = patcher.replace_audio_data(0, b'\xEE' * 1200)
+
+        self.assertTrue(result.in_place)
+        self.assertEqual(self._load_payloads(), [b'\xEE' * 1200, *self._payloads[1:]])
+
+    def test_stale_seek_table_is_removed(self):
+        self._xwb_path.write_bytes(build_v45_xwb(self._payloads, seek_tables=[[0, 200], None, [100], None]))
+
+        with WaveBankPatcher(self._xwb_path) as patcher:
+            patcher.replace_audio_data(0, b'\xAA' * 200)
+            self.assertIsNone(patcher.scan.seek_tables[0])
+
+        seek_tables = scan_xwb(self._xwb_path).seek_tables
+        self.assertIsNone(seek_tables[0])
+        self.assertEqual(list(seek_tables[2]), [100])
+        self.assertEqual(self._load_payloads(), [b'\xAA' * 200, *self._payloads[1:]])
+
+    def test_wma_entry_is_rejected(self):
+        wma_format = encode_v2plus_audio_format(codec=MiniFormatTag.Wma, channels=2, rate=44100, alignment=0,
+                                                bits_per_sample=0)
+        self._xwb_path.write_bytes(build_v45_xwb(self._payloads, audio_format=wma_format, seek_tables=[[0]] * 4))
+        original_bytes = self._xwb_path.read_bytes()
+
+        with WaveBankPatcher(self._xwb_path) as patcher:
+            with self.assertRaises(NotImplementedError):
+                patcher.replace_audio_data(0, b'\xAA' * 200)
+
+        self.assertEqual(self._xwb_path.read_bytes(), original_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
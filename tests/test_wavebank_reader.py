@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from xact_types.models.wavebank.reader import WaveBankReader
+from xact_types.models.wavebank.wavebank import WaveBank
+from xwb_samples import build_v45_xwb
+
+
+class TestWaveBankReader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._payloads = [bytes([i]) * 1000 for i in range(8)]
+
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls._xwb_path = Path(cls._temp_dir.name) / 'test.xwb'
+        cls._xwb_path.write_bytes(build_v45_xwb(cls._payloads))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._temp_dir.cleanup()
+
+    def test_sounds_match_full_load(self):
+        wavebank = WaveBank.from_xwb(self._xwb_path)
+
+        with WaveBankReader(self._xwb_path) as reader:
+            self.assertEqual(len(reader), len(wavebank.sounds))
+            for index, sound in enumerate(wavebank.sounds):
+                with self.subTest(index=index):
+                    self.assertEqual(reader.read_sound(index), sound)
+
+    def test_cache_is_bounded_by_bytes(self):
+        with WaveBankReader(self._xwb_path, max_cache_bytes=2500) as reader:
+            for index in (0, 1, 0, 2, 3):
+                reader.read_sound(index)
+
+            stats = reader.stats
+            self.assertEqual((stats.hits, stats.misses, stats.evictions), (1, 4, 2))
+            self.assertEqual((stats.cached_entries, stats.cached_bytes), (2, 2000))
+
+            # Entry 1 was evicted before entry 0, as entry 0 was used more recently
+            reader.read_sound(1)
+            self.assertEqual(reader.stats.misses, 5)
+
+    def test_concurrent_reads(self):
+        with WaveBankReader(self._xwb_path, max_cache_bytes=3000) as reader:
+            with ThreadPoolExecutor(8) as executor:
+                indices = [i % len(self._payloads) for i in range(200)]
+                sounds = list(executor.map(reader.read_sound, indices))
+
+            self.assertEqual([sound.audio_data for sound in sounds], [self._payloads[i] for i in indices])
+            self.assertLessEqual(reader.stats.cached_bytes, 3000)
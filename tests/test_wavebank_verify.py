@@ -0,0 +1,126 @@
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+from xact_types.models.wavebank.verify import ENTRY_ALIGNMENT, ENTRY_BOUNDS, ENTRY_FORMAT, ENTRY_OVERLAP, \
+    ENTRY_TABLE, HEADER, SEGMENT_BOUNDS, find_overlaps, verify_directory, verify_xwb
+from xwb_samples import build_v45_xwb
+
+# Entries follow the 148 byte v45 header, and each entry's offset and length are its third and fourth fields
+_ENTRY_TABLE_OFFSET = 148
+_ENTRY_SIZE = 24
+
+
+def build_v1_xwb(payloads: list[bytes], audio_format: int) -> bytes:
+    """Packs ``payloads`` into a v1 bank, which has 4 segments and leaves its play region's offset as 0."""
+    entry_table_offset = 8 + (4 * 8) + 4 + 4 + 64
+    play_region_length = sum(len(payload) for payload in payloads)
+
+    xwb = b'WBND' + struct.pack('<i', 1)
+    xwb += struct.pack('<8I', 40, 72, entry_table_offset, 20 * len(payloads), 0, 0, 0, play_region_length)
+    xwb += struct.pack('<ii', 0, len(payloads)) + b'OldBank'.ljust(64, b'\0')
+
+    file_offset = 0
+    for payload in payloads:
+        xwb += struct.pack('<IIIII', audio_format, file_offset, len(payload), 0, 0)
+        file_offset += len(payload)
+
+    return xwb + b''.join(payloads)
+
+
+def set_entry_range(xwb_bytes: bytes, index: int, file_offset: int, file_length: int) -> bytes:
+    xwb = bytearray(xwb_bytes)
+    struct.pack_into('<II', xwb, _ENTRY_TABLE_OFFSET + (index * _ENTRY_SIZE) + 8, file_offset, file_length)
+    return bytes(xwb)
+
+
+def set_entry_range_v1(xwb_bytes: bytes, index: int, file_offset: int, file_length: int) -> bytes:
+    xwb = bytearray(xwb_bytes)
+    struct.pack_into('<II', xwb, 112 + (index * 20) + 4, file_offset, file_length)
+    return bytes(xwb)
+
+
+class TestWaveBankVerify(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._xwb_bytes = build_v45_xwb([bytes(64) for _ in range(4)])
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _verify(self, xwb_bytes: bytes, name: str = 'test.xwb') -> list[tuple[str, int | None, int | None]]:
+        xwb_path = Path(self._temp_dir.name) / name
+        xwb_path.write_bytes(xwb_bytes)
+        return [(finding.check, finding.index, finding.other_index) for finding in verify_xwb(xwb_path).findings]
+
+    def test_find_overlaps(self):
+        # Range 3 is identical to range 1 (as for entries sharing a payload), so is only reported through it
+        offsets = [0, 50, 200, 50, 100, 300]
+        lengths = [60, 20, 10, 20, 0, 5]
+
+        self.assertEqual(find_overlaps(offsets, lengths), [(0, 1)])
+        self.assertEqual(find_overlaps([0, 10, 5], [10, 10, 10]), [(0, 2), (2, 1)])
+
+    def test_valid_bank(self):
+        xwb_path = Path(self._temp_dir.name) / 'valid.xwb'
+        xwb_path.write_bytes(build_v45_xwb([bytes(64)] * 3, entry_names=['a', 'b', 'c'], seek_tables=[[1], None, []]))
+
+        result = verify_xwb(xwb_path)
+
+        self.assertTrue(result.ok)
+        self.assertEqual(result.path, xwb_path)
+
+    def test_entry_findings(self):
+        xwb_bytes = set_entry_range(self._xwb_bytes, 1, 32, 64)
+        xwb_bytes = set_entry_range(xwb_bytes, 2, 90, 64)
+        xwb_bytes = set_entry_range(xwb_bytes, 3, 240, 64)
+
+        self.assertEqual(self._verify(xwb_bytes), [
+            (ENTRY_ALIGNMENT, 2, None),
+            (ENTRY_BOUNDS, 3, None),
+            (ENTRY_OVERLAP, 1, 0),
+            (ENTRY_OVERLAP, 2, 1),
+        ])
+
+    def test_shared_payloads_are_valid(self):
+        self.assertEqual(self._verify(set_entry_range(self._xwb_bytes, 3, 0, 64)), [])
+
+    def test_invalid_format(self):
+        self.assertEqual(self._verify(build_v45_xwb([bytes(64)] * 2, audio_format=0)),
+                         [(ENTRY_FORMAT, 0, None), (ENTRY_FORMAT, 1, None)])
+
+    def test_truncated_bank(self):
+        findings = self._verify(self._xwb_bytes[:200])
+
+        # The entry table is cut short (along with the play region), and only the entries that remain are checked
+        self.assertEqual(findings, [(SEGMENT_BOUNDS, 1, None), (SEGMENT_BOUNDS, 4, None), (ENTRY_TABLE, None, None)])
+
+    def test_invalid_header(self):
+        self.assertEqual(self._verify(b'XXXX' + self._xwb_bytes[4:]), [(HEADER, None, None)])
+        self.assertEqual(self._verify(self._xwb_bytes[:20]), [(HEADER, None, None)])
+
+    def test_v1_bank_with_calculated_play_region(self):
+        # 16-bit stereo 22050Hz PCM, in the v1 format layout
+        audio_format = (2 << 1) | (22050 << 5) | (4 << 23) | (1 << 31)
+        xwb_bytes = build_v1_xwb([bytes(64)], audio_format)
+
+        self.assertEqual(self._verify(xwb_bytes), [])
+        self.assertEqual(self._verify(set_entry_range_v1(xwb_bytes, 0, 32, 64)), [(ENTRY_BOUNDS, 0, None)])
+
+    def test_verify_directory(self):
+        xwb_dir = Path(self._temp_dir.name) / 'mods'
+        (xwb_dir / 'nested').mkdir(parents=True)
+        (xwb_dir / 'a.xwb').write_bytes(self._xwb_bytes)
+        (xwb_dir / 'nested' / 'b.xwb').write_bytes(set_entry_range(self._xwb_bytes, 1, 32, 64))
+        (xwb_dir / 'c.xwb').write_bytes(self._xwb_bytes)
+
+        results = verify_directory(xwb_dir, workers=2)
+
+        self.assertEqual([result.path for result in results],
+                         [xwb_dir / 'a.xwb', xwb_dir / 'c.xwb', xwb_dir / 'nested' / 'b.xwb'])
+        self.assertEqual([result.ok for result in results], [True, True, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import struct
+
+from checksums.crc import calc_soundbank_crc
+
+XSB_HEADER_LENGTH = 0x8A
+
+# Everything after the CRC-independent header of a real XACT3 soundbank, with a single simple cue
+EXAMPLE_XSB_CRC_DATA = (b'\x01\x01\x00\x00\x00\x00\x00\x10\x00\x01\x01\x00\x0b\x00\x00\x00\xd6\x00\x00\x00'
+                        b'\xff\xff\xff\xff\x01\x01\x00\x00\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff'
+                        b'\x8a\x00\x00\x00\xdb\x00\x00\x00\xfb\x00\x00\x00\xca\x00\x00\x00911\x00\x00\x00'
+                        b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+                        b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+                        b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00911\x00'
+                        b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+                        b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+                        b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+                        b'\x00\x01\x00\xb4\x00\x00\x00\x0c\x00\x00\x00\x00\x04\xca\x00\x00\x00\xff\xff\xff'
+                        b'\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff'
+                        b'\xff\xff\xff\xff\xff\x00\x00\xff\xff\x01\x01\x00\x00\xff\xffGM_BGM_911\x00')
+EXAMPLE_XSB_CRC = 0x9D88
+
+
+# Event types of the clip events complex sounds are built from
+PLAY_WAVE_EVENT = 1
+PLAY_WAVE_TRACK_VARIATION_EVENT = 3
+
+WaveClipEvent = tuple[int, int] | list[tuple[int, int]]
+
+
+def pack_complex_sound(offset: int, clips: list[list[WaveClipEvent]]) -> bytes:
+    """
+    Packs a complex sound at ``offset``, with each of its clips' events following its clip table.
+
+    Each event is a PlayWave event for a ``(wave bank index, entry index)`` tuple,
+    or a PlayWave track variation event for a list of them.
+    """
+    events_offset = offset + 9 + 1 + (9 * len(clips))
+    clip_table = b''
+    events = b''
+
+    for clip in clips:
+        clip_table += struct.pack('<BIHH', 0, events_offset + len(events), 0, 0)
+        events += struct.pack('<B', len(clip))
+        for event in clip:
+            if isinstance(event, tuple):
+                wave_bank_index, entry_index = event
+                events += struct.pack('<IH', PLAY_WAVE_EVENT, 0)
+                events += struct.pack('<BBHBBHH', 0, 0, entry_index, wave_bank_index, 0, 0, 0)
+            else:
+                events += struct.pack('<IH', PLAY_WAVE_TRACK_VARIATION_EVENT, 0)
+                events += struct.pack('<BBBHHHB5x', 0, 0, 0, 0, 0, len(event), 0)
+                for wave_bank_index, entry_index in event:
+                    events += struct.pack('<HBBB', entry_index, wave_bank_index, 0, 255)
+
+    length = 9 + 1 + len(clip_table) + len(events)
+    return struct.pack('<BHBhBHB', 0x01, 1, 0xB4, 0, 0, length, len(clips)) + clip_table + events
+
+
+def build_xsb(simple_cues: dict[str, tuple[int, int]], complex_cues: dict[str, list[tuple[int, int]]] | None = None,
+              complex_sounds: dict[str, list[list[WaveClipEvent]]] | None = None,
+              wave_bank_names: tuple[str, ...] = ('TestBank',), bank_name: str = 'TestSounds',
+              hash_table_size: int = 16, corrupt_crc: bool = False) -> bytes:
+    """
+    Packs a minimal little-endian XACT3 soundbank by hand, independently of the library's parser.
+
+    ``simple_cues`` maps each simple cue's name to the ``(wave bank index, entry index)`` its simple sound plays.
+    ``complex_cues`` maps each complex cue's name to the waves of its wave variation table.
+    ``complex_sounds`` maps each complex cue's name to the clips of the one complex sound in its sound variation
+    table (see ``pack_complex_sound``), and these cues follow those of ``complex_cues``.
+    """
+    complex_cues = complex_cues or {}
+    complex_sounds = complex_sounds or {}
+    cue_names = list(simple_cues) + list(complex_cues) + list(complex_sounds)
+    complex_cue_count = len(complex_cues) + len(complex_sounds)
+
+    wave_bank_names_offset = XSB_HEADER_LENGTH
+    sounds_offset = wave_bank_names_offset + (64 * len(wave_bank_names))
+    complex_sound_offsets = []
+    complex_sound_records = b''
+    for clips in complex_sounds.values():
+        complex_sound_offsets.append(sounds_offset + (12 * len(simple_cues)) + len(complex_sound_records))
+        complex_sound_records += pack_complex_sound(complex_sound_offsets[-1], clips)
+
+    simple_cues_offset = sounds_offset + (12 * len(simple_cues)) + len(complex_sound_records)
+    complex_cues_offset = simple_cues_offset + (5 * len(simple_cues))
+    variation_tables_offset = complex_cues_offset + (15 * complex_cue_count)
+    hash_table_offset = variation_tables_offset + sum(8 + (5 * len(waves)) for waves in complex_cues.values()) + \
+        ((8 + 6) * len(complex_sounds))
+    hash_entries_offset = hash_table_offset + (2 * hash_table_size)
+    cue_names_offset = hash_entries_offset + (6 * len(cue_names))
+    cue_names_table = b''.join(name.encode('utf-8') + b'\0' for name in cue_names)
+
+    body = bytearray()
+    for name in wave_bank_names:
+        body += name.encode('utf-8').ljust(64, b'\0')
+
+    for wave_bank_index, entry_index in simple_cues.values():
+        body += struct.pack('<BHBhBHHB', 0, 1, 0xB4, 0, 0, 12, entry_index, wave_bank_index)
+    body += complex_sound_records
+
+    for i in range(len(simple_cues)):
+        body += struct.pack('<BI', 0x04, sounds_offset + (12 * i))
+
+    variation_table_offset = variation_tables_offset
+    for waves in complex_cues.values():
+        body += struct.pack('<BIIBHHB', 0x00, variation_table_offset, 0xFFFFFFFF, 0xFF, 0, 0, 0)
+        variation_table_offset += 8 + (5 * len(waves))
+    for _ in complex_sounds:
+        body += struct.pack('<BIIBHHB', 0x00, variation_table_offset, 0xFFFFFFFF, 0xFF, 0, 0, 0)
+        variation_table_offset += 8 + 6
+
+    for waves in complex_cues.values():
+        body += struct.pack('<HHBHB', len(waves), 0, 0, 0, 0)
+        for wave_bank_index, entry_index in waves:
+            body += struct.pack('<HBBB', entry_index, wave_bank_index, 0, 255)
+
+    # Sound variation tables (type 1), with byte weights
+    for sound_offset in complex_sound_offsets:
+        body += struct.pack('<HHBHB', 1, 1 << 3, 0, 0, 0)
+        body += struct.pack('<IBB', sound_offset, 10, 200)
+
+    # The parser doesn't rely on XACT's own hash function, so any bucket assignment will do
+    buckets = [0xFFFF] * hash_table_size
+    next_entries = [0xFFFF] * len(cue_names)
+    for i in reversed(range(len(cue_names))):
+        bucket = i % hash_table_size
+        next_entries[i] = buckets[bucket]
+        buckets[bucket] = i
+    body += struct.pack(f'<{hash_table_size}H', *buckets)
+
+    name_offset = cue_names_offset
+    for name, next_entry in zip(cue_names, next_entries):
+        body += struct.pack('<IH', name_offset, next_entry)
+        name_offset += len(name.encode('utf-8')) + 1
+
+    body += cue_names_table
+
+    header_tail = struct.pack(
+        '<B' + 'HHHHBHHH' + ('i' * 10) + '64s',
+        1, len(simple_cues), complex_cue_count, 0, hash_table_size, len(wave_bank_names),
+        len(simple_cues) + len(complex_sounds),
+        len(cue_names_table), 0,
+        simple_cues_offset if simple_cues else -1, complex_cues_offset if complex_cue_count else -1, cue_names_offset,
+        -1, variation_tables_offset if complex_cue_count else -1, -1, wave_bank_names_offset, hash_table_offset,
+        hash_entries_offset, sounds_offset,
+        bank_name.encode('utf-8').ljust(64, b'\0')
+    )
+    crc_data = header_tail + body
+    crc = int.from_bytes(calc_soundbank_crc(crc_data), byteorder='little') ^ (0xFFFF if corrupt_crc else 0)
+
+    return b'SDBK' + struct.pack('<HHHQ', 43, 46, crc, 0) + crc_data
@@ -0,0 +1,88 @@
+import struct
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.utils.wavebank_audio_format import encode_v2plus_audio_format, decode_audio_format, \
+    decode_v2plus_bits_per_sample_flag
+
+STEREO_16_BIT_FORMAT = encode_v2plus_audio_format(
+    codec=MiniFormatTag.Pcm, channels=2, rate=44100, alignment=4, bits_per_sample=1
+)
+
+
+def build_v45_xwb(payloads: list[bytes], bank_name: str = 'TestBank', audio_format: int = STEREO_16_BIT_FORMAT,
+                  flags: int = 0, alignment: int = 4, build_time: int = 0,
+                  compact: bool = False, loop_regions: list[tuple[int, int]] | None = None,
+                  entry_names: list[str] | None = None,
+                  seek_tables: list[list[int] | None] | None = None, big_endian: bool = False) -> bytes:
+    """
+    Packs ``payloads`` into a minimal little-endian v45 wave bank by hand, independently of the library's encoder.
+
+    Compact banks store each entry as its offset in units of ``alignment``, so payload lengths must be multiples of it.
+    ``loop_regions`` optionally gives each entry's loop start and length, in samples.
+    ``entry_names`` and ``seek_tables`` optionally add the `EntryNames` and `SeekTables` segments.
+    Big-endian banks are packed in that byte order throughout, except for ``payloads``, which are used as given.
+    """
+    byte_order = '>' if big_endian else '<'
+
+    if loop_regions is None:
+        loop_regions = [(0, 0)] * len(payloads)
+
+    if compact:
+        flags |= 0x00020000
+    if entry_names is not None:
+        flags |= 0x00010000
+
+    seek_tables_segment = b''
+    if seek_tables is not None:
+        table_offsets = []
+        tables = b''
+        for seek_table in seek_tables:
+            table_offsets.append(0xFFFFFFFF if seek_table is None else len(tables))
+            if seek_table is not None:
+                tables += struct.pack(f'{byte_order}I{len(seek_table)}I', len(seek_table), *seek_table)
+        seek_tables_segment = struct.pack(f'{byte_order}{len(table_offsets)}I', *table_offsets) + tables
+
+    entry_names_segment = b''
+    if entry_names is not None:
+        entry_names_segment = b''.join(name.encode('ascii').ljust(64, b'\0') for name in entry_names)
+
+    entry_length = 4 if compact else 24
+
+    wave_format = decode_audio_format(audio_format, 45)
+    frame_size = (decode_v2plus_bits_per_sample_flag(wave_format.bits_per_sample) // 8) * wave_format.channels
+    header_length = 4 + 4 + 4 + (5 * 8)
+    data_length = 4 + 4 + 64 + (4 * 4) + 8
+    metadata_offset = header_length + data_length
+    metadata_length = len(payloads) * entry_length
+    seek_tables_offset = metadata_offset + metadata_length
+    entry_names_offset = seek_tables_offset + len(seek_tables_segment)
+    metadata_end = entry_names_offset + len(entry_names_segment)
+    play_region_offset = max(2048, -(-metadata_end // 2048) * 2048)
+    play_region_length = sum(len(payload) for payload in payloads)
+
+    xwb = bytearray((b'DNBW' if big_endian else b'WBND') + struct.pack(f'{byte_order}ii', 45, 43))
+    for offset, length in ((header_length, data_length), (metadata_offset, metadata_length),
+                           (seek_tables_offset if seek_tables_segment else 0, len(seek_tables_segment)),
+                           (entry_names_offset if entry_names_segment else 0, len(entry_names_segment)),
+                           (play_region_offset, play_region_length)):
+        xwb += struct.pack(f'{byte_order}II', offset, length)
+
+    xwb += struct.pack(f'{byte_order}ii', flags, len(payloads))
+    xwb += bank_name.encode('ascii').ljust(64, b'\0')
+    xwb += struct.pack(f'{byte_order}iiiiQ', entry_length, 64, alignment, 0, build_time)
+
+    cur_offset = 0
+    for payload, (loop_start, loop_length) in zip(payloads, loop_regions):
+        if compact:
+            xwb += struct.pack(f'{byte_order}I', cur_offset // alignment)
+        else:
+            xwb += struct.pack(f'{byte_order}IIIIII', (len(payload) // max(frame_size, 1)) << 4, audio_format,
+                               cur_offset, len(payload), loop_start, loop_length)
+        cur_offset += len(payload)
+
+    xwb += seek_tables_segment + entry_names_segment
+    xwb += b'\0' * (play_region_offset - len(xwb))
+    for payload in payloads:
+        xwb += payload
+
+    return bytes(xwb)
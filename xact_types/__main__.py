@@ -0,0 +1,5 @@
+import sys
+
+from xact_types.cli import main
+
+sys.exit(main())
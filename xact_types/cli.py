@@ -0,0 +1,269 @@
+"""
+Command line tools for wave banks, run with ``python -m xact_types <command>``.
+
+- ``info`` prints a bank's header.
+- ``list`` prints a bank's entries.
+- ``extract`` writes the PCM entries of banks as WAV files.
+- ``pack`` builds a bank from a directory of WAV files.
+- ``verify`` checks the structure of wave banks (and that sound banks parse).
+
+Only the standard library and the layout reader shared with ``WaveBank`` (``xact_types.models.wavebank.layout``,
+which doesn't need pydantic) are imported up front, so ``info`` and ``list`` read banks exactly as ``WaveBank`` does.
+The pydantic models are only imported by the commands that need them, as the CLI is typically run many times
+in a row by build tools, where start-up time dominates.
+"""
+import argparse
+import datetime
+import json
+import struct
+import sys
+from pathlib import Path
+from typing import NamedTuple, Sequence
+
+from xact_types.enums.wavebank_flags import WaveBankFlags, WaveBankTypes
+from xact_types.models.wavebank.layout import ENTRY_METADATA_FIELDS, FILETIME_EPOCH_OFFSET, \
+    decode_v2plus_bits_per_sample_flag, read_entry_columns, read_entry_segments, read_xwb_layout, unpack_audio_format
+
+
+class EntrySummary(NamedTuple):
+    index: int
+    name: str
+    flags_and_duration: int
+    format: int
+    file_offset: int
+    file_length: int
+    loop_start: int
+    loop_length: int
+
+
+class BankSummary(NamedTuple):
+    """A wave bank's header and entry table, as read by ``info`` and ``list``."""
+    path: Path
+    version: int
+    big_endian: bool
+    flags: int
+    bank_name: str
+    alignment: int
+    build_time: int
+    segments: tuple[tuple[int, int], ...]
+    play_region_offset: int
+    play_region_length: int
+    entries: list[EntrySummary]
+
+
+def read_bank_summary(xwb_path: Path) -> BankSummary:
+    """Reads the header, entry table and entry names of the bank at ``xwb_path``, as ``WaveBank.from_xwb`` does."""
+    with open(xwb_path, 'rb') as xwb_file:
+        layout = read_xwb_layout(xwb_file)
+        entry_columns = read_entry_columns(xwb_file, layout)
+        entry_names, _ = read_entry_segments(xwb_file, layout)
+
+    # Fields that the entry table doesn't store (e.g. in compact banks) are left as 0
+    columns = [entry_columns.get(field, (0,) * layout.entry_count) for field in ENTRY_METADATA_FIELDS]
+    names = entry_names or ('',) * layout.entry_count
+
+    return BankSummary(
+        path=xwb_path,
+        version=layout.version,
+        big_endian=layout.big_endian,
+        flags=layout.flags,
+        bank_name=layout.bank_name,
+        alignment=layout.alignment,
+        build_time=layout.build_time,
+        segments=layout.segments,
+        play_region_offset=layout.play_region_offset,
+        play_region_length=layout.segments[layout.last_segment_idx][1],
+        entries=[EntrySummary(index, name, *row) for index, (name, *row) in enumerate(zip(names, *columns))]
+    )
+
+
+def describe_format(audio_format: int, version: int) -> dict:
+    """Unpacks a format as ``decode_audio_format`` does, into plain values."""
+    codec, channels, rate, alignment, bits_per_sample = unpack_audio_format(audio_format, version)
+
+    return dict(codec=codec.name, channels=channels, rate=rate, alignment=alignment,
+                bits_per_sample=decode_v2plus_bits_per_sample_flag(bits_per_sample))
+
+
+def _get_build_date(build_time: int) -> str | None:
+    if build_time < FILETIME_EPOCH_OFFSET:
+        return None
+    timestamp = (build_time - FILETIME_EPOCH_OFFSET) / 10000000
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).isoformat()
+
+
+def get_info(summary: BankSummary) -> dict:
+    return dict(
+        path=str(summary.path),
+        bank_name=summary.bank_name,
+        version=summary.version,
+        byte_order='big' if summary.big_endian else 'little',
+        streaming=bool(summary.flags & WaveBankTypes.streaming),
+        compact=bool(summary.flags & WaveBankFlags.compact_format),
+        entry_names=bool(summary.flags & WaveBankFlags.entry_names_included),
+        entry_count=len(summary.entries),
+        alignment=summary.alignment,
+        play_region_offset=summary.play_region_offset,
+        play_region_length=summary.play_region_length,
+        audio_length=sum(entry.file_length for entry in summary.entries),
+        build_date=_get_build_date(summary.build_time),
+    )
+
+
+def get_entry_rows(summary: BankSummary) -> list[dict]:
+    return [
+        dict(
+            index=entry.index,
+            name=entry.name,
+            file_offset=entry.file_offset,
+            file_length=entry.file_length,
+            duration=entry.flags_and_duration >> 4,
+            loop_start=entry.loop_start,
+            loop_length=entry.loop_length,
+            **describe_format(entry.format, summary.version)
+        )
+        for entry in summary.entries
+    ]
+
+
+def _print_json(value):
+    print(json.dumps(value, indent=2))
+
+
+def _run_info(arguments: argparse.Namespace) -> int:
+    info = get_info(read_bank_summary(arguments.xwb_path))
+
+    if arguments.json:
+        _print_json(info)
+    else:
+        for key, value in info.items():
+            print(f'{key + ":":<20} {value}')
+    return 0
+
+
+def _run_list(arguments: argparse.Namespace) -> int:
+    rows = get_entry_rows(read_bank_summary(arguments.xwb_path))
+
+    if arguments.json:
+        _print_json(rows)
+        return 0
+
+    for row in rows:
+        print(f'{row["index"]:>6} {row["name"] or "-":<32} {row["codec"]:<6} {row["channels"]}ch {row["rate"]:>6}Hz '
+              f'{row["bits_per_sample"]:>2}bit {row["file_length"]:>10} bytes @ {row["file_offset"]}')
+    return 0
+
+
+def _run_extract(arguments: argparse.Namespace) -> int:
+    from xact_types.models.wavebank.extraction import extract_raw_pcm_sounds_from_banks
+
+    arguments.output_dir.mkdir(parents=True, exist_ok=True)
+    bank_results = extract_raw_pcm_sounds_from_banks(arguments.xwb_paths, arguments.output_dir,
+                                                     workers=arguments.workers)
+
+    for xwb_path, results in zip(arguments.xwb_paths, bank_results):
+        extracted_count = sum(result is not None for result in results)
+        print(f'{xwb_path}: extracted {extracted_count} of {len(results)} entries')
+    return 0
+
+
+def _run_pack(arguments: argparse.Namespace) -> int:
+    from xact_types.models.wavebank.builder import WaveBankBuilder
+
+    builder = WaveBankBuilder.from_directory(arguments.wav_dir, bank_name=arguments.name, pattern=arguments.pattern,
+                                             streaming=arguments.streaming, alignment=arguments.alignment,
+                                             include_entry_names=not arguments.no_entry_names)
+    written = builder.write_xwb(arguments.xwb_path)
+
+    print(f'{arguments.xwb_path}: packed {len(builder)} entries ({written} bytes)')
+    return 0
+
+
+def _verify_sound_bank(xsb_path: Path) -> str | None:
+    """Returns why ``xsb_path`` is invalid, or ``None`` if it's valid."""
+    from xact_types.models.soundbank.soundbank import SoundBank
+
+    try:
+        SoundBank.from_xsb(xsb_path)
+    except (ValueError, NotImplementedError, OSError, struct.error) as e:
+        return f'{type(e).__name__}: {e}'
+
+    return None
+
+
+def _run_verify(arguments: argparse.Namespace) -> int:
+    from xact_types.models.wavebank.verify import verify_xwbs
+
+    # Directories are searched for wave banks
+    file_paths = []
+    for path in arguments.paths:
+        file_paths += sorted(path.glob('**/*.xwb')) if path.is_dir() else [path]
+
+    xwb_paths = [file_path for file_path in file_paths if file_path.suffix.lower() != '.xsb']
+    xwb_results = {result.path: result for result in verify_xwbs(xwb_paths, arguments.workers)}
+
+    failure_count = 0
+    for file_path in file_paths:
+        if file_path in xwb_results:
+            problems = [f'{finding.check}: {finding.message}' for finding in xwb_results[file_path].findings]
+        else:
+            problems = [error] if (error := _verify_sound_bank(file_path)) is not None else []
+
+        if problems:
+            failure_count += 1
+        for problem in problems or ['OK']:
+            print(f'{file_path}: {problem}')
+
+    return 1 if failure_count else 0
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m xact_types', description='Inspects and builds XACT wave banks.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    info_parser = subparsers.add_parser('info', help="Print a wave bank's header.")
+    info_parser.add_argument('xwb_path', type=Path)
+    info_parser.add_argument('--json', action='store_true', help='Print the header as JSON.')
+    info_parser.set_defaults(run=_run_info)
+
+    list_parser = subparsers.add_parser('list', help="Print a wave bank's entries.")
+    list_parser.add_argument('xwb_path', type=Path)
+    list_parser.add_argument('--json', action='store_true', help='Print the entries as JSON.')
+    list_parser.set_defaults(run=_run_list)
+
+    extract_parser = subparsers.add_parser('extract', help='Write the PCM entries of wave banks as WAV files.')
+    extract_parser.add_argument('xwb_paths', type=Path, nargs='+')
+    extract_parser.add_argument('--output-dir', '-o', type=Path, default=Path('.'))
+    extract_parser.add_argument('--workers', type=int, default=None,
+                                help='The number of threads to write files with. (default: one per CPU)')
+    extract_parser.set_defaults(run=_run_extract)
+
+    pack_parser = subparsers.add_parser('pack', help='Build a wave bank from a directory of WAV files.')
+    pack_parser.add_argument('wav_dir', type=Path)
+    pack_parser.add_argument('xwb_path', type=Path)
+    pack_parser.add_argument('--name', help='The name of the bank. (default: the name of the directory)')
+    pack_parser.add_argument('--pattern', default='*.wav', help='Which files of the directory to pack.')
+    pack_parser.add_argument('--streaming', action='store_true', help='Build a streaming bank.')
+    pack_parser.add_argument('--alignment', type=int, default=None,
+                             help='The alignment of each entry. (default: 4, or 2048 for streaming banks)')
+    pack_parser.add_argument('--no-entry-names', action='store_true', help="Don't store each entry's name.")
+    pack_parser.set_defaults(run=_run_pack)
+
+    verify_parser = subparsers.add_parser('verify', help="Check the structure of wave banks, without reading audio, "
+                                                         "and that sound banks can be parsed.")
+    verify_parser.add_argument('paths', type=Path, nargs='+', help='Files, or directories to check every bank in.')
+    verify_parser.add_argument('--workers', type=int, default=1,
+                               help='The number of processes to check wave banks with. (default: 1)')
+    verify_parser.set_defaults(run=_run_verify)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    arguments = get_parser().parse_args(argv)
+
+    try:
+        return arguments.run(arguments)
+    except (ValueError, OSError) as e:
+        print(f'error: {e}', file=sys.stderr)
+        return 2
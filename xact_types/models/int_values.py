@@ -44,4 +44,3 @@ def get_unsigned_int_annotation(bits: int) -> type[Annotated[int, ...]]:
 Int32Value = get_signed_int_annotation(32)
 UInt32Value = get_unsigned_int_annotation(32)
 UInt16Value = get_unsigned_int_annotation(16)
-
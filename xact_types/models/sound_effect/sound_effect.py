@@ -1,4 +1,4 @@
-from pydantic import PositiveInt
+from pydantic import PositiveInt, ConfigDict
 
 from xact_types.enums.mini_format_tag import MiniFormatTag
 from xact_types.models.int_values import UInt32Value
@@ -6,8 +6,11 @@ from xact_types.models.utils import StrictBaseModel
 
 
 class SoundEffect(StrictBaseModel):
+    # Allows ``audio_data`` to be a zero-copy ``memoryview`` into a lazily loaded bank
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     codec: MiniFormatTag
-    audio_data: bytes
+    audio_data: bytes | memoryview
     channels: PositiveInt
     sample_rate: PositiveInt
     block_alignment: PositiveInt
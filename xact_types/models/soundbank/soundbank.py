@@ -0,0 +1,385 @@
+import struct
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from typing_extensions import Buffer
+
+from checksums.crc import calc_soundbank_crc
+from xact_types.models.soundbank.soundbank_header import SoundBankHeader
+
+
+class XsbValidationError(ValueError):
+    """Denotes a concrete error with an XSB file's contents."""
+    pass
+
+
+# The CRC covers everything after the platform-independent part of the header (magic, versions, CRC and timestamp)
+XSB_CRC_START_OFFSET = 0x12
+
+_HEADER_STRUCT = struct.Struct('<4sHHHQB' + 'HHHHBHHH' + ('i' * 10) + '64s')
+_HEADER_OFFSET_FIELDS = ('simple_cues_offset', 'complex_cues_offset', 'cue_names_offset', None,
+                         'variation_tables_offset', 'transition_table_offset', 'wave_bank_names_offset',
+                         'cue_name_hash_table_offset', 'cue_name_hash_entries_offset', 'sounds_offset')
+
+WAVE_BANK_NAME_LENGTH = 64
+
+_UINT8_STRUCT = struct.Struct('<B')
+_UINT16_STRUCT = struct.Struct('<H')
+
+# Name offset, then the index of the next entry in the same hash bucket
+_CUE_NAME_HASH_ENTRY_STRUCT = struct.Struct('<IH')
+
+# Flags, then the offset of the cue's sound
+_SIMPLE_CUE_STRUCT = struct.Struct('<BI')
+# Flags, sound or variation table offset, transition table offset,
+# then instance limit, fade in and out (in milliseconds) and instance flags
+_COMPLEX_CUE_STRUCT = struct.Struct('<BIIBHHB')
+# The cue plays a single sound, rather than choosing from a variation table
+COMPLEX_CUE_FLAG_SINGLE_SOUND = 0x04
+
+# Flags, category, volume, pitch, priority and the length of the sound's record
+_SOUND_STRUCT = struct.Struct('<BHBhBH')
+SOUND_FLAG_COMPLEX = 0x01
+SOUND_FLAGS_HAS_RPCS = 0x0E
+SOUND_FLAG_HAS_DSP = 0x10
+_SIMPLE_SOUND_WAVE_STRUCT = struct.Struct('<HB')
+_DSP_DATA_LENGTH = 7
+
+# Volume, offset of the clip's events, then filter settings
+_CLIP_STRUCT = struct.Struct('<BIHH')
+# Event info (type in the low 5 bits, then the timestamp) and random offset
+_EVENT_HEADER_STRUCT = struct.Struct('<IH')
+_TRACK_VARIATION_ENTRY_STRUCT = struct.Struct('<HBBB')
+
+# Entry count, flags, and unknown fields
+_VARIATION_TABLE_HEADER_STRUCT = struct.Struct('<HHBHB')
+# Variation entries are wave references or sound offsets, with integer or float weights
+_VARIATION_ENTRY_STRUCTS = {
+    0: struct.Struct('<HBBB'),
+    1: struct.Struct('<IBB'),
+    3: struct.Struct('<IffI'),
+    4: struct.Struct('<HB'),
+}
+
+
+class PlayWaveEventType:
+    """Clip event types that play waves - other event types aren't parsed."""
+    PLAY_WAVE = 1
+    PLAY_WAVE_TRACK_VARIATION = 3
+    PLAY_WAVE_EFFECT_VARIATION = 4
+    PLAY_WAVE_TRACK_EFFECT_VARIATION = 6
+
+
+# Body of each event type, up to any track variation table
+_PLAY_WAVE_EVENT_STRUCTS = {
+    # Unknown, flags, track, wave bank, loop count, pan angle and arc
+    PlayWaveEventType.PLAY_WAVE: struct.Struct('<BBHBBHH'),
+    # Unknown, flags, loop count, pan angle and arc, track count, more flags, then unknown
+    PlayWaveEventType.PLAY_WAVE_TRACK_VARIATION: struct.Struct('<BBBHHHB5x'),
+    # As `PLAY_WAVE`, then pitch, volume and filter variation ranges, unknown and variation flags
+    PlayWaveEventType.PLAY_WAVE_EFFECT_VARIATION: struct.Struct('<BBHBBHHhhBBffffBB'),
+    # As `PLAY_WAVE_TRACK_VARIATION`, with the variation ranges of `PLAY_WAVE_EFFECT_VARIATION` before the tracks
+    PlayWaveEventType.PLAY_WAVE_TRACK_EFFECT_VARIATION: struct.Struct('<BBBHHhhBBffffBBHB5x'),
+}
+
+
+class WaveReference(NamedTuple):
+    """An entry of one of the wave banks a soundbank depends on."""
+    wave_bank_index: int
+    wave_bank_name: str
+    entry_index: int
+
+
+class Sound(NamedTuple):
+    offset: int
+    category: int
+    volume: int
+    pitch: int
+    priority: int
+    complex: bool
+    waves: tuple[WaveReference, ...]
+
+
+class CueVariation(NamedTuple):
+    """
+    One of the choices a cue can play, which is either a sound or (for wave variation tables) waves directly.
+    Weights are ``None`` for cues without a variation table.
+    """
+    sound: Sound | None
+    waves: tuple[WaveReference, ...]
+    min_weight: float | None = None
+    max_weight: float | None = None
+
+
+class Cue(NamedTuple):
+    index: int
+    name: str
+    variations: tuple[CueVariation, ...]
+
+    @property
+    def waves(self) -> tuple[WaveReference, ...]:
+        """Every wave the cue can play, in order of first use."""
+        return tuple(dict.fromkeys(wave for variation in self.variations for wave in variation.waves))
+
+
+class SoundBank:
+    """
+    An XSB soundbank, which maps cue names to sounds and the wave bank entries they play.
+
+    Only the header, wave bank names and cue names are read when loaded, and cue names are indexed in a dictionary.
+    A cue's record, sounds and variation table are only parsed the first time the cue is resolved,
+    and are then cached, so loading large soundbanks is cheap and repeated lookups are constant time.
+    """
+
+    def __init__(self, buffer: Buffer, file_name: Path = Path(), verify_crc: bool = True):
+        self.file_name = file_name
+        self._buffer = memoryview(buffer).cast('B')
+
+        self.header = self._read_header()
+        if verify_crc:
+            self.verify_crc()
+
+        self.wave_bank_names: list[str] = self._read_wave_bank_names()
+        self.cue_names: list[str] = self._read_cue_names()
+        self._cue_indices: dict[str, int] = {name: index for index, name in enumerate(self.cue_names)}
+
+        self._cues: list[Cue | None] = [None] * self.header.cue_count
+        self._sounds: dict[int, Sound] = {}
+
+    @classmethod
+    def from_xsb(cls, file_path: Path, verify_crc: bool = True) -> 'SoundBank':
+        return cls(Path(file_path).read_bytes(), file_name=file_path, verify_crc=verify_crc)
+
+    @classmethod
+    def from_buffer(cls, buffer: Buffer, file_name: Path = Path(), verify_crc: bool = True) -> 'SoundBank':
+        return cls(buffer, file_name=file_name, verify_crc=verify_crc)
+
+    def __len__(self) -> int:
+        return len(self.cue_names)
+
+    def __contains__(self, cue_name: str) -> bool:
+        return cue_name in self._cue_indices
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.cue_names)
+
+    def verify_crc(self):
+        expected_crc = calc_soundbank_crc(self._buffer[XSB_CRC_START_OFFSET:])
+        stored_crc = self.header.crc.to_bytes(length=2, byteorder='little')
+
+        if stored_crc != expected_crc:
+            raise XsbValidationError(f'Soundbank CRC does not match its contents. '
+                                     f'(stored 0x{stored_crc.hex()}, calculated 0x{expected_crc.hex()})')
+
+    def get_cue_index(self, cue_name: str) -> int:
+        try:
+            return self._cue_indices[cue_name]
+        except KeyError:
+            raise KeyError(f'No cue named {cue_name!r} in soundbank {self.header.bank_name!r}.') from None
+
+    def get_cue(self, cue: str | int) -> Cue:
+        """Resolves a cue (by name or index), parsing its records on first use."""
+        index = self.get_cue_index(cue) if isinstance(cue, str) else cue
+        if index < 0:
+            index += len(self._cues)
+
+        if (resolved_cue := self._cues[index]) is None:
+            resolved_cue = self._cues[index] = self._read_cue(index)
+        return resolved_cue
+
+    def get_waves(self, cue: str | int) -> tuple[WaveReference, ...]:
+        """Returns every wave bank entry the cue can play."""
+        return self.get_cue(cue).waves
+
+    def _unpack(self, unpacker: struct.Struct, offset: int) -> tuple:
+        if offset < 0 or offset + unpacker.size > len(self._buffer):
+            raise XsbValidationError(f'Record at offset {offset} runs past the end of the soundbank. '
+                                     f'(expected {unpacker.size} bytes, {len(self._buffer)} byte file)')
+        return unpacker.unpack_from(self._buffer, offset)
+
+    def _read_header(self) -> SoundBankHeader:
+        if len(self._buffer) < _HEADER_STRUCT.size:
+            raise XsbValidationError(f'Soundbank is too short to contain a header. '
+                                     f'(expected at least {_HEADER_STRUCT.size} bytes, got {len(self._buffer)})')
+
+        (magic, tool_version, format_version, crc, last_modified, platform,
+         simple_cue_count, complex_cue_count, _, cue_name_hash_table_size, wave_bank_count, sound_count,
+         cue_name_table_length, _, *offsets, bank_name) = _HEADER_STRUCT.unpack_from(self._buffer)
+
+        if magic == b'KBDS':
+            raise NotImplementedError('Big-endian (Xbox 360) soundbanks are not supported.')
+        if magic != b'SDBK':
+            raise XsbValidationError(f'Not a soundbank file. (expected magic number SDBK, got {magic})')
+
+        return SoundBankHeader(
+            tool_version=tool_version,
+            format_version=format_version,
+            crc=crc,
+            last_modified=last_modified,
+            platform=platform,
+            simple_cue_count=simple_cue_count,
+            complex_cue_count=complex_cue_count,
+            cue_name_hash_table_size=cue_name_hash_table_size,
+            wave_bank_count=wave_bank_count,
+            sound_count=sound_count,
+            cue_name_table_length=cue_name_table_length,
+            bank_name=bank_name.decode('utf-8').replace('\0', ''),
+            **{field: offset for field, offset in zip(_HEADER_OFFSET_FIELDS, offsets) if field is not None}
+        )
+
+    def _read_name(self, offset: int, max_length: int) -> str:
+        if offset < 0 or offset + max_length > len(self._buffer):
+            raise XsbValidationError(f'Name at offset {offset} runs past the end of the soundbank.')
+        return bytes(self._buffer[offset:offset + max_length]).split(b'\0', 1)[0].decode('utf-8')
+
+    def _read_wave_bank_names(self) -> list[str]:
+        return [
+            self._read_name(self.header.wave_bank_names_offset + (i * WAVE_BANK_NAME_LENGTH), WAVE_BANK_NAME_LENGTH)
+            for i in range(self.header.wave_bank_count)
+        ]
+
+    def _read_cue_names(self) -> list[str]:
+        cue_count = self.header.cue_count
+        if cue_count == 0:
+            return []
+
+        names_offset = self.header.cue_names_offset
+        names_end = names_offset + self.header.cue_name_table_length
+        if names_offset < 0 or names_end > len(self._buffer):
+            raise XsbValidationError('Cue name table runs past the end of the soundbank.')
+
+        hash_entries_offset = self.header.cue_name_hash_entries_offset
+        if hash_entries_offset < 0:
+            # Without hash entries, names are stored in cue order
+            cue_names = bytes(self._buffer[names_offset:names_end]).decode('utf-8').split('\0')[:cue_count]
+        else:
+            # Each hash entry points at its cue's name, so names can be found without assuming their order
+            names_table = bytes(self._buffer[names_offset:names_end])
+            cue_names = []
+            for i in range(cue_count):
+                name_offset, _ = self._unpack(_CUE_NAME_HASH_ENTRY_STRUCT,
+                                              hash_entries_offset + (i * _CUE_NAME_HASH_ENTRY_STRUCT.size))
+                name_start = name_offset - names_offset
+                if not 0 <= name_start < len(names_table):
+                    raise XsbValidationError(f'Name of cue {i} lies outside the cue name table. '
+                                             f'(offset {name_offset})')
+                name_end = names_table.find(b'\0', name_start)
+                cue_names.append(names_table[name_start:name_end if name_end != -1 else None].decode('utf-8'))
+
+        if len(cue_names) != cue_count:
+            raise XsbValidationError(f'Cue name table is missing names. '
+                                     f'(expected {cue_count}, got {len(cue_names)})')
+        return cue_names
+
+    def _get_wave_reference(self, wave_bank_index: int, entry_index: int) -> WaveReference:
+        if wave_bank_index >= len(self.wave_bank_names):
+            raise XsbValidationError(f'Wave reference uses an unknown wave bank. '
+                                     f'(index {wave_bank_index}, {len(self.wave_bank_names)} wave banks)')
+        return WaveReference(wave_bank_index, self.wave_bank_names[wave_bank_index], entry_index)
+
+    def _read_cue(self, index: int) -> Cue:
+        header = self.header
+        name = self.cue_names[index]
+
+        if index < header.simple_cue_count:
+            _, sound_offset = self._unpack(_SIMPLE_CUE_STRUCT,
+                                           header.simple_cues_offset + (index * _SIMPLE_CUE_STRUCT.size))
+            sound = self._get_sound(sound_offset)
+            return Cue(index, name, (CueVariation(sound, sound.waves),))
+
+        complex_index = index - header.simple_cue_count
+        flags, offset, *_ = self._unpack(_COMPLEX_CUE_STRUCT,
+                                         header.complex_cues_offset + (complex_index * _COMPLEX_CUE_STRUCT.size))
+
+        if flags & COMPLEX_CUE_FLAG_SINGLE_SOUND:
+            sound = self._get_sound(offset)
+            return Cue(index, name, (CueVariation(sound, sound.waves),))
+
+        return Cue(index, name, self._read_variation_table(offset))
+
+    def _read_variation_table(self, offset: int) -> tuple[CueVariation, ...]:
+        entry_count, flags, *_ = self._unpack(_VARIATION_TABLE_HEADER_STRUCT, offset)
+        table_type = (flags >> 3) & 0x7
+
+        if (entry_struct := _VARIATION_ENTRY_STRUCTS.get(table_type)) is None:
+            raise XsbValidationError(f'Unknown variation table type at offset {offset}. (got {table_type})')
+
+        variations = []
+        entry_offset = offset + _VARIATION_TABLE_HEADER_STRUCT.size
+        for _ in range(entry_count):
+            values = self._unpack(entry_struct, entry_offset)
+            entry_offset += entry_struct.size
+
+            if table_type in (0, 4):
+                wave = self._get_wave_reference(values[1], values[0])
+                weights = values[2:4] if table_type == 0 else (None, None)
+                variations.append(CueVariation(None, (wave,), *weights))
+            else:
+                sound = self._get_sound(values[0])
+                variations.append(CueVariation(sound, sound.waves, values[1], values[2]))
+
+        return tuple(variations)
+
+    def _get_sound(self, offset: int) -> Sound:
+        if (sound := self._sounds.get(offset)) is None:
+            sound = self._sounds[offset] = self._read_sound(offset)
+        return sound
+
+    def _read_sound(self, offset: int) -> Sound:
+        flags, category, volume, pitch, priority, _ = self._unpack(_SOUND_STRUCT, offset)
+        is_complex = bool(flags & SOUND_FLAG_COMPLEX)
+        cur_offset = offset + _SOUND_STRUCT.size
+
+        if is_complex:
+            (clip_count,) = self._unpack(_UINT8_STRUCT, cur_offset)
+            cur_offset += 1
+        else:
+            track_index, wave_bank_index = self._unpack(_SIMPLE_SOUND_WAVE_STRUCT, cur_offset)
+            cur_offset += _SIMPLE_SOUND_WAVE_STRUCT.size
+
+        if flags & SOUND_FLAGS_HAS_RPCS:
+            # RPC data starts with its own length
+            (rpc_data_length,) = self._unpack(_UINT16_STRUCT, cur_offset)
+            cur_offset += rpc_data_length
+        if flags & SOUND_FLAG_HAS_DSP:
+            cur_offset += _DSP_DATA_LENGTH
+
+        if not is_complex:
+            waves = (self._get_wave_reference(wave_bank_index, track_index),)
+        else:
+            waves = []
+            for i in range(clip_count):
+                _, events_offset, _, _ = self._unpack(_CLIP_STRUCT, cur_offset + (i * _CLIP_STRUCT.size))
+                waves.extend(self._read_clip_waves(events_offset))
+            waves = tuple(dict.fromkeys(waves))
+
+        return Sound(offset, category, volume, pitch, priority, is_complex, waves)
+
+    def _read_clip_waves(self, offset: int) -> list[WaveReference]:
+        (event_count,) = self._unpack(_UINT8_STRUCT, offset)
+        cur_offset = offset + 1
+        waves = []
+
+        for _ in range(event_count):
+            event_info, _ = self._unpack(_EVENT_HEADER_STRUCT, cur_offset)
+            cur_offset += _EVENT_HEADER_STRUCT.size
+            event_type = event_info & 0x1F
+
+            # Events are stored back to back with type-specific lengths, so an unknown type can't be skipped
+            if (event_struct := _PLAY_WAVE_EVENT_STRUCTS.get(event_type)) is None:
+                raise NotImplementedError(f'Clip event type {event_type} (at offset {cur_offset}) is not supported.')
+
+            values = self._unpack(event_struct, cur_offset)
+            cur_offset += event_struct.size
+
+            if event_type in (PlayWaveEventType.PLAY_WAVE, PlayWaveEventType.PLAY_WAVE_EFFECT_VARIATION):
+                waves.append(self._get_wave_reference(values[3], values[2]))
+                continue
+
+            track_count = values[5] if event_type == PlayWaveEventType.PLAY_WAVE_TRACK_VARIATION else values[15]
+            for _ in range(track_count):
+                track_index, wave_bank_index, _, _ = self._unpack(_TRACK_VARIATION_ENTRY_STRUCT, cur_offset)
+                cur_offset += _TRACK_VARIATION_ENTRY_STRUCT.size
+                waves.append(self._get_wave_reference(wave_bank_index, track_index))
+
+        return waves
@@ -0,0 +1,39 @@
+from pydantic import NonNegativeInt
+
+from xact_types.models.utils import StrictBaseModel
+
+
+class SoundBankHeader(StrictBaseModel):
+    """
+    The fixed-size header at the start of an XSB file.
+
+    Section offsets are absolute file offsets, or ``-1`` when the section is absent.
+    """
+    tool_version: NonNegativeInt = 0
+    format_version: NonNegativeInt = 0
+    crc: NonNegativeInt = 0
+    last_modified: NonNegativeInt = 0
+    platform: NonNegativeInt = 0
+
+    simple_cue_count: NonNegativeInt = 0
+    complex_cue_count: NonNegativeInt = 0
+    cue_name_hash_table_size: NonNegativeInt = 0
+    wave_bank_count: NonNegativeInt = 0
+    sound_count: NonNegativeInt = 0
+    cue_name_table_length: NonNegativeInt = 0
+
+    simple_cues_offset: int = -1
+    complex_cues_offset: int = -1
+    cue_names_offset: int = -1
+    variation_tables_offset: int = -1
+    transition_table_offset: int = -1
+    wave_bank_names_offset: int = -1
+    cue_name_hash_table_offset: int = -1
+    cue_name_hash_entries_offset: int = -1
+    sounds_offset: int = -1
+
+    bank_name: str = ''
+
+    @property
+    def cue_count(self) -> int:
+        return self.simple_cue_count + self.complex_cue_count
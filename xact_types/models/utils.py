@@ -1,5 +1,12 @@
+from typing import Literal, TypeVar
+
 from pydantic import BaseModel, ConfigDict
 
+# How thoroughly models are validated when loading data - see `WaveBank.from_xwb`
+ValidationMode = Literal['none', 'deferred', 'full']
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
 
 class StrictBaseModel(BaseModel, validate_assignment=True):
     """
@@ -8,3 +15,17 @@ class StrictBaseModel(BaseModel, validate_assignment=True):
     disabling type coercion and revalidating fields when their values are changed.
     """
     model_config = ConfigDict(strict=True)
+
+
+def construct_trusted(model_type: type[ModelT], fields: dict) -> ModelT:
+    """
+    Creates a model from ``fields`` without validation, like ``model_construct``, but with much less overhead.
+    ``fields`` must contain a (valid) value for every field of ``model_type``, and is used as the model's ``__dict__``.
+    """
+    # Mirrors the attributes `model_construct` sets, without its handling of defaults, aliases and extra fields
+    model = model_type.__new__(model_type)
+    object.__setattr__(model, '__dict__', fields)
+    object.__setattr__(model, '__pydantic_fields_set__', set(fields))
+    object.__setattr__(model, '__pydantic_extra__', None)
+    object.__setattr__(model, '__pydantic_private__', None)
+    return model
@@ -0,0 +1,53 @@
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, Iterable
+
+from xact_types.models.utils import ValidationMode
+from xact_types.models.wavebank.extraction import DEFAULT_MAX_BYTES_IN_FLIGHT
+from xact_types.models.wavebank.wavebank import WaveBank
+from xact_types.utils.aio import ByteBudget
+
+DEFAULT_CONCURRENCY = 4
+
+
+async def load_many(xwb_paths: Iterable[Path], concurrency: int = DEFAULT_CONCURRENCY,
+                    max_bytes_in_flight: int = DEFAULT_MAX_BYTES_IN_FLIGHT, lazy: bool = False,
+                    validate: ValidationMode = 'full') -> AsyncIterator[WaveBank]:
+    """
+    Loads the banks at ``xwb_paths`` with ``WaveBank.afrom_xwb``, yielding each as soon as it has loaded
+    (so not necessarily in the order of ``xwb_paths`` - use each bank's ``file_name`` to tell them apart).
+
+    At most ``concurrency`` banks are loaded at once, and their reads share a budget of ``max_bytes_in_flight``
+    bytes of audio (see ``ByteBudget``), so memory use stays bounded however many banks are given.
+    Paths are only taken from ``xwb_paths`` as earlier loads finish.
+
+    If a load fails, or the loop over the banks stops early, every other load is cancelled and its file closed
+    before the error (or the generator's ``aclose``) continues.
+    """
+    if concurrency < 1:
+        raise ValueError(f'At least one bank must be loaded at a time. (got {concurrency})')
+
+    byte_budget = ByteBudget(max_bytes_in_flight)
+    xwb_paths = iter(xwb_paths)
+    pending: set[asyncio.Task] = set()
+
+    def schedule_loads():
+        while len(pending) < concurrency and (xwb_path := next(xwb_paths, None)) is not None:
+            pending.add(asyncio.create_task(WaveBank.afrom_xwb(xwb_path, lazy=lazy, validate=validate,
+                                                               byte_budget=byte_budget)))
+
+    try:
+        schedule_loads()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+
+            # Finished loads are replaced before yielding, so loading carries on while the consumer is busy
+            schedule_loads()
+            for task in done:
+                yield task.result()
+
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
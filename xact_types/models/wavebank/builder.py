@@ -0,0 +1,307 @@
+import datetime
+import struct
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Iterable, NamedTuple
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.enums.wavebank_flags import WaveBankFlags, WaveBankTypes
+from xact_types.models.wavebank.entry_segments import ENTRY_NAME_LENGTH, encode_entry_names
+from xact_types.models.wavebank.layout import align
+from xact_types.models.wavebank.wave_format import WaveFormat
+from xact_types.models.wavebank.wavebank import _ENTRY_METADATA_STRUCT, _V45_HEADER_STRUCT, XwbValidationError, \
+    get_play_region_offset, pack_entry_table, pack_v45_header
+from xact_types.utils.adpcm import ADPCM_BLOCK_ALIGNMENT_OFFSET
+from xact_types.utils.arrays import UINT32_ARRAY_TYPECODE
+from xact_types.utils.file_io import DEFAULT_COPY_CHUNK_SIZE, copy_file_range
+from xact_types.utils.instrumentation import DISABLED_INSTRUMENTATION, Instrumentation
+from xact_types.utils.pcm import MAX_ALIGNMENT, MAX_CHANNELS, MAX_SAMPLE_RATE
+from xact_types.utils.wavebank_audio_format import encode_v2plus_audio_format_from_wave_format, get_sample_count
+
+_RIFF_HEADER_STRUCT = struct.Struct('<4sI4s')
+_CHUNK_HEADER_STRUCT = struct.Struct('<4sI')
+_FMT_CHUNK_STRUCT = struct.Struct('<HHIIHH')
+
+# `wFormatTag` values of a WAV file's `fmt ` chunk (extensible formats store the real tag in their subformat GUID)
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_ADPCM = 0x0002
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+_EXTENSIBLE_SUBFORMAT_OFFSET = _FMT_CHUNK_STRUCT.size + 8
+
+# Default payload alignment within the play region, for in-memory and streaming banks respectively
+DEFAULT_ALIGNMENT = 4
+DEFAULT_STREAMING_ALIGNMENT = 2048
+
+# Offsets and lengths are stored as unsigned 32-bit values
+_MAX_PLAY_REGION_LENGTH = 0xFFFFFFFF
+
+
+class WaveSource(NamedTuple):
+    """An entry's audio - ``length`` bytes at ``offset`` in the file at ``path`` - along with its format."""
+    name: str
+    path: Path
+    offset: int
+    length: int
+    wave_format: WaveFormat
+    loop_start: int = 0
+    loop_length: int = 0
+    # The length in samples, if it can't be derived from the format (e.g. for entries copied from another bank)
+    duration: int | None = None
+
+
+class WaveBankLayout(NamedTuple):
+    """Where everything is placed in a bank built by ``WaveBankBuilder``."""
+    # The length of the header, entry table and entry names, before the padding up to the play region
+    header_length: int
+    play_region_offset: int
+    play_region_length: int
+    # Each entry's offset, relative to the start of the play region
+    entry_offsets: array
+
+
+def _get_wave_format(format_tag: int, channels: int, sample_rate: int, block_align: int, bits_per_sample: int,
+                     wav_path: Path) -> WaveFormat:
+    """
+    Converts the fields of a WAV file's `fmt ` chunk into the equivalent XWB format,
+    checking they fit the packed format's fields (see ``encode_v2plus_audio_format``).
+    """
+    if not 0 < channels <= MAX_CHANNELS:
+        raise ValueError(f'Only 1 to {MAX_CHANNELS} channels can be stored in a wave bank. '
+                         f'(got {channels} channels in {wav_path})')
+    if not 0 < sample_rate < MAX_SAMPLE_RATE:
+        raise ValueError(f'Only sample rates below {MAX_SAMPLE_RATE} can be stored in a wave bank. '
+                         f'(got {sample_rate} in {wav_path})')
+
+    if format_tag == _WAVE_FORMAT_PCM:
+        if bits_per_sample not in (8, 16):
+            raise ValueError(f'Only 8 and 16-bit PCM can be stored in a wave bank. '
+                             f'(got {bits_per_sample}-bit audio in {wav_path})')
+        codec = MiniFormatTag.Pcm
+        alignment = block_align
+        bits_per_sample_flag = 1 if bits_per_sample == 16 else 0
+    elif format_tag == _WAVE_FORMAT_ADPCM:
+        codec = MiniFormatTag.Adpcm
+        alignment = (block_align // channels) - ADPCM_BLOCK_ALIGNMENT_OFFSET
+        bits_per_sample_flag = 0
+    else:
+        raise ValueError(f'Unsupported WAV format. (expected PCM or MS ADPCM, got format tag {format_tag:#06x} '
+                         f'in {wav_path})')
+
+    if not 0 <= alignment <= MAX_ALIGNMENT:
+        raise ValueError(f'Block alignment can not be stored in a wave bank. (got {block_align} bytes for '
+                         f'{channels} channels, giving an alignment of {alignment} (limit is {MAX_ALIGNMENT}) '
+                         f'in {wav_path})')
+
+    return WaveFormat(codec=codec, channels=channels, rate=sample_rate, alignment=alignment,
+                      bits_per_sample=bits_per_sample_flag)
+
+
+def read_wav_source(wav_path: Path, name: str | None = None) -> WaveSource:
+    """
+    Reads the format of the WAV file at ``wav_path`` and locates its audio, without reading the audio itself.
+    The entry is named after the file (without its extension), unless ``name`` is given.
+    """
+    wave_format = None
+    data_location = None
+
+    with open(wav_path, 'rb') as wav_file:
+        riff_id, _, wave_id = _RIFF_HEADER_STRUCT.unpack(wav_file.read(_RIFF_HEADER_STRUCT.size))
+        if riff_id != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError(f'Not a WAV file. (expected b\'RIFF\' and b\'WAVE\', got {riff_id} and {wave_id} '
+                             f'in {wav_path})')
+
+        while wave_format is None or data_location is None:
+            chunk_header = wav_file.read(_CHUNK_HEADER_STRUCT.size)
+            if len(chunk_header) < _CHUNK_HEADER_STRUCT.size:
+                raise ValueError(f'WAV file is missing its {"`fmt `" if wave_format is None else "`data`"} chunk. '
+                                 f'({wav_path})')
+
+            chunk_id, chunk_length = _CHUNK_HEADER_STRUCT.unpack(chunk_header)
+            chunk_start = wav_file.tell()
+
+            if chunk_id == b'fmt ':
+                chunk = wav_file.read(chunk_length)
+                format_tag, channels, sample_rate, _, block_align, bits_per_sample = \
+                    _FMT_CHUNK_STRUCT.unpack_from(chunk)
+                if format_tag == _WAVE_FORMAT_EXTENSIBLE:
+                    (format_tag,) = struct.unpack_from('<H', chunk, _EXTENSIBLE_SUBFORMAT_OFFSET)
+                wave_format = _get_wave_format(format_tag, channels, sample_rate, block_align, bits_per_sample,
+                                               wav_path)
+            elif chunk_id == b'data':
+                data_location = (chunk_start, chunk_length)
+
+            # Chunks are padded to an even length
+            wav_file.seek(chunk_start + chunk_length + (chunk_length & 1))
+
+    return WaveSource(name=wav_path.stem if name is None else name, path=wav_path, offset=data_location[0],
+                      length=data_location[1], wave_format=wave_format)
+
+
+class WaveBankBuilder:
+    """
+    Packs audio from other files into a new v45 PC wave bank, laying out its entry table and play region itself.
+
+    Only each source's format and location are held while building, and payloads are copied straight from their
+    source files into the bank by the kernel where possible (see ``copy_file_range``), or otherwise through
+    one fixed-size buffer, so memory use doesn't grow with the amount of audio packed.
+    """
+
+    def __init__(self, bank_name: str, streaming: bool = False, alignment: int | None = None,
+                 include_entry_names: bool = True):
+        if alignment is None:
+            alignment = DEFAULT_STREAMING_ALIGNMENT if streaming else DEFAULT_ALIGNMENT
+
+        if not 0 < len(bank_name.encode('latin-1')) < 64:
+            raise ValueError(f'Bank name must be between 1 and 63 characters long. (got {bank_name!r})')
+        if alignment <= 0:
+            raise ValueError(f'Alignment must be positive. (got {alignment})')
+
+        self.bank_name = bank_name
+        self.streaming = streaming
+        self.alignment = alignment
+        self.include_entry_names = include_entry_names
+        self.sources: list[WaveSource] = []
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def add_source(self, source: WaveSource) -> int:
+        """Adds ``source`` as the next entry, returning its index."""
+        self.sources.append(source)
+        return len(self.sources) - 1
+
+    def add_wav(self, wav_path: Path, name: str | None = None) -> int:
+        """Adds the WAV file at ``wav_path`` as the next entry (see ``read_wav_source``), returning its index."""
+        return self.add_source(read_wav_source(wav_path, name))
+
+    def add_wavs(self, wav_paths: Iterable[Path]) -> range:
+        """Adds every WAV file in ``wav_paths`` in order, returning the range of their indices."""
+        first_index = len(self.sources)
+        for wav_path in wav_paths:
+            self.add_wav(wav_path)
+        return range(first_index, len(self.sources))
+
+    @classmethod
+    def from_directory(cls, wav_dir: Path, bank_name: str | None = None, pattern: str = '*.wav',
+                       **builder_options) -> 'WaveBankBuilder':
+        """Creates a builder with every file in ``wav_dir`` matching ``pattern``, in order of file name."""
+        builder = cls(wav_dir.name if bank_name is None else bank_name, **builder_options)
+        builder.add_wavs(sorted(wav_dir.glob(pattern)))
+        return builder
+
+    def compute_layout(self) -> WaveBankLayout:
+        header_length = _V45_HEADER_STRUCT.size + (_ENTRY_METADATA_STRUCT.size * len(self.sources))
+        if self.include_entry_names:
+            header_length += ENTRY_NAME_LENGTH * len(self.sources)
+
+        entry_offsets = array(UINT32_ARRAY_TYPECODE)
+        play_region_length = 0
+        for source in self.sources:
+            entry_offset = align(play_region_length, self.alignment)
+            entry_offsets.append(entry_offset)
+            play_region_length = entry_offset + source.length
+
+        if play_region_length > _MAX_PLAY_REGION_LENGTH:
+            raise XwbValidationError(f'Audio data is too large for a wave bank. '
+                                     f'(limit is {_MAX_PLAY_REGION_LENGTH} bytes, got {play_region_length})')
+
+        return WaveBankLayout(header_length, get_play_region_offset(header_length), play_region_length, entry_offsets)
+
+    def encode_header(self, layout: WaveBankLayout, build_date: datetime.datetime | None = None) -> bytearray:
+        """
+        Packs everything before the play region (including the padding up to it) for ``layout``.
+        Entry names are checked here, so a bank with an invalid name fails before any audio is copied.
+        """
+        if build_date is None:
+            build_date = datetime.datetime.now()
+
+        entry_table_offset = _V45_HEADER_STRUCT.size
+        entry_table_length = _ENTRY_METADATA_STRUCT.size * len(self.sources)
+
+        flags = WaveBankTypes.streaming if self.streaming else WaveBankTypes.buffer
+        entry_names_segment = (0, 0)
+        entry_names_data = b''
+        if self.include_entry_names:
+            flags |= WaveBankFlags.entry_names_included
+            try:
+                entry_names_data = encode_entry_names(source.name for source in self.sources)
+            except ValueError as e:
+                raise XwbValidationError(str(e)) from e
+            entry_names_segment = (entry_table_offset + entry_table_length, len(entry_names_data))
+
+        # Padding up to the play region is included in the buffer, as it is already zeroed
+        header_buffer = bytearray(layout.play_region_offset)
+
+        # Built banks have no seek tables, and never use the compact entry format
+        segments = (0, 0, *entry_names_segment, layout.play_region_offset, layout.play_region_length)
+        pack_v45_header(header_buffer, segments, flags, len(self.sources), self.bank_name,
+                        ENTRY_NAME_LENGTH if self.include_entry_names else 0, self.alignment, 0, build_date)
+
+        entry_rows = []
+        for source, entry_offset in zip(self.sources, layout.entry_offsets):
+            audio_format = encode_v2plus_audio_format_from_wave_format(source.wave_format)
+            sample_count = source.duration
+            if sample_count is None:
+                sample_count = get_sample_count(audio_format, 45, source.length) or 0
+
+            entry_rows.append((sample_count << 4, audio_format, entry_offset, source.length, source.loop_start,
+                               source.loop_length))
+        pack_entry_table(header_buffer, entry_rows)
+
+        if entry_names_data:
+            header_buffer[entry_names_segment[0]:entry_names_segment[0] + len(entry_names_data)] = entry_names_data
+
+        return header_buffer
+
+    def write_xwb(self, destination: BinaryIO | Path, build_date: datetime.datetime | None = None,
+                  chunk_size: int = DEFAULT_COPY_CHUNK_SIZE,
+                  instrumentation: Instrumentation = DISABLED_INSTRUMENTATION) -> int:
+        """
+        Writes the bank to ``destination``, either a writable binary stream or a file path,
+        returning the number of bytes written.
+        Sources that can't be copied by the kernel are read in chunks of up to ``chunk_size`` bytes.
+        """
+        with instrumentation.phase('entry_table'):
+            layout = self.compute_layout()
+            header_buffer = self.encode_header(layout, build_date)
+            instrumentation.count(bytes=layout.header_length, items=len(self.sources))
+
+        if isinstance(destination, Path):
+            with open(destination, 'wb') as xwb_file:
+                return self._write_layout(xwb_file, layout, header_buffer, chunk_size, instrumentation)
+
+        return self._write_layout(destination, layout, header_buffer, chunk_size, instrumentation)
+
+    def _write_layout(self, xwb_file: BinaryIO, layout: WaveBankLayout, header_buffer: bytearray, chunk_size: int,
+                      instrumentation: Instrumentation) -> int:
+        with instrumentation.phase('header'):
+            xwb_file.write(header_buffer)
+            instrumentation.count(bytes=len(header_buffer))
+
+        copy_buffer = memoryview(bytearray(chunk_size))
+        written = len(header_buffer)
+
+        with instrumentation.phase('payloads'):
+            for source, entry_offset in zip(self.sources, layout.entry_offsets):
+                padding_length = entry_offset - (written - layout.play_region_offset)
+                if padding_length:
+                    xwb_file.write(bytes(padding_length))
+                    written += padding_length
+
+                written += _copy_source(source, xwb_file, copy_buffer)
+
+            instrumentation.count(bytes=layout.play_region_length, items=len(self.sources))
+
+        return written
+
+
+def _copy_source(source: WaveSource, destination: BinaryIO, copy_buffer: memoryview) -> int:
+    """Copies the audio of ``source`` to ``destination`` (see ``copy_file_range``), returning its length."""
+    with open(source.path, 'rb', buffering=0) as source_file:
+        copied = copy_file_range(source_file, destination, source.offset, source.length, copy_buffer)
+
+    if copied != source.length:
+        raise XwbValidationError(f'Audio source ended early. (expected {source.length} bytes at offset '
+                                 f'{source.offset} of {source.path}, {source.length - copied} bytes short)')
+
+    return source.length
@@ -0,0 +1,64 @@
+import hashlib
+from collections import Counter
+from typing import Iterable, NamedTuple
+
+from typing_extensions import Buffer
+
+# Payloads are hashed a chunk at a time, so long payloads are fed to the hash without being copied as a whole
+DEFAULT_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class PayloadDeduplication(NamedTuple):
+    # The index of the entry whose stored copy of its payload each entry uses (its own index if it is unique)
+    sources: tuple[int, ...]
+    # The length of every duplicate payload that doesn't need to be stored again
+    saved_bytes: int
+
+    @property
+    def duplicate_count(self) -> int:
+        return sum(source != index for index, source in enumerate(self.sources))
+
+
+def get_payload_digest(payload: Buffer, chunk_size: int = DEFAULT_HASH_CHUNK_SIZE) -> bytes:
+    """Returns a BLAKE2b digest of ``payload``, hashing it ``chunk_size`` bytes at a time."""
+    view = memoryview(payload).cast('B')
+    digest = hashlib.blake2b(digest_size=32)
+    for chunk_start in range(0, len(view), chunk_size):
+        digest.update(view[chunk_start:chunk_start + chunk_size])
+    return digest.digest()
+
+
+def find_duplicate_payloads(payloads: Iterable[Buffer],
+                            chunk_size: int = DEFAULT_HASH_CHUNK_SIZE) -> PayloadDeduplication:
+    """
+    Finds payloads with identical contents, so each only needs to be stored once.
+
+    Only payloads whose length is shared by another are hashed, and the same object appearing twice
+    (e.g. entries that share a payload since they were loaded from the same offset) is matched without hashing.
+    """
+    payloads = list(payloads)
+    views = [memoryview(payload).cast('B') for payload in payloads]
+    length_counts = Counter(len(view) for view in views)
+
+    sources = []
+    saved_bytes = 0
+    # Keyed by both the payload object's identity and its digest, so shared objects skip hashing
+    # (the objects are all held by `payloads` until the end, so their ids can't be reused)
+    first_indices_by_object: dict[int, int] = {}
+    first_indices_by_digest: dict[tuple[int, bytes], int] = {}
+
+    for index, (payload, view) in enumerate(zip(payloads, views)):
+        source = index
+        if length_counts[len(view)] > 1 and len(view) != 0:
+            source = first_indices_by_object.get(id(payload), index)
+
+            if source == index:
+                digest_key = (len(view), get_payload_digest(view, chunk_size))
+                source = first_indices_by_digest.setdefault(digest_key, index)
+                first_indices_by_object[id(payload)] = source
+
+        if source != index:
+            saved_bytes += len(view)
+        sources.append(source)
+
+    return PayloadDeduplication(tuple(sources), saved_bytes)
@@ -0,0 +1,143 @@
+import bisect
+import struct
+import sys
+from array import array
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+# Only needed for annotations, and slow to import, which matters to the command line tools (see `layout`)
+if TYPE_CHECKING:
+    from typing_extensions import Buffer
+
+from xact_types.utils.arrays import UINT32_ARRAY_TYPECODE
+
+# The default size of each element of the `EntryNames` segment (`WAVEBANK_ENTRYNAME_LENGTH` in xact3wb.h)
+ENTRY_NAME_LENGTH = 64
+
+# Marks an entry without a seek table in the seek table segment's offset table
+NO_SEEK_TABLE = 0xFFFFFFFF
+
+_UINT32_STRUCTS = {byte_order: struct.Struct(f'{byte_order}I') for byte_order in '<>'}
+
+
+def _is_native_byte_order(byte_order: str) -> bool:
+    return (byte_order == '>') == (sys.byteorder == 'big')
+
+
+def _uint32_array(data: 'Buffer', byte_order: str) -> array:
+    values = array(UINT32_ARRAY_TYPECODE, bytes(data))
+    if not _is_native_byte_order(byte_order):
+        values.byteswap()
+    return values
+
+
+def _uint32_array_bytes(values: array, byte_order: str) -> bytes:
+    if not _is_native_byte_order(byte_order):
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def decode_entry_names(segment: 'Buffer', entry_count: int, element_size: int) -> tuple[str, ...]:
+    """Decodes the `EntryNames` segment, which holds a fixed-size, null-padded name for each entry."""
+    segment = bytes(segment)
+
+    if element_size <= 0:
+        raise ValueError(f'Entry name element size must be positive. (got {element_size})')
+    if len(segment) < entry_count * element_size:
+        raise ValueError(f'Entry names segment is truncated. '
+                         f'(expected {entry_count * element_size} bytes, got {len(segment)})')
+
+    # Characters are packed individually as bytes, so latin-1 maps them 1:1
+    return tuple(
+        segment[start:start + element_size].split(b'\0', 1)[0].decode('latin-1')
+        for start in range(0, entry_count * element_size, element_size)
+    )
+
+
+def encode_entry_names(entry_names: Iterable[str], element_size: int = ENTRY_NAME_LENGTH) -> bytes:
+    encoded_names = []
+    for name in entry_names:
+        encoded_name = name.encode('latin-1')
+        # Names must leave room for their null terminator
+        if len(encoded_name) >= element_size:
+            raise ValueError(f'Entry name is too long. (got {name!r}, limit is {element_size - 1} characters)')
+        encoded_names.append(encoded_name.ljust(element_size, b'\0'))
+
+    return b''.join(encoded_names)
+
+
+def get_entry_name_index(entry_names: Iterable[str]) -> dict[str, int]:
+    """Maps each entry name to its entry's index. Unnamed entries are skipped, and repeated names map to the first."""
+    name_index: dict[str, int] = {}
+    for index, name in enumerate(entry_names):
+        if name:
+            name_index.setdefault(name, index)
+    return name_index
+
+
+def decode_seek_tables(segment: 'Buffer', entry_count: int, byte_order: str = '<') -> tuple[array | None, ...]:
+    """
+    Decodes the `SeekTables` segment into a table for each entry (or ``None``, for entries without one).
+
+    The segment starts with an offset for each entry, relative to the end of those offsets,
+    pointing to a count followed by that many cumulative byte positions - one for each packet of the entry.
+    Values are read in ``byte_order`` (a ``struct`` byte order character), and returned in native order.
+    """
+    segment = memoryview(segment).cast('B')
+    uint32_struct = _UINT32_STRUCTS[byte_order]
+    offsets_length = entry_count * uint32_struct.size
+
+    if len(segment) < offsets_length:
+        raise ValueError(f'Seek tables segment is truncated. (expected at least {offsets_length} bytes, '
+                         f'got {len(segment)})')
+
+    seek_tables: list[array | None] = []
+    for table_offset in _uint32_array(segment[:offsets_length], byte_order):
+        if table_offset == NO_SEEK_TABLE:
+            seek_tables.append(None)
+            continue
+
+        table_start = offsets_length + table_offset
+        if table_start + uint32_struct.size > len(segment):
+            raise ValueError(f'Seek table lies outside the seek tables segment. (offset {table_offset})')
+
+        (packet_count,) = uint32_struct.unpack_from(segment, table_start)
+        table_end = table_start + (uint32_struct.size * (packet_count + 1))
+        if table_end > len(segment):
+            raise ValueError(f'Seek table runs past the end of the seek tables segment. '
+                             f'(offset {table_offset}, {packet_count} packets)')
+
+        seek_tables.append(_uint32_array(segment[table_start + uint32_struct.size:table_end], byte_order))
+
+    return tuple(seek_tables)
+
+
+def encode_seek_tables(seek_tables: Sequence[Sequence[int] | None], byte_order: str = '<') -> bytes:
+    offsets = array(UINT32_ARRAY_TYPECODE)
+    tables = []
+    tables_length = 0
+
+    for seek_table in seek_tables:
+        if seek_table is None:
+            offsets.append(NO_SEEK_TABLE)
+            continue
+
+        offsets.append(tables_length)
+        table = array(UINT32_ARRAY_TYPECODE, [len(seek_table)])
+        table.extend(seek_table)
+        tables.append(_uint32_array_bytes(table, byte_order))
+        tables_length += len(tables[-1])
+
+    return _uint32_array_bytes(offsets, byte_order) + b''.join(tables)
+
+
+def find_seek_packet(seek_table: Sequence[int], position: int) -> int:
+    """
+    Returns the index of the packet to start decoding from to reach ``position`` (a byte offset in the decoded audio),
+    using an entry's seek table of cumulative decoded byte positions.
+    """
+    if position < 0:
+        raise ValueError(f'Seek position must not be negative. (got {position})')
+
+    # Each value is the decoded length up to the end of its packet, so the packet needed is the first ending after it
+    return min(bisect.bisect_right(seek_table, position), max(len(seek_table) - 1, 0))
@@ -0,0 +1,165 @@
+import wave
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.utils.pcm import swap_pcm16_byte_order
+from xact_types.utils.wavebank_audio_format import decode_audio_format
+
+# The default limit on the audio data held by queued and running extraction jobs at any one time
+DEFAULT_MAX_BYTES_IN_FLIGHT = 64 * 1024 * 1024
+
+
+class PcmExtractionJob(NamedTuple):
+    """
+    Describes a single PCM sound to write to ``sound_path`` as a WAV file.
+
+    The audio is either given directly as ``audio_data``,
+    or read from ``source_length`` bytes at ``source_offset`` within the file at ``source_path``.
+    """
+    sound_path: Path
+    channels: int
+    sample_rate: int
+    audio_data: bytes | memoryview | None = None
+    source_path: Path | None = None
+    source_offset: int = 0
+    source_length: int = 0
+    # Set for 16-bit audio from big-endian banks, as WAV files are little-endian
+    swap_byte_order: bool = False
+
+    @property
+    def size(self) -> int:
+        return self.source_length if self.audio_data is None else len(self.audio_data)
+
+
+def write_pcm_wav(job: PcmExtractionJob) -> Path:
+    audio_data = job.audio_data
+
+    if audio_data is None:
+        # Each job opens its own handle, so jobs never share a file position between threads
+        with open(job.source_path, 'rb') as source_file:
+            source_file.seek(job.source_offset)
+            audio_data = source_file.read(job.source_length)
+
+    if job.swap_byte_order:
+        audio_data = swap_pcm16_byte_order(audio_data)
+
+    with wave.open(str(job.sound_path), 'wb') as wav_file:
+
+        wav_file.setnchannels(job.channels)
+        wav_file.setframerate(job.sample_rate)
+        wav_file.setsampwidth(job.channels)
+        wav_file.writeframes(audio_data)
+
+    return job.sound_path
+
+
+def run_extraction_jobs(jobs: Iterable[PcmExtractionJob | None], workers: int | None = None,
+                        use_processes: bool = False,
+                        max_bytes_in_flight: int = DEFAULT_MAX_BYTES_IN_FLIGHT) -> list[Path | None]:
+    """
+    Runs every job on a thread pool (or a process pool, if ``use_processes`` is set) of ``workers`` workers,
+    returning each job's WAV path in the same order as ``jobs``. ``None`` jobs are skipped and give ``None``.
+
+    Jobs are only submitted while the audio held by submitted, unfinished jobs is within ``max_bytes_in_flight``,
+    so memory use is bounded however many jobs there are. A job larger than the limit runs on its own.
+    """
+    results: list[Path | None] = []
+    pending: dict[Future, tuple[int, int]] = {}
+    bytes_in_flight = 0
+
+    def collect_finished(return_when: str):
+        nonlocal bytes_in_flight
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            index, size = pending.pop(future)
+            results[index] = future.result()
+            bytes_in_flight -= size
+
+    executor: Executor = ProcessPoolExecutor(workers) if use_processes else ThreadPoolExecutor(workers)
+
+    with executor:
+        try:
+            for job in jobs:
+                results.append(None)
+                if job is None:
+                    continue
+
+                while pending and bytes_in_flight + job.size > max_bytes_in_flight:
+                    collect_finished(FIRST_COMPLETED)
+
+                if use_processes and isinstance(job.audio_data, memoryview):
+                    # Views can't be sent to other processes, so copy only when the job is about to be submitted
+                    job = job._replace(audio_data=bytes(job.audio_data))
+
+                pending[executor.submit(write_pcm_wav, job)] = (len(results) - 1, job.size)
+                bytes_in_flight += job.size
+
+            while pending:
+                collect_finished(FIRST_COMPLETED)
+
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+    return results
+
+
+def get_xwb_extraction_jobs(xwb_path: Path, extract_dir: Path) -> list[PcmExtractionJob | None]:
+    """
+    Creates an extraction job for each entry of the wave bank at ``xwb_path`` (``None`` for entries that aren't PCM),
+    reading only the bank's header and entry table.
+    """
+    from xact_types.models.wavebank.scan import scan_xwb
+
+    xwb_scan = scan_xwb(xwb_path)
+
+    jobs: list[PcmExtractionJob | None] = []
+
+    for count, info in enumerate(xwb_scan.streams):
+        format_info = decode_audio_format(info.format, xwb_scan.header.version)
+
+        if format_info.codec != MiniFormatTag.Pcm:
+            jobs.append(None)
+            continue
+
+        jobs.append(PcmExtractionJob(
+            sound_path=extract_dir / f'{xwb_scan.data.bank_name}_sound_{count}.wav',
+            channels=format_info.channels,
+            sample_rate=format_info.rate,
+            source_path=xwb_path,
+            source_offset=xwb_scan.play_region_offset + info.file_offset,
+            source_length=info.file_length,
+            swap_byte_order=xwb_scan.header.big_endian and format_info.bits_per_sample == 1
+        ))
+
+    return jobs
+
+
+def extract_raw_pcm_sounds_from_banks(xwb_paths: Iterable[Path], extract_dir: Path, workers: int | None = None,
+                                      use_processes: bool = False,
+                                      max_bytes_in_flight: int = DEFAULT_MAX_BYTES_IN_FLIGHT
+                                      ) -> list[list[Path | None]]:
+    """
+    Extracts the PCM sounds of many wave banks at once, without loading any bank's audio up front.
+
+    Entries from every bank are scheduled together on one pool (see ``run_extraction_jobs``),
+    and the WAV files written are identical to those of ``WaveBank.extract_raw_pcm_sounds``.
+    Returns the list ``extract_raw_pcm_sounds`` would for each bank, in the order of ``xwb_paths``.
+    """
+    bank_jobs = [get_xwb_extraction_jobs(xwb_path, extract_dir) for xwb_path in xwb_paths]
+
+    results = run_extraction_jobs(
+        (job for jobs in bank_jobs for job in jobs),
+        workers=workers, use_processes=use_processes, max_bytes_in_flight=max_bytes_in_flight
+    )
+
+    bank_results = []
+    cur_idx = 0
+    for jobs in bank_jobs:
+        bank_results.append(results[cur_idx:cur_idx + len(jobs)])
+        cur_idx += len(jobs)
+
+    return bank_results
@@ -0,0 +1,318 @@
+import functools
+import struct
+from array import array
+from typing import BinaryIO, NamedTuple, Sequence
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.enums.wavebank_flags import WaveBankFlags
+from xact_types.models.wavebank.entry_segments import ENTRY_NAME_LENGTH, decode_entry_names, decode_seek_tables
+
+# Everything here is read with the standard library alone, as it's shared by `WaveBank` and the command line tools,
+# which avoid importing pydantic to start quickly
+
+
+class XwbValidationError(ValueError):
+    """Denotes a concrete error with an XWB file's contents. Should *not* be used for heuristics."""
+    pass
+
+
+# Byte orders are given as `struct` byte order characters - PC banks are little-endian, and Xbox 360 banks big-endian
+_BYTE_ORDERS = '<>'
+
+# The magic number is stored as a 32-bit value, so reads backwards in big-endian banks
+_MAGIC_NUMBERS = {'<': b'WBND', '>': b'DNBW'}
+_MAGIC_NUMBER_BYTE_ORDERS = {magic_number: byte_order for byte_order, magic_number in _MAGIC_NUMBERS.items()}
+
+_INT32_STRUCTS = {byte_order: struct.Struct(f'{byte_order}i') for byte_order in _BYTE_ORDERS}
+_UINT32_STRUCTS = {byte_order: struct.Struct(f'{byte_order}I') for byte_order in _BYTE_ORDERS}
+
+# The segments' offsets and lengths follow the magic number, content version and tool version in v42+ headers
+_SEGMENTS_OFFSET = 12
+
+# The build time (a FILETIME) follows the compact format in v42+ bank data
+# The difference between the FILETIME and POSIX epochs, in 100ns intervals
+# (https://devblogs.microsoft.com/oldnewthing/20220602-00/?p=106706)
+FILETIME_EPOCH_OFFSET = 116444736000000000
+_BUILD_TIME_STRUCTS = {byte_order: struct.Struct(f'{byte_order}Q') for byte_order in _BYTE_ORDERS}
+
+# Fields of an entry's metadata in the order they are stored - element sizes below 24 bytes omit trailing fields
+# NOTE: The format is stored such that it is a negative number when signed,
+#  so the hex when naively converted won't be what to actually check against
+ENTRY_METADATA_FIELDS = ('flags_and_duration', 'format', 'file_offset', 'file_length', 'loop_start', 'loop_length')
+_V1_ENTRY_METADATA_FIELDS = ('format', 'file_offset', 'file_length', 'loop_start', 'loop_length')
+
+# Compact entries pack their offset (in alignment units) into the low bits, and the deviation of their length above it
+_COMPACT_OFFSET_MASK = (1 << 21) - 1
+
+
+def get_byte_order(big_endian: bool) -> str:
+    return '>' if big_endian else '<'
+
+
+def align(value: int, alignment: int) -> int:
+    """Rounds ``value`` up to the next multiple of ``alignment``."""
+    return -(-value // alignment) * alignment
+
+
+def read_int32_from_stream(stream: BinaryIO, byte_order: str = '<') -> int:
+    return _INT32_STRUCTS[byte_order].unpack(stream.read(4))[0]
+
+def read_uint32_from_stream(stream: BinaryIO, byte_order: str = '<') -> int:
+    return _UINT32_STRUCTS[byte_order].unpack(stream.read(4))[0]
+
+
+class XwbLayout(NamedTuple):
+    """The header and bank data of a wave bank, as plain values (see ``WaveBankHeader`` and ``WaveBankData``)."""
+    version: int
+    big_endian: bool
+    # The `(offset, length)` of every segment - banks older than v4 have 4 segments, and their fifth is left empty
+    segments: tuple[tuple[int, int], ...]
+    # The index of the play region (the last segment the bank's version has)
+    last_segment_idx: int
+
+    flags: int
+    entry_count: int
+    bank_name: str
+    entry_metadata_element_size: int
+    entry_name_element_size: int
+    alignment: int
+    compact_format: int
+    build_time: int
+
+    # Where the play region actually starts, which is calculated for banks that leave its offset as 0
+    play_region_offset: int
+
+    @property
+    def byte_order(self) -> str:
+        return get_byte_order(self.big_endian)
+
+
+def read_xwb_layout(xwb_file: BinaryIO) -> XwbLayout:
+    """Reads the header and bank data at the start of ``xwb_file``, leaving it at an unspecified position."""
+    file_magic_number = xwb_file.read(4)
+    if (byte_order := _MAGIC_NUMBER_BYTE_ORDERS.get(file_magic_number)) is None:
+        raise XwbValidationError(f"Wavebank file is missing magic number. "
+                                 f"(expected b'WBND' or b'DNBW', got {file_magic_number})")
+
+    # XWB PARSING
+    # Adapted from MonoXNA & MonoGame
+    # Originally adapted from Luigi Auriemma's unxwb
+    # (I wonder how long this comment chain will get?)
+
+    version = read_int32_from_stream(xwb_file, byte_order)
+
+    last_segment_idx = 4
+
+    if version <= 3:
+        last_segment_idx = 3
+    if version >= 42:
+        # Skip the tool version
+        xwb_file.read(4)
+
+    segments = [(0, 0)] * 5
+    for i in range(last_segment_idx + 1):
+        segments[i] = (read_uint32_from_stream(xwb_file, byte_order), read_uint32_from_stream(xwb_file, byte_order))
+
+    # Move to the first segment
+    xwb_file.seek(segments[0][0])
+
+    # WAVEBANKDATA:
+
+    flags = read_int32_from_stream(xwb_file, byte_order)
+    entry_count = read_int32_from_stream(xwb_file, byte_order)
+
+    if version == 2 or version == 3:
+        bank_name_length = 16
+    else:
+        bank_name_length = 64
+
+    # The bank name buffer is fixed length, and null-padded
+    bank_name = xwb_file.read(bank_name_length).split(b'\0', 1)[0].decode('utf-8')
+
+    entry_name_element_size = 0
+    alignment = 0
+    compact_format = 0
+    build_time = 0
+
+    if version == 1:
+        entry_metadata_element_size = 20
+    else:
+        entry_metadata_element_size = read_int32_from_stream(xwb_file, byte_order)
+        entry_name_element_size = read_int32_from_stream(xwb_file, byte_order)
+        alignment = read_int32_from_stream(xwb_file, byte_order)
+
+    if (flags & WaveBankFlags.compact_format) != 0:
+        # The packed format shared by every entry of a compact bank
+        compact_format = read_uint32_from_stream(xwb_file, byte_order)
+    elif version >= 42:
+        xwb_file.read(4)
+
+    if version >= 42:
+        (build_time,) = _BUILD_TIME_STRUCTS[byte_order].unpack(xwb_file.read(8))
+
+    # The play region directly follows the entry table if its offset isn't given
+    play_region_offset = segments[last_segment_idx][0]
+    if play_region_offset == 0:
+        play_region_offset = segments[1][0] + (entry_count * entry_metadata_element_size)
+
+    return XwbLayout(
+        version=version,
+        big_endian=byte_order == '>',
+        segments=tuple(segments),
+        last_segment_idx=last_segment_idx,
+        flags=flags,
+        entry_count=entry_count,
+        bank_name=bank_name,
+        entry_metadata_element_size=entry_metadata_element_size,
+        entry_name_element_size=entry_name_element_size,
+        alignment=alignment,
+        compact_format=compact_format,
+        build_time=build_time,
+        play_region_offset=play_region_offset
+    )
+
+
+@functools.cache
+def get_entry_metadata_struct(version: int, element_size: int, is_compact_format: bool,
+                              byte_order: str = '<') -> struct.Struct:
+    """Returns a struct for decoding one element of the entry metadata table."""
+    if is_compact_format:
+        # Each entry is a single value, packing the entry's offset (in alignment units) and deviation
+        return struct.Struct(f'{byte_order}I')
+
+    if version == 1:
+        return struct.Struct(f'{byte_order}IIIII')
+
+    if element_size < 4 or element_size % 4 != 0:
+        raise XwbValidationError(f'Unsupported entry metadata element size. (got {element_size})')
+
+    field_count = min(element_size // 4, len(ENTRY_METADATA_FIELDS))
+    # Any bytes past the known fields are skipped
+    return struct.Struct(byte_order + 'IIIIII'[:field_count] + ('x' * (element_size - (field_count * 4))))
+
+
+def read_entry_columns(xwb_file: BinaryIO, layout: XwbLayout) -> dict[str, Sequence[int]]:
+    """
+    Reads the entry table of the bank described by ``layout`` as a column of values for each field
+    (of ``ENTRY_METADATA_FIELDS``) that the table stores. Fields that aren't stored are left out.
+    """
+    # Go to the first wave audio data
+    xwb_file.seek(layout.segments[1][0])  # METADATASEGMENT
+
+    is_compact_format = (layout.flags & WaveBankFlags.compact_format) != 0
+    play_region_length = layout.segments[layout.last_segment_idx][1]
+
+    # The whole entry table is read at once and decoded in bulk, rather than field by field
+    entry_struct = get_entry_metadata_struct(layout.version, layout.entry_metadata_element_size, is_compact_format,
+                                             layout.byte_order)
+    entry_table = xwb_file.read(layout.entry_count * entry_struct.size)
+
+    if len(entry_table) != layout.entry_count * entry_struct.size:
+        raise XwbValidationError(f'Entry metadata table is truncated. '
+                                 f'(expected {layout.entry_count * entry_struct.size} bytes, '
+                                 f'got {len(entry_table)})')
+
+    if is_compact_format:
+        file_offsets = [(length & _COMPACT_OFFSET_MASK) * layout.alignment
+                        for (length,) in entry_struct.iter_unpack(entry_table)]
+
+        # The length of the current stream is by definition the space between
+        # the current and next stream's offset (or the end of the segment, for the last stream)
+        next_offsets = file_offsets[1:] + [play_region_length]
+
+        return {
+            'format': [layout.compact_format] * layout.entry_count,
+            'file_offset': file_offsets,
+            'file_length': [next_offset - file_offset for file_offset, next_offset in zip(file_offsets, next_offsets)],
+        }
+
+    field_names = _V1_ENTRY_METADATA_FIELDS if layout.version == 1 else ENTRY_METADATA_FIELDS
+    columns: dict[str, Sequence[int]] = dict(zip(field_names, zip(*entry_struct.iter_unpack(entry_table))))
+
+    # If the metadata element size isn't large enough to include all fields,
+    # overwrite non-zero file lengths with the length of the last known segment (?)
+    if layout.entry_metadata_element_size < 24 and 'file_length' in columns:
+        columns['file_length'] = [play_region_length if file_length != 0 else 0
+                                  for file_length in columns['file_length']]
+
+    return columns
+
+
+def read_entry_segments(xwb_file: BinaryIO, layout: XwbLayout) -> tuple[tuple[str, ...], tuple[array | None, ...]]:
+    """Reads the entry names and seek tables of the bank described by ``layout``, either of which may be empty."""
+    # Seek tables were only added in later versions, where they take the place of entry names
+    segidx_entry_name = 2
+    if layout.version >= 42:
+        segidx_entry_name = 3
+
+    entry_names: tuple[str, ...] = ()
+    seek_tables: tuple[array | None, ...] = ()
+
+    try:
+        entry_names_offset, entry_names_length = layout.segments[segidx_entry_name]
+        if entry_names_offset != 0 and entry_names_length != 0:
+            xwb_file.seek(entry_names_offset)
+            entry_names = decode_entry_names(xwb_file.read(entry_names_length), layout.entry_count,
+                                             layout.entry_name_element_size or ENTRY_NAME_LENGTH)
+
+        seek_tables_offset, seek_tables_length = layout.segments[2]
+        if layout.version >= 42 and seek_tables_offset != 0 and seek_tables_length != 0:
+            xwb_file.seek(seek_tables_offset)
+            seek_tables = decode_seek_tables(xwb_file.read(seek_tables_length), layout.entry_count,
+                                             layout.byte_order)
+
+    except ValueError as e:
+        raise XwbValidationError(str(e)) from e
+
+    return entry_names, seek_tables
+
+
+def unpack_audio_format(format_data: int, version: int) -> tuple[MiniFormatTag, int, int, int, int]:
+    """
+    Unpacks an entry's packed format into its codec, channel count, sample rate, block alignment
+    and bits per sample flag (see ``decode_v2plus_bits_per_sample_flag``).
+    """
+    # Data descriptions from `unxwb`
+
+    # version 1:
+    # 1 00000000 000101011000100010 0 001 0
+    # | |         |                 | |   |
+    # | |         |                 | |   wFormatTag
+    # | |         |                 | nChannels
+    # | |         |                 ???
+    # | |         nSamplesPerSec
+    # | wBlockAlign
+    # wBitsPerSample
+    if version == 1:
+        codec           = MiniFormatTag(format_data                          & ((1 << 1) - 1))
+        channels        =              (format_data >>  1)                   & ((1 << 3) - 1)
+        rate            =              (format_data >> (1 + 3 + 1))          & ((1 << 18) - 1)
+        alignment       =              (format_data >> (1 + 3 + 1 + 18))     & ((1 << 8) - 1)
+        bits_per_sample =              (format_data >> (1 + 3 + 1 + 18 + 8)) & ((1 << 1) - 1)
+
+    # versions 2, 3, 37, 42, 43, 44 and so on, check WAVEBANKMINIWAVEFORMAT in xact3wb.h
+    # 0 00000000 000111110100000000 010 01
+    # | |        |                  |   |
+    # | |        |                  |   wFormatTag
+    # | |        |                  nChannels
+    # | |        nSamplesPerSec
+    # | wBlockAlign
+    # wBitsPerSample
+    else:
+        codec           = MiniFormatTag(format_data                          & ((1 << 2) - 1))
+        channels        =              (format_data >>  2)                   & ((1 << 3) - 1)
+        rate            =              (format_data >> (2 + 3))              & ((1 << 18) - 1)
+        alignment       =              (format_data >> (2 + 3 + 18))         & ((1 << 8) - 1)
+        bits_per_sample =              (format_data >> (1 + 3 + 1 + 18 + 8)) & ((1 << 1) - 1)
+
+    return codec, channels, rate, alignment, bits_per_sample
+
+
+def decode_v2plus_bits_per_sample_flag(bits_per_sample: int):
+    # https://github.com/NeoAxis/SDK/blob/master/Engine/Src/Core/External/DirectX/Include/xact3wb.h#L81
+    if bits_per_sample == 0:
+        return 8
+    elif bits_per_sample == 1:
+        return 16
+    else:
+        raise ValueError('Unknown bits_per_sample value')
@@ -0,0 +1,113 @@
+import datetime
+from pathlib import Path
+from typing import Iterable, Mapping
+
+from xact_types.models.wavebank.builder import WaveBankBuilder, WaveSource
+from xact_types.models.wavebank.scan import WaveBankScan, scan_xwb
+from xact_types.utils.instrumentation import DISABLED_INSTRUMENTATION, Instrumentation
+from xact_types.utils.wavebank_audio_format import decode_audio_format
+
+
+def get_wave_sources(scan: WaveBankScan, entries: Iterable[int | str] | None = None) -> list[WaveSource]:
+    """
+    Returns the location of every entry of a scanned bank (or those in ``entries``, given by index or name)
+    as a source for ``WaveBankBuilder``, so they can be copied into another bank without being read.
+    """
+    if scan.header.big_endian:
+        # 16-bit PCM would need byte-swapping, so can't be copied as is
+        raise NotImplementedError('Entries of big-endian wave banks can not be copied into another bank.')
+
+    indices = range(len(scan.streams)) if entries is None else [
+        scan.entry_name_index[entry] if isinstance(entry, str) else entry for entry in entries
+    ]
+
+    columns = scan.streams.columns
+    sources = []
+    for index in indices:
+        if scan.seek_tables and scan.seek_tables[index] is not None:
+            raise NotImplementedError(f'Entries with seek tables can not be copied into another bank. '
+                                      f'(entry {index} of {scan.file_name} has one)')
+
+        # Compact entries have no stored duration, so theirs is derived from their format instead
+        duration = columns['flags_and_duration'][index] >> 4
+
+        sources.append(WaveSource(
+            name=scan.entry_names[index] if scan.entry_names else '',
+            path=scan.file_name,
+            offset=scan.play_region_offset + columns['file_offset'][index],
+            length=columns['file_length'][index],
+            wave_format=decode_audio_format(columns['format'][index], scan.header.version),
+            loop_start=columns['loop_start'][index],
+            loop_length=columns['loop_length'][index],
+            duration=duration or None
+        ))
+
+    return sources
+
+
+def _create_builder(bank_name: str, scans: list[WaveBankScan], streaming: bool | None,
+                    alignment: int | None) -> WaveBankBuilder:
+    """Creates a builder for a bank of entries from ``scans``, keeping their settings unless they're overridden."""
+    if streaming is None:
+        streaming = any(scan.streaming for scan in scans)
+    if alignment is None:
+        alignment = max((scan.data.alignment for scan in scans if scan.data.alignment), default=None)
+
+    # Entry names are only kept if every entry has one
+    return WaveBankBuilder(bank_name, streaming=streaming, alignment=alignment,
+                           include_entry_names=all(scan.entry_names for scan in scans))
+
+
+def merge_xwbs(xwb_paths: Iterable[Path], destination: Path, bank_name: str | None = None,
+               streaming: bool | None = None, alignment: int | None = None,
+               build_date: datetime.datetime | None = None,
+               instrumentation: Instrumentation = DISABLED_INSTRUMENTATION) -> int:
+    """
+    Writes every entry of the banks at ``xwb_paths``, in order, into a new bank at ``destination``,
+    named ``bank_name`` (or after the file). Returns the number of bytes written.
+
+    Only the banks' entry tables are parsed, and their audio is copied between the files by the kernel
+    where possible (see ``WaveBankBuilder``), so memory use stays flat however much audio is merged.
+    The new bank is streaming if any of the banks are, and uses their largest alignment,
+    unless ``streaming`` or ``alignment`` are given.
+    """
+    scans = [scan_xwb(xwb_path) for xwb_path in xwb_paths]
+
+    builder = _create_builder(destination.stem if bank_name is None else bank_name, scans, streaming, alignment)
+    for scan in scans:
+        for source in get_wave_sources(scan):
+            builder.add_source(source)
+
+    return builder.write_xwb(destination, build_date=build_date, instrumentation=instrumentation)
+
+
+def split_xwb(xwb_path: Path, parts: Mapping[str, Iterable[int | str]], output_dir: Path,
+              streaming: bool | None = None, alignment: int | None = None,
+              build_date: datetime.datetime | None = None) -> list[Path]:
+    """
+    Writes the entries of the bank at ``xwb_path`` into a new bank for each of ``parts``,
+    which maps the name of each new bank to the entries (by index or name) it holds, in order.
+    Each bank is written to ``output_dir`` and named after its bank, and their paths are returned.
+
+    As with ``merge_xwbs``, the audio is copied between files without being read, and the new banks
+    keep the settings of the original unless ``streaming`` or ``alignment`` are given.
+    """
+    scan = scan_xwb(xwb_path)
+
+    # Every part is checked before anything is written
+    builders = []
+    for bank_name, entries in parts.items():
+        builder = _create_builder(bank_name, [scan], streaming, alignment)
+        for source in get_wave_sources(scan, entries):
+            builder.add_source(source)
+        builders.append(builder)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    bank_paths = []
+    for builder in builders:
+        bank_path = output_dir / f'{builder.bank_name}.xwb'
+        builder.write_xwb(bank_path, build_date=build_date)
+        bank_paths.append(bank_path)
+
+    return bank_paths
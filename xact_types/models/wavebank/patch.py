@@ -0,0 +1,170 @@
+import bisect
+import struct
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+from typing_extensions import Buffer
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.enums.wavebank_flags import WaveBankFlags
+from xact_types.models.wavebank.entry_segments import NO_SEEK_TABLE
+from xact_types.models.wavebank.layout import _SEGMENTS_OFFSET, align
+from xact_types.models.wavebank.scan import WaveBankScan, scan_xwb
+from xact_types.models.wavebank.wavebank import _ENTRY_METADATA_STRUCT
+from xact_types.utils.file_io import write_at
+from xact_types.utils.wavebank_audio_format import decode_audio_format, get_sample_count
+
+_SEGMENT_STRUCT = struct.Struct('<II')
+_UINT32_STRUCT = struct.Struct('<I')
+_SEEK_TABLES_SEGMENT_INDEX = 2
+_PLAY_REGION_SEGMENT_INDEX = 4
+
+
+class PatchResult(NamedTuple):
+    index: int
+    # Whether the payload was overwritten in its existing slot, rather than appended to the play region
+    in_place: bool
+    file_offset: int
+    file_length: int
+
+
+class WaveBankPatcher:
+    """
+    Replaces the audio of individual entries of an existing wave bank file, without rewriting the rest of the bank.
+
+    A payload that fits in its entry's slot (up to the start of the next entry) is overwritten in place,
+    as is any payload for the last entry of the play region, which extends the region if needed.
+    Otherwise it is appended to the end of the play region, leaving the old slot unused.
+    Either way, only the payload, the entry's metadata row and (if the play region grows) the play region's
+    segment record are written, with positional writes, so a patch costs the size of the change.
+
+    Compact banks are not supported, as their entry lengths are implied by the offsets of the entries after them,
+    and neither are big-endian banks.
+    """
+
+    def __init__(self, file_path: Path):
+        self.scan: WaveBankScan = scan_xwb(file_path)
+
+        if self.scan.header.version < 42:
+            raise NotImplementedError(f'Only v42+ wave banks can be patched. (got version {self.scan.header.version})')
+        if self.scan.header.big_endian:
+            raise NotImplementedError('Big-endian wave banks can not be patched.')
+        if self.scan.data.flags & WaveBankFlags.compact_format:
+            raise NotImplementedError('Compact wave banks can not be patched.')
+        if self.scan.data.entry_metadata_element_size < _ENTRY_METADATA_STRUCT.size:
+            raise NotImplementedError(f'Entry metadata must include every field to be patched. '
+                                      f'(got {self.scan.data.entry_metadata_element_size} byte elements)')
+
+        self.alignment = self.scan.data.alignment or 1
+
+        self._file = open(file_path, 'r+b', buffering=0)
+        # Only used on platforms without `os.pwrite`
+        self._file_lock = threading.Lock()
+        self._sorted_offsets = sorted(self.scan.streams.columns['file_offset'])
+
+    def __enter__(self) -> 'WaveBankPatcher':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.scan.streams)
+
+    def close(self):
+        self._file.close()
+
+    @property
+    def play_region_length(self) -> int:
+        return self.scan.header.segments[_PLAY_REGION_SEGMENT_INDEX].length
+
+    def get_slot_capacity(self, index: int) -> int | None:
+        """
+        The largest payload entry ``index`` can hold without moving, which is 0 if its slot is shared with another entry.
+        The last entry of the play region can grow in place indefinitely, which is given as ``None``.
+        """
+        offset = self.scan.streams[index].file_offset
+
+        slot_index = bisect.bisect_right(self._sorted_offsets, offset)
+        if slot_index >= 2 and self._sorted_offsets[slot_index - 2] == offset:
+            return 0
+
+        if slot_index < len(self._sorted_offsets):
+            return self._sorted_offsets[slot_index] - offset
+
+        return None
+
+    def replace_audio_data(self, index: int, audio_data: Buffer, audio_format: int | None = None,
+                           loop_start: int | None = None, loop_length: int | None = None) -> PatchResult:
+        """
+        Replaces the audio of entry ``index`` with ``audio_data``, and optionally its format and loop region.
+
+        Appended payloads are written before the metadata pointing to them,
+        so an interrupted append leaves the old entry intact.
+
+        An entry's seek table holds positions within its old audio, so is removed (by marking the entry as having
+        none). xWMA entries can't be played without one, and it can't be rebuilt here, so they can't be patched.
+        """
+        if index < 0:
+            index += len(self)
+
+        audio_data = memoryview(audio_data).cast('B')
+        info = self.scan.streams[index]
+        old_offset = info.file_offset
+
+        new_format = info.format if audio_format is None else audio_format
+        if decode_audio_format(new_format, self.scan.header.version).codec == MiniFormatTag.Wma:
+            raise NotImplementedError('xWMA entries can not be patched, as their seek tables can not be rebuilt.')
+
+        in_place = (capacity := self.get_slot_capacity(index)) is None or len(audio_data) <= capacity
+        file_offset = old_offset if in_place else align(self.play_region_length, self.alignment)
+
+        write_at(self._file, self.scan.play_region_offset + file_offset, audio_data, self._file_lock)
+
+        if file_offset + len(audio_data) > self.play_region_length:
+            self._write_play_region_length(file_offset + len(audio_data))
+
+        info.file_length = len(audio_data)
+        info.file_offset = file_offset
+        if audio_format is not None:
+            info.format = audio_format
+        if loop_start is not None:
+            info.loop_start = loop_start
+        if loop_length is not None:
+            info.loop_length = loop_length
+
+        # Keep the entry's flags, and only update its duration if the new one can be derived
+        sample_count = get_sample_count(info.format, self.scan.header.version, info.file_length)
+        if sample_count is not None:
+            info.flags_and_duration = (info.flags_and_duration & 0xF) | (sample_count << 4)
+
+        if self.scan.seek_tables and self.scan.seek_tables[index] is not None:
+            self._remove_seek_table(index)
+
+        metadata_row = _ENTRY_METADATA_STRUCT.pack(info.flags_and_duration, info.format, info.file_offset,
+                                                   info.file_length, info.loop_start, info.loop_length)
+        write_at(self._file, self.scan.header.segments[1].offset + (index * self.scan.data.entry_metadata_element_size),
+                 metadata_row, self._file_lock)
+
+        if not in_place:
+            self._sorted_offsets.pop(bisect.bisect_left(self._sorted_offsets, old_offset))
+            bisect.insort(self._sorted_offsets, file_offset)
+
+        return PatchResult(index, in_place, file_offset, len(audio_data))
+
+    def _write_play_region_length(self, length: int):
+        segment = self.scan.header.segments[_PLAY_REGION_SEGMENT_INDEX]
+        segment.length = length
+        write_at(self._file, _SEGMENTS_OFFSET + (_PLAY_REGION_SEGMENT_INDEX * _SEGMENT_STRUCT.size),
+                 _SEGMENT_STRUCT.pack(segment.offset, segment.length), self._file_lock)
+
+    def _remove_seek_table(self, index: int):
+        segment = self.scan.header.segments[_SEEK_TABLES_SEGMENT_INDEX]
+        # The table's data is left as it is, and only the entry's offset to it is cleared
+        write_at(self._file, segment.offset + (index * _UINT32_STRUCT.size), _UINT32_STRUCT.pack(NO_SEEK_TABLE),
+                 self._file_lock)
+
+        seek_tables = list(self.scan.seek_tables)
+        seek_tables[index] = None
+        self.scan = self.scan._replace(seek_tables=tuple(seek_tables))
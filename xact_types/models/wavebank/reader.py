@@ -0,0 +1,122 @@
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple
+
+from xact_types.models.sound_effect.sound_effect import SoundEffect
+from xact_types.models.wavebank.scan import WaveBankScan, scan_xwb
+from xact_types.models.wavebank.wavebank import XwbValidationError, _get_sound_fields
+from xact_types.utils.file_io import read_at
+
+DEFAULT_MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class PayloadCacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    cached_entries: int
+    cached_bytes: int
+    max_cached_bytes: int
+
+
+class WaveBankReader:
+    """
+    Reads individual sounds from a wave bank on demand, instead of loading the whole bank.
+
+    Only the bank's layout is read when opened. Sounds are read with positional reads (``os.pread``, where available),
+    so a reader can be shared between threads, and recently read sounds are kept in an LRU cache
+    holding at most ``max_cache_bytes`` of audio data (sounds larger than this are never cached).
+    """
+
+    def __init__(self, file_path: Path, max_cache_bytes: int = DEFAULT_MAX_CACHE_BYTES):
+        self.scan: WaveBankScan = scan_xwb(file_path)
+        self.max_cache_bytes = max_cache_bytes
+
+        self._file = open(file_path, 'rb', buffering=0)
+        # Only used on platforms without `os.pread`, where reads have to share the file's position
+        self._file_lock = threading.Lock()
+
+        self._cache: OrderedDict[int, SoundEffect] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cached_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __enter__(self) -> 'WaveBankReader':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.scan.streams)
+
+    def close(self):
+        self._file.close()
+        with self._cache_lock:
+            self._cache.clear()
+            self._cached_bytes = 0
+
+    @property
+    def stats(self) -> PayloadCacheStats:
+        with self._cache_lock:
+            return PayloadCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                cached_entries=len(self._cache),
+                cached_bytes=self._cached_bytes,
+                max_cached_bytes=self.max_cache_bytes
+            )
+
+    def read_audio_data(self, index: int) -> bytes:
+        """Reads the audio data of entry ``index`` directly from the file, bypassing the cache."""
+        info = self.scan.streams[index]
+        audio_data = read_at(self._file, self.scan.play_region_offset + info.file_offset, info.file_length,
+                             self._file_lock)
+
+        if len(audio_data) != info.file_length:
+            raise XwbValidationError(f'Audio data for entry {index} runs past the end of the file. '
+                                     f'(expected {info.file_length} bytes, got {len(audio_data)})')
+
+        return audio_data
+
+    def read_sound(self, index: int) -> SoundEffect:
+        """Returns entry ``index`` as a ``SoundEffect``, from the cache if possible."""
+        if index < 0:
+            index += len(self)
+
+        with self._cache_lock:
+            if (sound := self._cache.get(index)) is not None:
+                self._cache.move_to_end(index)
+                self._hits += 1
+                return sound
+            self._misses += 1
+
+        # The read happens outside the lock, so a slow read doesn't block cache hits on other threads
+        info = self.scan.streams[index]
+        sound = SoundEffect(**_get_sound_fields(info.format, info.loop_start, info.loop_length,
+                                                self.scan.header.version, self.read_audio_data(index)))
+
+        self._add_to_cache(index, sound)
+        return sound
+
+    def _add_to_cache(self, index: int, sound: SoundEffect):
+        size = len(sound.audio_data)
+        if size > self.max_cache_bytes:
+            return
+
+        with self._cache_lock:
+            # Another thread may have read the same sound in the meantime
+            if index in self._cache:
+                return
+
+            while self._cache and self._cached_bytes + size > self.max_cache_bytes:
+                _, evicted_sound = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted_sound.audio_data)
+                self._evictions += 1
+
+            self._cache[index] = sound
+            self._cached_bytes += size
@@ -0,0 +1,44 @@
+from array import array
+from pathlib import Path
+from typing import NamedTuple
+
+from xact_types.models.wavebank.entry_segments import get_entry_name_index
+from xact_types.models.wavebank.stream_table import StreamTable
+from xact_types.models.wavebank.wavebank import WaveBank
+from xact_types.models.wavebank.wavebank_data import WaveBankData
+from xact_types.models.wavebank.wavebank_header import WaveBankHeader
+
+
+class WaveBankScan(NamedTuple):
+    """The layout of a wave bank - everything ``WaveBank`` holds, except the sounds themselves."""
+    file_name: Path
+    header: WaveBankHeader
+    data: WaveBankData
+    streams: StreamTable
+    play_region_offset: int
+    streaming: bool
+    entry_names: tuple[str, ...]
+    seek_tables: tuple[array | None, ...]
+    # Maps each entry name to its index (see `get_entry_name_index`)
+    entry_name_index: dict[str, int]
+
+
+def scan_xwb(file_path: Path) -> WaveBankScan:
+    """
+    Reads the header, bank data and entry table of the XWB file at ``file_path``, without reading any audio data.
+    """
+    with open(file_path, 'rb') as xwb_file:
+        (xwb_header, xwb_data, stream_table, entry_names, seek_tables, play_region_offset,
+         is_streaming_bank) = WaveBank._read_layout(xwb_file)
+
+    return WaveBankScan(
+        file_name=file_path,
+        header=xwb_header,
+        data=xwb_data,
+        streams=stream_table,
+        play_region_offset=play_region_offset,
+        streaming=is_streaming_bank,
+        entry_names=entry_names,
+        seek_tables=seek_tables,
+        entry_name_index=get_entry_name_index(entry_names)
+    )
@@ -0,0 +1,153 @@
+from array import array
+from typing import Iterable, Iterator, Sequence
+
+from xact_types.models.utils import construct_trusted
+from xact_types.models.wavebank.stream_info import StreamInfo
+from xact_types.utils.arrays import UINT32_ARRAY_TYPECODE
+
+STREAM_TABLE_FIELDS = ('flags_and_duration', 'format', 'file_offset', 'file_length', 'loop_start', 'loop_length')
+
+
+def _uint32_column(values: Iterable[int]) -> array:
+    try:
+        return array(UINT32_ARRAY_TYPECODE, values)
+    except OverflowError as e:
+        raise ValueError(f'Stream table values must fit in an unsigned 32-bit integer. ({e})') from e
+
+
+class StreamTableRow:
+    """
+    A view of a single row of a ``StreamTable``, exposing the same fields as ``StreamInfo``.
+
+    Reading or writing a field goes straight to the table's columns, so rows are cheap to create and never go stale.
+    """
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: 'StreamTable', index: int):
+        self._table = table
+        self._index = index
+
+    def __getattr__(self, name: str) -> int:
+        if name in STREAM_TABLE_FIELDS:
+            return self._table.columns[name][self._index]
+        raise AttributeError(name)
+
+    def __setattr__(self, name: str, value: int):
+        if name in STREAM_TABLE_FIELDS:
+            try:
+                self._table.columns[name][self._index] = value
+            except OverflowError as e:
+                raise ValueError(f'`{name}` must fit in an unsigned 32-bit integer. (got {value})') from e
+        else:
+            super().__setattr__(name, value)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (StreamTableRow, StreamInfo)):
+            return self.model_dump() == other.model_dump()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'StreamTableRow({", ".join(f"{k}={v}" for k, v in self.model_dump().items())})'
+
+    def model_dump(self) -> dict[str, int]:
+        return {name: self._table.columns[name][self._index] for name in STREAM_TABLE_FIELDS}
+
+    def to_stream_info(self) -> StreamInfo:
+        return StreamInfo(**self.model_dump())
+
+
+class StreamTable(Sequence[StreamTableRow]):
+    """
+    A compact, column-oriented alternative to a tuple of ``StreamInfo`` models.
+
+    Each ``StreamInfo`` field is stored as its own array of unsigned 32-bit integers (24 bytes per entry in total),
+    so whole-table queries run over contiguous arrays instead of model instances.
+    Indexing returns a ``StreamTableRow`` view, which reads and writes through to the columns.
+    """
+
+    def __init__(self, columns: dict[str, Iterable[int]] | None = None, length: int = 0):
+        """
+        Creates a table of ``length`` rows, with columns missing from ``columns`` filled with zeroes.
+
+        If ``length`` is not given, it is taken from the columns (which must then all be the same length).
+        """
+        columns = {} if columns is None else {name: _uint32_column(values) for name, values in columns.items()}
+
+        if unknown_fields := set(columns) - set(STREAM_TABLE_FIELDS):
+            raise ValueError(f'Unknown stream table fields: {sorted(unknown_fields)}')
+
+        if columns:
+            length = len(next(iter(columns.values())))
+        if any(len(column) != length for column in columns.values()):
+            raise ValueError('All stream table columns must be the same length.')
+
+        self.columns: dict[str, array] = {
+            name: columns.get(name, array(UINT32_ARRAY_TYPECODE, bytes(4 * length))) for name in STREAM_TABLE_FIELDS
+        }
+        self._length = length
+
+    @classmethod
+    def from_stream_infos(cls, streams: Iterable[StreamInfo]) -> 'StreamTable':
+        rows = [tuple(getattr(stream, name) for name in STREAM_TABLE_FIELDS) for stream in streams]
+        if not rows:
+            return cls()
+        return cls(dict(zip(STREAM_TABLE_FIELDS, zip(*rows))))
+
+    def to_dicts(self) -> tuple[dict[str, int], ...]:
+        rows = zip(*(self.columns[name] for name in STREAM_TABLE_FIELDS))
+        return tuple(dict(zip(STREAM_TABLE_FIELDS, values)) for values in rows)
+
+    def to_stream_infos(self, validate: bool = True) -> tuple[StreamInfo, ...]:
+        rows = zip(*(self.columns[name] for name in STREAM_TABLE_FIELDS))
+
+        if not validate:
+            # Columns can only hold unsigned 32-bit values, so every row is already a valid `StreamInfo`
+            return tuple(construct_trusted(StreamInfo, dict(zip(STREAM_TABLE_FIELDS, values))) for values in rows)
+
+        return tuple(StreamInfo(**dict(zip(STREAM_TABLE_FIELDS, values))) for values in rows)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> StreamTableRow:
+        if isinstance(index, slice):
+            raise TypeError('Stream tables do not support slicing - use `columns` for bulk access.')
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('Stream table index out of range')
+        return StreamTableRow(self, index)
+
+    def __iter__(self) -> Iterator[StreamTableRow]:
+        return (StreamTableRow(self, i) for i in range(self._length))
+
+    @property
+    def nbytes(self) -> int:
+        """The memory used by the table's values, excluding fixed per-object overhead."""
+        return sum(column.itemsize * len(column) for column in self.columns.values())
+
+    @property
+    def file_offsets(self) -> array:
+        return self.columns['file_offset']
+
+    @property
+    def file_lengths(self) -> array:
+        return self.columns['file_length']
+
+    def total_file_length(self) -> int:
+        """The total size of every entry's audio data, in bytes."""
+        return sum(self.columns['file_length'])
+
+    def indices_with_format(self, format: int) -> list[int]:
+        """Returns the index of every entry whose packed format is ``format``."""
+        formats = self.columns['format']
+        indices = []
+
+        # `array.index` scans in C, so this only loops in Python once per match
+        cur_idx = 0
+        for _ in range(formats.count(format)):
+            cur_idx = formats.index(format, cur_idx)
+            indices.append(cur_idx)
+            cur_idx += 1
+
+        return indices
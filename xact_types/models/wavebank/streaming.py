@@ -0,0 +1,139 @@
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Iterator
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.models.wavebank.scan import WaveBankScan
+from xact_types.utils.adpcm import get_adpcm_block_size, get_adpcm_samples_per_block
+from xact_types.utils.file_io import read_at
+from xact_types.utils.wavebank_audio_format import decode_audio_format, decode_v2plus_bits_per_sample_flag
+
+# Streaming banks align their entries to DVD sectors
+DEFAULT_SECTOR_SIZE = 2048
+DEFAULT_SECTORS_PER_CHUNK = 32
+
+
+def get_loop_byte_range(xwb_scan: WaveBankScan, index: int) -> tuple[int, int] | None:
+    """
+    Converts the loop region of entry ``index`` from samples into a ``(start, end)`` range of bytes within its audio,
+    or returns ``None`` if the entry doesn't loop.
+    ADPCM loops are rounded outwards to whole blocks, as blocks can only be decoded from their start.
+    """
+    info = xwb_scan.streams[index]
+    if info.loop_length == 0:
+        return None
+
+    wave_format = decode_audio_format(info.format, xwb_scan.header.version)
+
+    if wave_format.codec == MiniFormatTag.Pcm:
+        frame_size = (decode_v2plus_bits_per_sample_flag(wave_format.bits_per_sample) // 8) * wave_format.channels
+        loop_start = info.loop_start * frame_size
+        loop_end = (info.loop_start + info.loop_length) * frame_size
+    elif wave_format.codec == MiniFormatTag.Adpcm:
+        block_size = get_adpcm_block_size(wave_format.alignment, wave_format.channels)
+        samples_per_block = get_adpcm_samples_per_block(block_size, wave_format.channels)
+        loop_start = (info.loop_start // samples_per_block) * block_size
+        loop_end = -(-(info.loop_start + info.loop_length) // samples_per_block) * block_size
+    else:
+        raise NotImplementedError(f'Loop regions are not supported for {wave_format.codec.name} entries.')
+
+    return min(loop_start, info.file_length), min(loop_end, info.file_length)
+
+
+def iter_chunk_ranges(xwb_scan: WaveBankScan, index: int, chunk_size: int | None = None,
+                      loops: int | None = 0) -> Iterator[tuple[int, int]]:
+    """
+    Yields the ``(file offset, length)`` of each chunk to read to play entry ``index``.
+
+    Chunk boundaries fall on multiples of ``chunk_size`` within the file (by default, a run of sectors of the bank's
+    alignment), so reads stay sector-aligned. The entry's loop region is repeated ``loops`` extra times,
+    or forever if ``loops`` is ``None``, before the rest of the entry is played.
+    """
+    if chunk_size is None:
+        chunk_size = (xwb_scan.data.alignment or DEFAULT_SECTOR_SIZE) * DEFAULT_SECTORS_PER_CHUNK
+    if chunk_size <= 0:
+        raise ValueError(f'Chunk size must be positive. (got {chunk_size})')
+
+    info = xwb_scan.streams[index]
+    audio_start = xwb_scan.play_region_offset + info.file_offset
+
+    def iter_region(start: int, end: int) -> Iterator[tuple[int, int]]:
+        position = audio_start + start
+        region_end = audio_start + end
+        while position < region_end:
+            chunk_end = min(((position // chunk_size) + 1) * chunk_size, region_end)
+            yield position, chunk_end - position
+            position = chunk_end
+
+    loop_range = get_loop_byte_range(xwb_scan, index) if loops != 0 else None
+    if loop_range is None or loop_range[0] >= loop_range[1]:
+        yield from iter_region(0, info.file_length)
+        return
+
+    loop_start, loop_end = loop_range
+    yield from iter_region(0, loop_end)
+
+    loop_count = 0
+    while loops is None or loop_count < loops:
+        yield from iter_region(loop_start, loop_end)
+        loop_count += 1
+
+    yield from iter_region(loop_end, info.file_length)
+
+
+def iter_entry_chunks(xwb_scan: WaveBankScan, index: int, chunk_size: int | None = None,
+                      loops: int | None = 0) -> Iterator[bytes]:
+    """
+    Yields the audio of entry ``index`` in chunks (see ``iter_chunk_ranges``), so only one chunk is held at a time.
+    The file is opened for as long as the generator runs, and closed when it finishes or is closed.
+    """
+    with open(xwb_scan.file_name, 'rb', buffering=0) as xwb_file:
+        file_lock = threading.Lock()
+        for offset, length in iter_chunk_ranges(xwb_scan, index, chunk_size, loops):
+            yield read_at(xwb_file, offset, length, file_lock)
+
+
+async def aiter_entry_chunks(xwb_scan: WaveBankScan, index: int, chunk_size: int | None = None,
+                             loops: int | None = 0, prefetch: int = 2) -> AsyncIterator[bytes]:
+    """
+    An asynchronous version of ``iter_entry_chunks``, which reads chunks on a worker thread
+    so the event loop is never blocked, keeping up to ``prefetch`` chunks ahead of the consumer.
+    """
+    if prefetch < 1:
+        raise ValueError(f'At least one chunk must be prefetched. (got {prefetch})')
+
+    # The file is opened, read and closed in order on one thread, so it's only closed once every read
+    # that had already started has finished, however the consumer stops (even if it's cancelled)
+    executor = ThreadPoolExecutor(1, thread_name_prefix='xwb-stream')
+    opening = executor.submit(open, Path(xwb_scan.file_name), 'rb', buffering=0)
+    file_lock = threading.Lock()
+    chunk_ranges = iter_chunk_ranges(xwb_scan, index, chunk_size, loops)
+    pending_reads: deque[Future] = deque()
+
+    try:
+        xwb_file = await asyncio.wrap_future(opening)
+
+        def schedule_reads():
+            while len(pending_reads) < prefetch and (chunk_range := next(chunk_ranges, None)) is not None:
+                pending_reads.append(executor.submit(read_at, xwb_file, *chunk_range, file_lock))
+
+        schedule_reads()
+        while pending_reads:
+            chunk = await asyncio.wrap_future(pending_reads.popleft())
+            schedule_reads()
+            yield chunk
+
+    finally:
+        # Reads that haven't started are dropped, and the file is closed after any that have
+        for pending_read in pending_reads:
+            pending_read.cancel()
+        executor.submit(_close_opened_file, opening)
+        executor.shutdown(wait=False)
+
+
+def _close_opened_file(opening: Future):
+    if not opening.cancelled() and opening.exception() is None:
+        opening.result().close()
@@ -0,0 +1,231 @@
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, NamedTuple, Sequence
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.enums.wavebank_flags import WaveBankFlags
+from xact_types.models.wavebank.layout import read_entry_columns, read_xwb_layout
+from xact_types.utils.adpcm import ADPCM_BLOCK_HEADER_SIZE_PER_CHANNEL, get_adpcm_block_size
+from xact_types.utils.wavebank_audio_format import decode_audio_format
+
+# The kinds of finding `verify_xwb` reports, each named after the check that found it
+HEADER = 'header'
+SEGMENT_BOUNDS = 'segment_bounds'
+SEGMENT_OVERLAP = 'segment_overlap'
+PLAY_REGION_ALIGNMENT = 'play_region_alignment'
+ENTRY_TABLE = 'entry_table'
+ENTRY_BOUNDS = 'entry_bounds'
+ENTRY_ALIGNMENT = 'entry_alignment'
+ENTRY_FORMAT = 'entry_format'
+ENTRY_OVERLAP = 'entry_overlap'
+
+# The segments of v42+ banks (older banks have fewer, and are referred to by index)
+_SEGMENT_NAMES = ('BankData', 'EntryMetaData', 'SeekTables', 'EntryNames', 'EntryWaveData')
+
+# Banks are usually small, so several are handed to each worker at a time
+_VERIFY_CHUNK_SIZE = 16
+
+
+class VerificationFinding(NamedTuple):
+    check: str
+    message: str
+    # The segment or entry the finding is about (depending on ``check``), and for overlaps, the one it overlaps
+    index: int | None = None
+    other_index: int | None = None
+
+
+class VerificationResult(NamedTuple):
+    path: Path
+    findings: tuple[VerificationFinding, ...]
+
+    @property
+    def ok(self) -> bool:
+        return not self.findings
+
+
+def find_overlaps(offsets: Sequence[int], lengths: Sequence[int]) -> list[tuple[int, int]]:
+    """
+    Returns the ``(earlier index, index)`` of every pair of ranges that overlap, sweeping over them in order of offset,
+    so this takes O(n log n) time. Each range is paired with the earlier range that reaches furthest past its start.
+
+    Empty ranges never overlap, and identical ranges (e.g. entries sharing a payload) aren't reported.
+    """
+    order = sorted((index for index in range(len(offsets)) if lengths[index]),
+                   key=lambda index: (offsets[index], lengths[index]))
+
+    overlaps = []
+    furthest_index = None
+    furthest_end = 0
+    for index in order:
+        start = offsets[index]
+        end = start + lengths[index]
+
+        if furthest_index is not None and start < furthest_end and \
+                (start, end) != (offsets[furthest_index], furthest_end):
+            overlaps.append((furthest_index, index))
+
+        if furthest_index is None or end > furthest_end:
+            furthest_index, furthest_end = index, end
+
+    return overlaps
+
+
+def _get_segment_name(segment_index: int, segment_count: int) -> str:
+    if segment_count == len(_SEGMENT_NAMES):
+        return f'{_SEGMENT_NAMES[segment_index]} segment'
+    return f'segment {segment_index}'
+
+
+def _get_format_error(audio_format: int, version: int) -> str | None:
+    """Returns why the packed ``audio_format`` can't describe an entry's audio, or ``None`` if it can."""
+    wave_format = decode_audio_format(audio_format, version)
+
+    if wave_format.channels == 0:
+        return 'it has no channels'
+    if wave_format.rate == 0:
+        return 'it has a sample rate of 0'
+    if wave_format.codec == MiniFormatTag.Adpcm and \
+            get_adpcm_block_size(wave_format.alignment, wave_format.channels) <= \
+            ADPCM_BLOCK_HEADER_SIZE_PER_CHANNEL * wave_format.channels:
+        return f'its ADPCM blocks are too small to hold any samples (alignment {wave_format.alignment})'
+
+    return None
+
+
+def verify_xwb(xwb_path: Path) -> VerificationResult:
+    """
+    Checks the structure of the bank at ``xwb_path``, without reading any audio, and returns everything wrong with it.
+
+    The header is read as it is by ``WaveBank.from_xwb`` (with ``read_xwb_layout``), then the bank is checked for
+    segments running past the end of the file or overlapping each other, an entry table cut short by the end of
+    its segment, entries running past the end of the play region or not on the bank's alignment, formats that can't
+    describe any audio, and entries whose audio overlaps (with a sweep over the entries in order of offset).
+    Each problem is returned as a ``VerificationFinding``, so a bank with several is described in full.
+    """
+    findings: list[VerificationFinding] = []
+
+    with open(xwb_path, 'rb') as xwb_file:
+        file_size = os.fstat(xwb_file.fileno()).st_size
+
+        try:
+            layout = read_xwb_layout(xwb_file)
+        except (ValueError, struct.error) as e:
+            findings.append(VerificationFinding(HEADER, f'The header could not be read: {e}'))
+            return VerificationResult(xwb_path, tuple(findings))
+
+        # Only the segments the bank's version has are checked, and a play region left at offset 0
+        # (which older banks do) is checked where it's actually read from, straight after the entry table
+        last_segment_idx = layout.last_segment_idx
+        play_region_offset = layout.play_region_offset
+        segment_ranges = list(layout.segments[:last_segment_idx + 1])
+        segment_ranges[last_segment_idx] = (play_region_offset, layout.segments[last_segment_idx][1])
+
+        for segment_index, (segment_offset, segment_length) in enumerate(segment_ranges):
+            if segment_offset + segment_length > file_size:
+                findings.append(VerificationFinding(
+                    SEGMENT_BOUNDS,
+                    f'The {_get_segment_name(segment_index, len(segment_ranges))} runs past the end of the file. '
+                    f'(ends at {segment_offset + segment_length}, file is {file_size} bytes long)',
+                    segment_index
+                ))
+
+        for earlier_index, segment_index in find_overlaps([offset for offset, _ in segment_ranges],
+                                                          [length for _, length in segment_ranges]):
+            findings.append(VerificationFinding(
+                SEGMENT_OVERLAP,
+                f'The {_get_segment_name(segment_index, len(segment_ranges))} overlaps '
+                f'the {_get_segment_name(earlier_index, len(segment_ranges))}.',
+                segment_index, earlier_index
+            ))
+
+        if layout.alignment and play_region_offset % layout.alignment:
+            findings.append(VerificationFinding(
+                PLAY_REGION_ALIGNMENT,
+                f'The play region (at {play_region_offset}) is not aligned to {layout.alignment} bytes.'
+            ))
+
+        # Only as many entries as are actually present in the file (and their segment) are checked
+        is_compact_format = (layout.flags & WaveBankFlags.compact_format) != 0
+        element_size = 4 if is_compact_format else layout.entry_metadata_element_size
+        entry_table_offset, entry_table_length = layout.segments[1]
+        available_length = max(0, min(file_size, entry_table_offset + entry_table_length) - entry_table_offset)
+        entry_count = layout.entry_count
+        if entry_count and (element_size <= 0 or entry_count * element_size > available_length):
+            entry_count = available_length // element_size if element_size > 0 else 0
+            findings.append(VerificationFinding(
+                ENTRY_TABLE, f'The entry table only has room for {entry_count} of {layout.entry_count} entries.'
+            ))
+
+        try:
+            entry_columns = read_entry_columns(xwb_file, layout._replace(entry_count=entry_count))
+        except ValueError as e:
+            findings.append(VerificationFinding(ENTRY_TABLE, f'The entry table could not be read: {e}'))
+            return VerificationResult(xwb_path, tuple(findings))
+
+    file_offsets = entry_columns.get('file_offset', [0] * entry_count)
+    file_lengths = entry_columns.get('file_length', [0] * entry_count)
+    play_region_length = layout.segments[last_segment_idx][1]
+    format_errors: dict[int, str | None] = {}
+
+    for index, (file_offset, file_length, audio_format) in enumerate(zip(file_offsets, file_lengths,
+                                                                         entry_columns['format'])):
+        if file_offset + file_length > play_region_length:
+            findings.append(VerificationFinding(
+                ENTRY_BOUNDS,
+                f'Entry {index} runs past the end of the play region. '
+                f'(ends at {file_offset + file_length}, play region is {play_region_length} bytes long)',
+                index
+            ))
+
+        if layout.alignment and file_offset % layout.alignment:
+            findings.append(VerificationFinding(
+                ENTRY_ALIGNMENT,
+                f'Entry {index} (at {file_offset}) is not aligned to {layout.alignment} bytes.',
+                index
+            ))
+
+        # Banks tend to share a handful of formats between all of their entries
+        if audio_format not in format_errors:
+            format_errors[audio_format] = _get_format_error(audio_format, layout.version)
+        if (format_error := format_errors[audio_format]) is not None:
+            findings.append(VerificationFinding(
+                ENTRY_FORMAT, f'The format of entry {index} ({audio_format:#010x}) is invalid, as {format_error}.',
+                index
+            ))
+
+    for earlier_index, index in find_overlaps(file_offsets, file_lengths):
+        findings.append(VerificationFinding(
+            ENTRY_OVERLAP, f'The audio of entry {index} overlaps the audio of entry {earlier_index}.',
+            index, earlier_index
+        ))
+
+    return VerificationResult(xwb_path, tuple(findings))
+
+
+def verify_xwbs(xwb_paths: Iterable[Path], workers: int | None = 1) -> list[VerificationResult]:
+    """
+    Verifies every bank in ``xwb_paths`` (see ``verify_xwb``), returning their results in the same order.
+    With more than one worker (or ``None``, for one per CPU), banks are verified in parallel on a process pool.
+    A bank that can't be opened is reported as a header finding, rather than stopping the others.
+    """
+    xwb_paths = list(xwb_paths)
+
+    if workers == 1 or len(xwb_paths) <= 1:
+        return [_verify_xwb_or_report(xwb_path) for xwb_path in xwb_paths]
+
+    with ProcessPoolExecutor(workers) as executor:
+        return list(executor.map(_verify_xwb_or_report, xwb_paths, chunksize=_VERIFY_CHUNK_SIZE))
+
+
+def verify_directory(xwb_dir: Path, pattern: str = '**/*.xwb', workers: int | None = None) -> list[VerificationResult]:
+    """Verifies every bank in ``xwb_dir`` matching ``pattern``, in order of path, using one worker per CPU."""
+    return verify_xwbs(sorted(xwb_dir.glob(pattern)), workers)
+
+
+def _verify_xwb_or_report(xwb_path: Path) -> VerificationResult:
+    try:
+        return verify_xwb(xwb_path)
+    except OSError as e:
+        return VerificationResult(xwb_path, (VerificationFinding(HEADER, f'The file could not be read: {e}'),))
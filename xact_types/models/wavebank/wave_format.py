@@ -1,8 +1,13 @@
+from pydantic import ConfigDict
+
 from xact_types.enums.mini_format_tag import MiniFormatTag
 from xact_types.models.utils import StrictBaseModel
 
 
 class WaveFormat(StrictBaseModel):
+    # Decoded formats are cached and shared (see `decode_audio_format`), so they must not be modified
+    model_config = ConfigDict(frozen=True)
+
     codec: MiniFormatTag
     channels: int
     rate: int
@@ -1,42 +1,203 @@
+import asyncio
+import contextlib
 import datetime
+import functools
+import io
+import mmap
+import os
 import struct
-import wave
+import threading
+from array import array
 from pathlib import Path
-from typing import BinaryIO
+from typing import BinaryIO, Iterable, Iterator, Sequence
 
-from pydantic import NonNegativeInt
+from typing_extensions import Buffer
+
+from pydantic import ConfigDict, NonNegativeInt, PrivateAttr
 
 from xact_types.enums.mini_format_tag import MiniFormatTag
 from xact_types.enums.wavebank_flags import WaveBankFlags, WaveBankTypes
+from xact_types.models.wavebank.dedup import DEFAULT_HASH_CHUNK_SIZE, PayloadDeduplication, \
+    find_duplicate_payloads
+from xact_types.models.wavebank.entry_segments import ENTRY_NAME_LENGTH, encode_entry_names, encode_seek_tables, \
+    get_entry_name_index
+from xact_types.models.wavebank.extraction import PcmExtractionJob, write_pcm_wav, run_extraction_jobs, \
+    DEFAULT_MAX_BYTES_IN_FLIGHT
+from xact_types.models.wavebank.layout import _BYTE_ORDERS, _MAGIC_NUMBERS, _SEGMENTS_OFFSET, \
+    FILETIME_EPOCH_OFFSET, XwbLayout, XwbValidationError, align, get_byte_order, read_entry_columns, \
+    read_entry_segments, read_xwb_layout
+from xact_types.models.wavebank.segments import Segment
 from xact_types.models.wavebank.stream_info import StreamInfo
+from xact_types.models.wavebank.stream_table import StreamTable
 from xact_types.models.wavebank.wavebank_data import WaveBankData
 from xact_types.models.wavebank.wavebank_header import WaveBankHeader
 from xact_types.models.sound_effect.sound_effect import SoundEffect
-from xact_types.models.utils import StrictBaseModel
-from xact_types.utils.wavebank_audio_format import decode_audio_format, decode_v2plus_bits_per_sample_flag
-
+from xact_types.models.utils import StrictBaseModel, ValidationMode, construct_trusted
+from xact_types.utils.aio import ByteBudget, run_in_thread
+from xact_types.utils.file_io import read_at
+from xact_types.utils.instrumentation import DISABLED_INSTRUMENTATION, Instrumentation
+from xact_types.utils.pcm import PcmFormat, convert_sound_effects, swap_pcm16_byte_order
+from xact_types.utils.wavebank_audio_format import decode_audio_format, decode_v2plus_bits_per_sample_flag, \
+    encode_v2plus_audio_format, get_sample_count
 
-class XwbValidationError(ValueError):
-    """Denotes a concrete error with an XWB file's contents. Should *not* be used for heuristics."""
-    pass
 
 class XwbHeuristicError(ValueError):
     pass
 
 
-def read_int32_from_stream(stream: BinaryIO) -> int:
-    return struct.unpack('<i', stream.read(4))[0]
-
-def read_uint32_from_stream(stream: BinaryIO) -> int:
-    return struct.unpack('<I', stream.read(4))[0]
+# Magic number, content and tool versions, segments, and the `WaveBankData` fields (including build time)
+_V45_HEADER_STRUCTS = {
+    byte_order: struct.Struct(byte_order + '4sii' + ('II' * 5) + 'ii64siiiIQ') for byte_order in _BYTE_ORDERS
+}
+_ENTRY_METADATA_STRUCTS = {byte_order: struct.Struct(f'{byte_order}IIIIII') for byte_order in _BYTE_ORDERS}
+# The PC layouts, which new banks are built with
+_V45_HEADER_STRUCT = _V45_HEADER_STRUCTS['<']
+_ENTRY_METADATA_STRUCT = _ENTRY_METADATA_STRUCTS['<']
+
+# The bank data follows the segments
+_BANK_DATA_OFFSET = _SEGMENTS_OFFSET + (5 * 8)
+_BANK_DATA_LENGTH = _V45_HEADER_STRUCT.size - _BANK_DATA_OFFSET
+
+# Asynchronous loads read payloads on worker threads in batches of up to this many bytes
+# (or a single larger payload), so a cancelled load stops within one batch
+DEFAULT_ASYNC_READ_BATCH_SIZE = 4 * 1024 * 1024
+
+# The play region (audio data segment) starts at a multiple of this, following the header data
+PLAY_REGION_ALIGNMENT = 2048
+
+
+def get_play_region_offset(header_length: int) -> int:
+    """Returns the offset of the play region that follows ``header_length`` bytes of header data."""
+    return max(PLAY_REGION_ALIGNMENT, align(header_length, PLAY_REGION_ALIGNMENT))
+
+
+def pack_v45_header(buffer: bytearray, segments: Sequence[int], flags: int, entry_count: int, bank_name: str,
+                    entry_name_element_size: int, alignment: int, compact_format: int, build_date: datetime.datetime,
+                    byte_order: str = '<'):
+    """
+    Packs a v45 header into the start of ``buffer``, for an entry table of ``entry_count`` full entries.
+
+    ``segments`` holds the offset and length of the `SeekTables`, `EntryNames` and play region segments in turn,
+    as the bank data and entry table are always placed straight after the segments and the header respectively.
+    """
+    _V45_HEADER_STRUCTS[byte_order].pack_into(
+        buffer, 0,
+        # A content version of 45 and tool version of 43
+        _MAGIC_NUMBERS[byte_order], 45, 43,
+        _BANK_DATA_OFFSET, _BANK_DATA_LENGTH,
+        _V45_HEADER_STRUCT.size, _ENTRY_METADATA_STRUCT.size * entry_count,
+        *segments,
+        flags, entry_count,
+        # Characters are packed individually as bytes, so latin-1 maps them 1:1
+        bank_name.encode('latin-1'),
+        _ENTRY_METADATA_STRUCT.size, entry_name_element_size,
+        alignment, compact_format,
+        # Convert POSIX time to Microsoft FILETIME
+        (int(build_date.timestamp()) * 10000000) + FILETIME_EPOCH_OFFSET
+    )
+
+
+def pack_entry_table(buffer: bytearray, entries: Iterable[tuple[int, int, int, int, int, int]],
+                     byte_order: str = '<'):
+    """Packs each entry's metadata (its ``ENTRY_METADATA_FIELDS``) into the entry table following a v45 header."""
+    entry_struct = _ENTRY_METADATA_STRUCTS[byte_order]
+    for index, entry_fields in enumerate(entries):
+        entry_struct.pack_into(buffer, _V45_HEADER_STRUCT.size + (index * entry_struct.size), *entry_fields)
+
+
+def _write_buffers(stream: BinaryIO, buffers: list[Buffer],
+                   instrumentation: Instrumentation = DISABLED_INSTRUMENTATION) -> int:
+    """
+    Writes every buffer in ``buffers`` to ``stream`` in order, without joining them first.
+
+    Unbuffered files are written with vectored ``os.writev`` calls where the platform supports them,
+    each of which is counted by ``instrumentation``.
+    """
+    if not isinstance(stream, io.FileIO) or not hasattr(os, 'writev'):
+        stream.writelines(buffers)
+        return sum(len(memoryview(buffer).cast('B')) for buffer in buffers)
+
+    max_buffers_per_call = os.sysconf('SC_IOV_MAX')
+    pending = [memoryview(buffer).cast('B') for buffer in buffers]
+    pending = [buffer for buffer in pending if len(buffer) != 0]
+
+    total_written = 0
+    cur_idx = 0
+    while cur_idx < len(pending):
+        written = os.writev(stream.fileno(), pending[cur_idx:cur_idx + max_buffers_per_call])
+        total_written += written
+        instrumentation.count_io(written)
+
+        # Skip past every buffer that was fully written, and trim the one that was only partly written (if any)
+        while cur_idx < len(pending) and written >= len(pending[cur_idx]):
+            written -= len(pending[cur_idx])
+            cur_idx += 1
+        if written:
+            pending[cur_idx] = pending[cur_idx][written:]
+
+    return total_written
+
+
+class _BufferStream:
+    """A minimal read-only, seekable stream over a ``memoryview``, so in-memory banks can share the file parser."""
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size < 0 else min(self._position + size, len(self._view))
+        data = bytes(self._view[self._position:end])
+        self._position = max(self._position, end)
+        return data
+
+    def seek(self, offset: int) -> int:
+        self._position = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._position
+
+
+def _iter_payload_columns(stream_table: StreamTable) -> Iterator[tuple[int, int, int, int, int]]:
+    """Yields each entry's file offset, file length, format, loop start and loop length."""
+    columns = stream_table.columns
+    return zip(columns['file_offset'], columns['file_length'], columns['format'],
+               columns['loop_start'], columns['loop_length'])
+
+
+def _get_sound_fields(audio_format: int, loop_start: int, loop_length: int, version: int,
+                      audio_data: bytes | memoryview) -> dict:
+    format_info = decode_audio_format(audio_format, version)
+
+    # ADPCM audio is kept encoded, and can be decoded with `xact_types.utils.adpcm`
+    assert format_info.codec in (MiniFormatTag.Pcm, MiniFormatTag.Adpcm)
+
+    return dict(
+        codec=format_info.codec,
+        audio_data=audio_data,
+        channels=format_info.channels,
+        sample_rate=format_info.rate,
+        block_alignment=format_info.alignment,
+        loop_start=loop_start,
+        loop_length=loop_length
+    )
 
 
 # TODO: Move from parsing as int32 to uint32 where applicable, and deal with all the inevitable issues it will cause
 
 class WaveBank(StrictBaseModel):
+    # Allows seek tables to be held as compact arrays
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     sounds: list[SoundEffect] | tuple[SoundEffect, ...]
     streams: tuple[StreamInfo, ...]
 
+    # The name of each entry, from the `EntryNames` segment (empty if the bank has no names)
+    entry_names: tuple[str, ...] = ()
+    # Each entry's seek table (or `None`), from the `SeekTables` segment (empty if the bank has no seek tables)
+    seek_tables: tuple[array | None, ...] = ()
+
     # bank_name: WaveBankFriendlyName
     file_name: Path
     streaming: bool
@@ -53,304 +214,603 @@ class WaveBank(StrictBaseModel):
     # is_in_use: bool
     # is_prepared: bool
 
+    # Built on first lookup, and rebuilt whenever `entry_names` is replaced
+    _entry_name_index: tuple[tuple[str, ...], dict[str, int]] | None = PrivateAttr(default=None)
+    # The memory map a lazily loaded bank's audio is read from, until the bank is closed
+    _mapping: mmap.mmap | None = PrivateAttr(default=None)
+
     # TODO: Provide `play_region_offset` updates when bank is updated?
     #  Remove in favour of function that reads data when called?
 
     @classmethod
-    def from_xwb(cls, file_path: Path) -> 'WaveBank':
-        with (open(file_path, 'rb') as xwb_file):
-
-            if (file_magic_number := xwb_file.read(4)) != b'WBND':
-                raise XwbValidationError(f"Wavebank file is missing magic number. "
-                                         f"(expected b'WBND', got {file_magic_number})")
-
-            # XWB PARSING
-            # Adapted from MonoXNA & MonoGame
-            # Originally adapted from Luigi Auriemma's unxwb
-            # (I wonder how long this comment chain will get?)
-
-            # entry_name_element_size = 0
-            # compact_format = 0
-            # alignment = 0
-            # build_time = 0
-
-            xwb_header = WaveBankHeader(version=read_int32_from_stream(xwb_file))
-            xwb_data = WaveBankData()
-
-            last_segment_idx = 4
-
-            if xwb_header.version <= 3:
-                last_segment_idx = 3
-            if xwb_header.version >= 42:
-                xwb_file.read(4)
-                # print(read_int32_from_stream(xwb_file))
-
-            for i in range(last_segment_idx + 1):
-                xwb_header.segments[i].offset = read_uint32_from_stream(xwb_file)
-                xwb_header.segments[i].length = read_uint32_from_stream(xwb_file)
-
-            # print(xwb_header)
-
-            # Move to the first segment
-            xwb_file.seek(xwb_header.segments[0].offset)
-
-            # WAVEBANKDATA:
+    def from_xwb(cls, file_path: Path, lazy: bool = False, validate: ValidationMode = 'full',
+                 instrumentation: Instrumentation = DISABLED_INSTRUMENTATION) -> 'WaveBank':
+        """
+        Parses the XWB file at ``file_path``.
+
+        By default, every entry's audio is read into memory up front.
+        If ``lazy`` is set, the file is memory-mapped instead and each sound's ``audio_data`` is a read-only
+        ``memoryview`` into the map, so only the header and entry table are read while loading
+        and payload pages are faulted in when they are first touched. The map is held until the bank is closed
+        (see ``close``, or use the bank as a context manager), or otherwise until it's garbage-collected.
+
+        ``validate`` controls how the resulting models are validated:
+
+        - ``'full'`` validates every model as it is created.
+        - ``'deferred'`` validates the whole bank in a single pass once everything has been read.
+        - ``'none'`` skips validation entirely, and should only be used for files that are known to be valid.
+
+        ``instrumentation`` records the time and work spent in each phase of parsing
+        (see ``xact_types.utils.instrumentation``), and costs next to nothing when left as the default.
+        """
+        if lazy:
+            with open(file_path, 'rb') as xwb_file:
+                # Empty files can't be mapped, so are rejected as the eager path rejects them
+                if os.fstat(xwb_file.fileno()).st_size == 0:
+                    raise XwbValidationError(f'Wavebank file is empty. ({file_path})')
+
+                # The map keeps its own handle to the file, so it stays valid after the file is closed
+                buffer = mmap.mmap(xwb_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            bank = cls.from_buffer(buffer, file_name=file_path, validate=validate, instrumentation=instrumentation)
+            bank._mapping = buffer
+            return bank
+
+        with instrumentation.open_reader(file_path) as xwb_file:
+            (xwb_header, xwb_data, stream_table, entry_names, seek_tables, play_region_offset,
+             is_streaming_bank) = cls._read_layout(xwb_file, instrumentation)
+
+            sound_fields: list[dict] = []
+            # Entries that point at the same audio share one copy of it
+            payloads: dict[tuple[int, int], bytes] = {}
+
+            with instrumentation.phase('payloads'):
+                for file_offset, file_length, audio_format, loop_start, loop_length in \
+                        _iter_payload_columns(stream_table):
+                    audio_data = payloads.get((file_offset, file_length))
+                    if audio_data is None:
+                        xwb_file.seek(file_offset + play_region_offset)
+                        audio_data = payloads[file_offset, file_length] = xwb_file.read(file_length)
+
+                        if len(audio_data) != file_length:
+                            raise XwbValidationError(f'Audio data for an entry runs past the end of the file. '
+                                                     f'(expected {file_length} bytes at offset '
+                                                     f'{file_offset + play_region_offset})')
+
+                    sound_fields.append(_get_sound_fields(audio_format, loop_start, loop_length, xwb_header.version,
+                                                          audio_data))
+
+                instrumentation.count(bytes=sum(len(payload) for payload in payloads.values()),
+                                      items=len(sound_fields))
+
+            assert len(stream_table) == len(sound_fields)
 
-            xwb_data.flags = read_int32_from_stream(xwb_file)
-            xwb_data.entry_count = read_int32_from_stream(xwb_file)
-
-            if xwb_header.version == 2 or xwb_header.version == 3:
-                bank_name_length = 16
-            else:
-                bank_name_length = 64
-
-            # Remove null bytes from bank name buffer since it's fixed length
-            xwb_data.bank_name = xwb_file.read(bank_name_length).decode('utf-8').replace('\0', '')
-
-            if xwb_header.version == 1:
-                xwb_data.entry_metadata_element_size = 20
-            else:
-                xwb_data.entry_metadata_element_size = read_int32_from_stream(xwb_file)
-                xwb_data.entry_name_element_size = read_int32_from_stream(xwb_file)
-                xwb_data.alignment = read_int32_from_stream(xwb_file)
-                wavebank_offset = xwb_header.segments[1].offset  # METADATASEGMENT
-
-            if (xwb_data.flags & WaveBankFlags.compact_format) != 0:
-                read_int32_from_stream(xwb_file)  # Compact format
-
-            play_region_offset = xwb_header.segments[last_segment_idx].offset
-            if play_region_offset == 0:
-                play_region_offset = wavebank_offset + (xwb_data.entry_count * xwb_data.entry_metadata_element_size)
-
-            segidx_entry_name = 2
-            if xwb_header.version >= 42:
-                segidx_entry_name = 3
-
-            if xwb_header.segments[segidx_entry_name].offset != 0 and xwb_header.segments[segidx_entry_name].length != 0:
-                if xwb_data.entry_name_element_size == -1:
-                    xwb_data.entry_name_element_size = 0
-
-                # Bytes initialise to 0, and then has a byte set to 0 again - unsure of reasoning, kept for parity
-                entry_name = bytearray(b'\0' * (xwb_data.entry_name_element_size + 1))
-                entry_name[xwb_data.entry_name_element_size] = 0
-
-            sounds: list[SoundEffect] = []
-            streams = tuple(StreamInfo() for _ in range(xwb_data.entry_count))
-            # Go to the first wave audio data
-            xwb_file.seek(wavebank_offset)
+        # TODO: Extract audio file names from xwb file if possible (unxwb's `xsb_names` seems like a good start)
 
-            # print(wavebank_offset)
-            # print(xwb_header.segments)
+        return cls._build(
+            validate, instrumentation, sound_fields, stream_table,
+            file_name=file_path,
+            streaming=is_streaming_bank,
+            play_region_offset=play_region_offset,
+            header=xwb_header,
+            data=xwb_data,
+            entry_names=entry_names,
+            seek_tables=seek_tables,
+        )
 
-            is_compact_format = (xwb_data.flags & WaveBankFlags.compact_format) != 0
+    def __enter__(self) -> 'WaveBank':
+        return self
 
-            if is_compact_format:
-                for i in range(xwb_data.entry_count):
-                    length = read_int32_from_stream(xwb_file)
-                    streams[i].format = MiniFormatTag(xwb_data.compact_format)
-                    streams[i].file_offset = (length & ((1 << 21) - 1)) * xwb_data.alignment
+    def __exit__(self, *_):
+        self.close()
 
-                for i in range(xwb_data.entry_count):
-                    next_offset: NonNegativeInt
-                    if i == (xwb_data.entry_count - 1):
-                        next_offset = xwb_header.segments[last_segment_idx].length
-                    else:
-                        next_offset = streams[i + 1].file_offset
+    def close(self):
+        """
+        Releases the memory map of a bank loaded with ``from_xwb(lazy=True)``, after which its sounds' audio
+        can no longer be read. Views of the audio taken from the sounds must be released first.
+        Banks that were read into memory have nothing to release.
+        """
+        if self._mapping is None:
+            return
 
-                    # The length of the current stream is by definition the space between
-                    # the current and next stream's offset
-                    streams[i].file_length = next_offset - streams[i].file_offset
+        for sound in self.sounds:
+            if isinstance(sound.audio_data, memoryview) and sound.audio_data.obj is self._mapping:
+                sound.audio_data.release()
 
-            else:
-                for i in range(xwb_data.entry_count):
-                    info = streams[i]
-
-                    if xwb_header.version == 1:
-                        info.format = read_uint32_from_stream(xwb_file)
-                        info.file_offset = read_int32_from_stream(xwb_file)
-                        info.file_length = read_int32_from_stream(xwb_file)
-                        info.loop_start = read_int32_from_stream(xwb_file)
-                        info.loop_length = read_int32_from_stream(xwb_file)
-
-                    else:
-                        info.flags_and_duration = read_int32_from_stream(xwb_file)  # Unused for this
-
-                        # Read data if the buffer includes it
-                        if xwb_data.entry_metadata_element_size >= 8:
-                            info.format = read_uint32_from_stream(xwb_file)
-                            # NOTE: The data stored here makes this a negative number when signed,
-                            # so the hex when naively converted won't be what to actually check against
-                        if xwb_data.entry_metadata_element_size >= 12:
-                            info.file_offset = read_int32_from_stream(xwb_file)
-                        if xwb_data.entry_metadata_element_size >= 16:
-                            info.file_length = read_int32_from_stream(xwb_file)
-                        if xwb_data.entry_metadata_element_size >= 20:
-                            info.loop_start = read_int32_from_stream(xwb_file)
-                        if xwb_data.entry_metadata_element_size >= 24:
-                            info.loop_length = read_int32_from_stream(xwb_file)
-
-                    # If the metadata element size isn't large enough to include all fields,
-                    # overwrite non-zero file lengths with the length of the last known segment (?)
-                    if xwb_data.entry_metadata_element_size < 24:
-                        if info.file_length != 0:
-                            info.file_length = xwb_header.segments[last_segment_idx].length
-
-            # In cases like a game engine, the sounds would only be loaded if necessary
-            # (i.e. when the sound is directly requested in the case of streaming banks, and immediately otherwise).
-            # Since this library focuses on manipulating the data as easily as possible,
-            # the audio data is loaded immediately regardless of if the wavebank calls for it.
-            is_streaming_bank = bool(xwb_data.flags & WaveBankTypes.streaming)  # Unused due to above
-
-            # if not is_streaming_bank:
-            #     print('Not streaming.')
-            # else:
-            #     print('Streaming.')
-
-            for i in range(len(streams)):
-                info = streams[i]
-
-                xwb_file.seek(info.file_offset + play_region_offset)
-                audio_data = xwb_file.read(info.file_length)
-
-                format_info = decode_audio_format(info.format, xwb_header.version)
-
-                assert format_info.codec == MiniFormatTag.Pcm
-
-                sounds.append(
-                    SoundEffect(
-                        codec=format_info.codec,
-                        audio_data=audio_data,
-                        channels=format_info.channels,
-                        sample_rate=format_info.rate,
-                        block_alignment=format_info.alignment,
-                        loop_start=info.loop_start,
-                        loop_length=info.loop_length
-                    )
-                )
-
-            assert len(streams) == len(sounds)
-            # print(sounds[0].codec.name)
+        self._mapping.close()
+        self._mapping = None
 
-        # TODO: Extract audio file names from xwb file if possible (unxwb's `xsb_names` seems like a good start)
+    @classmethod
+    async def afrom_xwb(cls, file_path: Path, lazy: bool = False, validate: ValidationMode = 'full',
+                        instrumentation: Instrumentation = DISABLED_INSTRUMENTATION,
+                        byte_budget: ByteBudget | None = None,
+                        read_batch_size: int = DEFAULT_ASYNC_READ_BATCH_SIZE) -> 'WaveBank':
+        """
+        An asynchronous version of ``from_xwb``, which never blocks the event loop.
+
+        The header and entry table are parsed, payloads are read (in batches of up to ``read_batch_size`` bytes)
+        and the models are validated on worker threads. If ``byte_budget`` is given, the bank's audio is reserved
+        from it before any is read, so loads sharing the budget hold a bounded amount of audio between them.
+
+        If the load is cancelled, it stops after the current batch, and the file is closed before
+        the cancellation continues. Entries that share a payload share one copy of it, as with ``from_xwb``.
+        """
+        if lazy:
+            return await run_in_thread(functools.partial(cls.from_xwb, file_path, lazy=True, validate=validate,
+                                                         instrumentation=instrumentation))
+
+        xwb_file = await run_in_thread(open, file_path, 'rb', discard=lambda opened_file: opened_file.close())
+        try:
+            (xwb_header, xwb_data, stream_table, entry_names, seek_tables, play_region_offset,
+             is_streaming_bank) = await run_in_thread(cls._read_layout, xwb_file, instrumentation)
+
+            payload_ranges = list(dict.fromkeys(zip(stream_table.file_offsets, stream_table.file_lengths)))
+            payload_length = sum(file_length for _, file_length in payload_ranges)
+
+            async with (contextlib.nullcontext() if byte_budget is None else byte_budget.reserve(payload_length)):
+                with instrumentation.phase('payloads'):
+                    payloads = await cls._aread_payloads(xwb_file, payload_ranges, play_region_offset,
+                                                         read_batch_size)
+                    instrumentation.count(bytes=payload_length, items=len(stream_table))
+
+                sound_fields = [
+                    _get_sound_fields(audio_format, loop_start, loop_length, xwb_header.version,
+                                      payloads[file_offset, file_length])
+                    for file_offset, file_length, audio_format, loop_start, loop_length in
+                    _iter_payload_columns(stream_table)
+                ]
+
+                return await run_in_thread(functools.partial(
+                    cls._build, validate, instrumentation, sound_fields, stream_table,
+                    file_name=file_path,
+                    streaming=is_streaming_bank,
+                    play_region_offset=play_region_offset,
+                    header=xwb_header,
+                    data=xwb_data,
+                    entry_names=entry_names,
+                    seek_tables=seek_tables,
+                ))
+
+        finally:
+            await asyncio.shield(asyncio.to_thread(xwb_file.close))
+
+    @staticmethod
+    async def _aread_payloads(xwb_file: BinaryIO, payload_ranges: list[tuple[int, int]], play_region_offset: int,
+                              read_batch_size: int) -> dict[tuple[int, int], bytes]:
+        """Reads each ``(file offset, file length)`` range of the play region, a batch at a time on worker threads."""
+        file_lock = threading.Lock()
+
+        def read_batch(batch: list[tuple[int, int]]) -> list[bytes]:
+            return [read_at(xwb_file, play_region_offset + offset, length, file_lock) for offset, length in batch]
+
+        payloads = {}
+        batch_start = 0
+        while batch_start < len(payload_ranges):
+            batch_end = batch_start + 1
+            batch_length = payload_ranges[batch_start][1]
+            while (batch_end < len(payload_ranges)
+                   and batch_length + payload_ranges[batch_end][1] <= read_batch_size):
+                batch_length += payload_ranges[batch_end][1]
+                batch_end += 1
+
+            batch = payload_ranges[batch_start:batch_end]
+            for payload_range, payload in zip(batch, await run_in_thread(read_batch, batch)):
+                if len(payload) != payload_range[1]:
+                    raise XwbValidationError(f'Audio data for an entry runs past the end of the file. '
+                                             f'(expected {payload_range[1]} bytes at offset '
+                                             f'{play_region_offset + payload_range[0]})')
+                payloads[payload_range] = payload
+
+            batch_start = batch_end
+
+        return payloads
 
-        return WaveBank(
-            sounds=sounds,
-            streams=streams,
-            file_name=file_path,
+    @classmethod
+    def from_buffer(cls, buffer: Buffer, file_name: Path = Path(), validate: ValidationMode = 'full',
+                    instrumentation: Instrumentation = DISABLED_INSTRUMENTATION) -> 'WaveBank':
+        """
+        Parses an XWB file that is already held in memory (e.g. ``bytes``, a ``memoryview`` or an ``mmap``).
+
+        No audio is copied - each sound's ``audio_data`` is a ``memoryview`` slice of ``buffer``,
+        which is kept alive for as long as any of those slices are.
+        ``validate`` and ``instrumentation`` behave as they do for ``from_xwb``.
+        """
+        view = memoryview(buffer).cast('B')
+
+        (xwb_header, xwb_data, stream_table, entry_names, seek_tables, play_region_offset,
+         is_streaming_bank) = cls._read_layout(_BufferStream(view), instrumentation)
+
+        sound_fields: list[dict] = []
+        # Entries that point at the same audio share one view of it
+        payloads: dict[tuple[int, int], memoryview] = {}
+
+        with instrumentation.phase('payloads'):
+            for file_offset, file_length, audio_format, loop_start, loop_length in _iter_payload_columns(stream_table):
+                audio_start = file_offset + play_region_offset
+                audio_data = payloads.get((file_offset, file_length))
+                if audio_data is None:
+                    audio_data = payloads[file_offset, file_length] = view[audio_start:audio_start + file_length]
+
+                if len(audio_data) != file_length:
+                    raise XwbValidationError(f'Audio data for an entry runs past the end of the buffer. '
+                                             f'(expected {file_length} bytes at offset {audio_start}, '
+                                             f'buffer is {len(view)} bytes long)')
+
+                sound_fields.append(_get_sound_fields(audio_format, loop_start, loop_length, xwb_header.version,
+                                                      audio_data))
+
+            instrumentation.count(bytes=stream_table.total_file_length(), items=len(sound_fields))
+
+        return cls._build(
+            validate, instrumentation, sound_fields, stream_table,
+            file_name=file_name,
             streaming=is_streaming_bank,
             play_region_offset=play_region_offset,
             header=xwb_header,
             data=xwb_data,
+            entry_names=entry_names,
+            seek_tables=seek_tables,
         )
 
-    def encode_as_v45_pc_xwb(self, build_date: datetime.datetime | None = None) -> bytes:
-        if self.header.segments[2].length != 0 or self.header.segments[3].length != 0:
-            raise NotImplementedError('This encoder does not currently support `SeekTables` or `EntryNames` segments.')
-
-        # This part of the header is consistent across this version of wavebank
-        # - denotes the magic number for the file, a content version of 45 and tool version of 43
-        xwb_buffer = (b'WBND'
-                      b'\x2D\x00\x00\x00'
-                      b'\x2B\x00\x00\x00')
-        # Add segment data to header
-        for count, segment in enumerate(self.header.segments):
-            segment_data = struct.pack('<ii', segment.offset, segment.length)
-            xwb_buffer += segment_data
-            # print(segment_data)
-
-        if not (self.header.segments[4].offset // 2048).is_integer():
-            raise XwbValidationError('Audio data segment should be aligned to the nearest 2048 bytes.')
-        if self.header.segments[4].offset == 0:
-            # TODO: Add functionality to calculate nearest 2048 multiple offset, possibly via class property
-            #  (theoretically, a wavebank could contain enough sounds to exceed 2048 bytes)
-            raise XwbValidationError('Audio data segment offset should not be empty. '
-                                     'TODO: Calculate automatically.')
-
-        xwb_buffer += struct.pack('<ii', self.data.flags, self.data.entry_count)
+    @classmethod
+    def _build(cls, validate: ValidationMode, instrumentation: Instrumentation, sound_fields: list[dict],
+               stream_table: StreamTable, **bank_fields) -> 'WaveBank':
+        """Creates a bank from parsed fields, validating them as requested by ``validate``."""
+        with instrumentation.phase('validation'):
+            bank = cls._build_models(validate, sound_fields, stream_table, **bank_fields)
+            instrumentation.count(items=len(sound_fields))
 
-        assert len(self.data.bank_name) <= 64
+        return bank
 
-        encoded_bank_name = b''
-        for char in self.data.bank_name:
-            encoded_bank_name += struct.pack('<B', ord(char))
+    @classmethod
+    def _build_models(cls, validate: ValidationMode, sound_fields: list[dict], stream_table: StreamTable,
+                      **bank_fields) -> 'WaveBank':
+        if validate == 'full':
+            return cls(
+                sounds=[SoundEffect(**fields) for fields in sound_fields],
+                streams=stream_table.to_stream_infos(),
+                **bank_fields
+            )
+
+        if validate == 'deferred':
+            # Nested models are given as plain data, so the whole bank is validated in a single call
+            return cls.model_validate(dict(
+                sounds=sound_fields,
+                streams=stream_table.to_dicts(),
+                **bank_fields
+            ))
+
+        if validate == 'none':
+            return cls.model_construct(
+                sounds=[construct_trusted(SoundEffect, fields) for fields in sound_fields],
+                streams=stream_table.to_stream_infos(validate=False),
+                **bank_fields
+            )
+
+        raise ValueError(f"Unknown validation mode. (expected 'none', 'deferred' or 'full', got {validate!r})")
+
+    @staticmethod
+    def _read_layout(xwb_file: BinaryIO, instrumentation: Instrumentation = DISABLED_INSTRUMENTATION
+                     ) -> tuple[WaveBankHeader, WaveBankData, StreamTable, tuple[str, ...], tuple[array | None, ...],
+                                int, bool]:
+        """
+        Reads everything in an XWB file except its audio data, leaving ``xwb_file`` at an unspecified position.
+
+        Returns the header, bank data, entry table, entry names, seek tables, play region offset
+        and whether the bank is a streaming bank.
+        The entry table is returned as a ``StreamTable``, so callers that only need the layout avoid building models.
+        """
+        with instrumentation.phase('header'):
+            layout = read_xwb_layout(xwb_file)
+            xwb_header, xwb_data = WaveBank._get_header_models(layout)
+
+        with instrumentation.phase('entry_table'):
+            stream_table = StreamTable(read_entry_columns(xwb_file, layout), length=layout.entry_count)
+            instrumentation.count(bytes=layout.entry_count * layout.entry_metadata_element_size,
+                                  items=layout.entry_count)
+
+        with instrumentation.phase('segments'):
+            entry_names, seek_tables = read_entry_segments(xwb_file, layout)
+            instrumentation.count(bytes=layout.segments[2][1] + layout.segments[3][1],
+                                  items=len(entry_names) + len(seek_tables))
+
+        # In cases like a game engine, the sounds would only be loaded if necessary
+        # (i.e. when the sound is directly requested in the case of streaming banks, and immediately otherwise).
+        # Since this library focuses on manipulating the data as easily as possible,
+        # the audio data is loaded immediately regardless of if the wavebank calls for it
+        # (streaming banks can instead be read in chunks via `xact_types.models.wavebank.streaming`).
+        is_streaming_bank = bool(layout.flags & WaveBankTypes.streaming)
+
+        # if not is_streaming_bank:
+        #     print('Not streaming.')
+        # else:
+        #     print('Streaming.')
+
+        return (xwb_header, xwb_data, stream_table, entry_names, seek_tables, layout.play_region_offset,
+                is_streaming_bank)
+
+    @staticmethod
+    def _get_header_models(layout: XwbLayout) -> tuple[WaveBankHeader, WaveBankData]:
+        """Creates the header and bank data models from the plain values read by ``read_xwb_layout``."""
+        xwb_header = WaveBankHeader(
+            version=layout.version,
+            big_endian=layout.big_endian,
+            segments=tuple(Segment(offset=offset, length=length) for offset, length in layout.segments)
+        )
+        xwb_data = WaveBankData(
+            flags=layout.flags,
+            entry_count=layout.entry_count,
+            bank_name=layout.bank_name,
+            entry_metadata_element_size=layout.entry_metadata_element_size,
+            entry_name_element_size=layout.entry_name_element_size,
+            alignment=layout.alignment,
+            compact_format=layout.compact_format,
+            build_time=layout.build_time
+        )
 
-        encoded_bank_name += b'\0' * (64 - len(encoded_bank_name))
-        xwb_buffer += encoded_bank_name
+        return xwb_header, xwb_data
+
+    def get_entry_index(self, entry_name: str) -> int:
+        """Returns the index of the entry named ``entry_name``, without scanning the bank's entries."""
+        if self._entry_name_index is None or self._entry_name_index[0] is not self.entry_names:
+            self._entry_name_index = (self.entry_names, get_entry_name_index(self.entry_names))
+
+        try:
+            return self._entry_name_index[1][entry_name]
+        except KeyError:
+            raise KeyError(f'No entry named {entry_name!r} in wave bank {self.data.bank_name!r}.') from None
+
+    def get_stream_table(self) -> StreamTable:
+        """Returns a columnar copy of ``streams``, for cheap queries over the whole entry table."""
+        return StreamTable.from_stream_infos(self.streams)
+
+    def encode_as_v45_pc_xwb(self, build_date: datetime.datetime | None = None,
+                             instrumentation: Instrumentation = DISABLED_INSTRUMENTATION,
+                             deduplicate: bool = False) -> bytes:
+        xwb_buffer = io.BytesIO()
+        self.write_xwb(xwb_buffer, build_date=build_date, instrumentation=instrumentation, deduplicate=deduplicate)
+        return xwb_buffer.getvalue()
+
+    def find_duplicate_payloads(self, chunk_size: int = DEFAULT_HASH_CHUNK_SIZE) -> PayloadDeduplication:
+        """
+        Finds entries whose audio is identical to an earlier entry's, and how many bytes storing it once saves
+        (see ``find_duplicate_payloads`` in ``xact_types.models.wavebank.dedup``).
+        """
+        return find_duplicate_payloads((sound.audio_data for sound in self.sounds), chunk_size)
+
+    def write_xwb(self, destination: BinaryIO | Path, build_date: datetime.datetime | None = None,
+                  instrumentation: Instrumentation = DISABLED_INSTRUMENTATION, big_endian: bool = False,
+                  deduplicate: bool = False) -> int:
+        """
+        Writes the bank as a v45 PC wave bank to ``destination``, either a writable binary stream or a file path.
+        If ``big_endian`` is set, the bank is instead written big-endian, as Xbox 360 banks are.
+
+        The header and entry table are packed into one small buffer, and the audio data is then written
+        straight from each sound without being copied into a buffer for the whole file.
+        16-bit PCM audio is only copied if it must be byte-swapped, i.e. if the bank was loaded in the other byte order.
+        Seek tables and entry names are written directly after the entry table, if the bank has any.
+
+        If ``deduplicate`` is set, payloads are hashed and every entry whose audio is identical to an earlier entry's
+        points at the earlier entry's copy, which is only written once (see ``find_duplicate_payloads``).
+        ``instrumentation`` records each phase of encoding, as it does for ``from_xwb``.
+        Returns the number of bytes written.
+        """
+        if self.entry_names and len(self.entry_names) != len(self.streams):
+            raise XwbValidationError(f'Every entry needs a name if any are named. '
+                                     f'(got {len(self.entry_names)} names for {len(self.streams)} entries)')
+        if self.seek_tables and len(self.seek_tables) != len(self.streams):
+            raise XwbValidationError(f'Every entry needs a seek table (or `None`) if any have one. '
+                                     f'(got {len(self.seek_tables)} seek tables for {len(self.streams)} entries)')
+
+        if self.header.segments[4].offset % PLAY_REGION_ALIGNMENT != 0:
+            raise XwbValidationError('Audio data segment should be aligned to the nearest 2048 bytes.')
 
-        xwb_buffer += struct.pack('<iiii',
-                                  self.data.entry_metadata_element_size, self.data.entry_name_element_size,
-                                  self.data.alignment, self.data.compact_format
-                                  )
+        assert len(self.data.bank_name) <= 64
+        assert len(self.streams) == len(self.sounds)
 
         # If no build time is specified, set it to the current date and time
         if build_date is None:
             build_date = datetime.datetime.now()
-        # Convert POSIX time to Microsoft FILETIME (https://devblogs.microsoft.com/oldnewthing/20220602-00/?p=106706)
-        xwb_buffer += struct.pack('<Q', (int(build_date.timestamp()) * 10000000) + 116444736000000000)
 
-        # TODO: Move sample count calculation to function
-
-        # Stores the current offset of the audio, relative to the beginning of the `EntryWaveData` segment.
-        # Essentially a counter containing the length of all audio data before each subsequent sound.
-        cur_relative_audio_offset = 0
-
-        assert len(self.streams) == len(self.sounds)
-
-        for sound, stream in zip(self.sounds, self.streams):
-            if stream.flags_and_duration != 0:
-                flags_and_duration_value = stream.flags_and_duration
+        byte_order = get_byte_order(big_endian)
+
+        # Every entry is written with full metadata, even if the bank was loaded from a compact bank
+        flags = self.data.flags & ~WaveBankFlags.compact_format
+        entry_name_element_size = self.data.entry_name_element_size
+
+        # The offset and length of each segment, of which the bank data and entry table are always placed
+        # straight after the segments and header (see `pack_v45_header`), so only the later ones are packed
+        segment_values = []
+        for segment in self.header.segments:
+            segment_values += [segment.offset, segment.length]
+
+        with instrumentation.phase('segments'):
+            seek_tables_data = b''
+            if any(seek_table is not None for seek_table in self.seek_tables):
+                seek_tables_data = encode_seek_tables(self.seek_tables, byte_order)
+
+            entry_names_data = b''
+            if self.entry_names:
+                entry_name_element_size = entry_name_element_size or ENTRY_NAME_LENGTH
+                flags |= WaveBankFlags.entry_names_included
+                try:
+                    entry_names_data = encode_entry_names(self.entry_names, entry_name_element_size)
+                except ValueError as e:
+                    raise XwbValidationError(str(e)) from e
             else:
-                flag_values = 0x0
-                decoded_format = decode_audio_format(stream.format, self.header.version)
-                # sample count is the length of the file,
-                # divided by the bytes per sample and number of channels (as a sample needs channels * bytes)
-                sample_count = (stream.file_length // (
-                        (decode_v2plus_bits_per_sample_flag(decoded_format.bits_per_sample) // 8) * decoded_format.channels))
-                flags_and_duration_value = flag_values | (sample_count << 4)
-
-            audio_length = len(sound.audio_data)
-            xwb_buffer += struct.pack('<iIIIII',
-                                      flags_and_duration_value, stream.format,
-                                      cur_relative_audio_offset, audio_length,
-                                      stream.loop_start, stream.loop_length)
-
-            cur_relative_audio_offset += audio_length
-
-        if len(xwb_buffer) > self.header.segments[4].offset:
+                # The names segment is dropped, so readers mustn't look for it
+                flags &= ~WaveBankFlags.entry_names_included
+
+            instrumentation.count(bytes=len(seek_tables_data) + len(entry_names_data),
+                                  items=len(self.seek_tables) + len(self.entry_names))
+
+        # The optional segments follow the entry table, and are marked empty if there's nothing to write
+        header_length = _V45_HEADER_STRUCT.size + (_ENTRY_METADATA_STRUCT.size * len(self.streams))
+        for segment_index, segment_data in ((2, seek_tables_data), (3, entry_names_data)):
+            if segment_data:
+                segment_values[2 * segment_index:2 * (segment_index + 1)] = [header_length, len(segment_data)]
+                header_length += len(segment_data)
+            elif segment_values[(2 * segment_index) + 1] != 0:
+                segment_values[2 * segment_index:2 * (segment_index + 1)] = [0, 0]
+
+        # An empty offset is placed at the first aligned offset after the header data
+        play_region_offset = self.header.segments[4].offset or get_play_region_offset(header_length)
+        segment_values[8] = play_region_offset
+
+        if header_length > play_region_offset:
             raise XwbValidationError(f'The header data exceeds the offset of audio data to insert into the file. '
-                                     f'(Offset is at {self.header.segments[4].offset}, '
-                                     f'header is {len(xwb_buffer)} bytes long)')
-
-        # TODO: Implement seek tables and entry names
-
-        xwb_buffer += b'\0' * (self.header.segments[4].offset - len(xwb_buffer))
-
-        for sound in self.sounds:
-            xwb_buffer += sound.audio_data
-
-        # print(struct.pack('<I', self.streams[0].format))
-
-        # xwb_buffer += b'\x00' * (32 - len(xwb_buffer))
-        return xwb_buffer
-
-    def extract_raw_pcm_sounds(self, extract_dir: Path) -> list[Path | None]:
+                                     f'(Offset is at {play_region_offset}, header is {header_length} bytes long)')
+
+        payloads = self._get_payloads(big_endian)
+        payload_sources = range(len(payloads))
+        if deduplicate:
+            with instrumentation.phase('deduplication'):
+                payload_sources = find_duplicate_payloads(payloads).sources
+                instrumentation.count(items=len(payloads))
+
+        # Each entry's offset, relative to the beginning of the `EntryWaveData` segment.
+        # Unique payloads are laid out one after another, and duplicates reuse their source's offset.
+        payload_offsets = []
+        unique_payloads = []
+        play_region_length = 0
+        for index, (payload, source) in enumerate(zip(payloads, payload_sources)):
+            if source != index:
+                payload_offsets.append(payload_offsets[source])
+                continue
+
+            payload_offsets.append(play_region_length)
+            unique_payloads.append(payload)
+            play_region_length += len(memoryview(payload).cast('B'))
+
+        segment_values[9] = play_region_length
+
+        # Padding up to the audio data is included in the buffer, as it is already zeroed
+        with instrumentation.phase('padding'):
+            header_buffer = bytearray(play_region_offset)
+            instrumentation.count(bytes=len(header_buffer) - header_length)
+
+        with instrumentation.phase('header'):
+            pack_v45_header(header_buffer, segment_values[4:], flags, len(self.streams), self.data.bank_name,
+                            entry_name_element_size, self.data.alignment, self.data.compact_format, build_date,
+                            byte_order)
+            instrumentation.count(bytes=_V45_HEADER_STRUCT.size)
+
+        with instrumentation.phase('entry_table'):
+            entry_rows = []
+            for count, (sound, stream) in enumerate(zip(self.sounds, self.streams)):
+                if stream.flags_and_duration != 0:
+                    flags_and_duration_value = stream.flags_and_duration
+                else:
+                    # Entries without a duration are given one from the length of their audio, where the codec allows
+                    sample_count = get_sample_count(stream.format, self.header.version, stream.file_length)
+                    flags_and_duration_value = (sample_count or 0) << 4
+
+                entry_rows.append((flags_and_duration_value, stream.format, payload_offsets[count],
+                                   len(sound.audio_data), stream.loop_start, stream.loop_length))
+
+            pack_entry_table(header_buffer, entry_rows, byte_order)
+            instrumentation.count(bytes=_ENTRY_METADATA_STRUCT.size * len(self.streams), items=len(self.streams))
+
+        with instrumentation.phase('segments'):
+            for segment_index, segment_data in ((2, seek_tables_data), (3, entry_names_data)):
+                if segment_data:
+                    segment_offset = segment_values[2 * segment_index]
+                    header_buffer[segment_offset:segment_offset + len(segment_data)] = segment_data
+
+        buffers = [header_buffer, *unique_payloads]
+
+        # The header buffer is written along with the audio data, so is counted as part of this phase
+        with instrumentation.phase('payloads'):
+            if isinstance(destination, Path):
+                # Unbuffered, so the header and audio data can be handed to the OS in as few calls as possible
+                with open(destination, 'wb', buffering=0) as xwb_file:
+                    written = _write_buffers(xwb_file, buffers, instrumentation)
+            else:
+                written = _write_buffers(destination, buffers, instrumentation)
+
+            instrumentation.count(bytes=play_region_length, items=len(unique_payloads))
+
+        return written
+
+    def _get_payloads(self, big_endian: bool) -> list[Buffer]:
+        """Returns each sound's audio as it should be written in the given byte order."""
+        if self.header.big_endian == big_endian:
+            return [sound.audio_data for sound in self.sounds]
+
+        # Only 16-bit PCM depends on byte order - other codecs are stored as byte streams
+        return [
+            swap_pcm16_byte_order(sound.audio_data) if self._is_pcm16(stream) else sound.audio_data
+            for sound, stream in zip(self.sounds, self.streams)
+        ]
+
+    def _is_pcm16(self, stream: StreamInfo) -> bool:
+        wave_format = decode_audio_format(stream.format, self.header.version)
+        return wave_format.codec == MiniFormatTag.Pcm and wave_format.bits_per_sample == 1
+
+    def convert_sounds(self, target: PcmFormat, indices: Iterable[int] | None = None, workers: int | None = 1):
+        """
+        Converts every sound (or those at ``indices``) to the PCM format ``target`` in one batch
+        (see ``convert_sound_effects``), updating each entry's format, length, duration and loop region to match.
+        File offsets are left as they are, since they're recalculated whenever the bank is written.
+        """
+        if self.header.version == 1:
+            raise NotImplementedError('Sounds of v1 wave banks can not be converted.')
+
+        indices = range(len(self.sounds)) if indices is None else list(indices)
+        # PCM audio is decoded at the bit depth its entry's format gives
+        bits_per_sample = [
+            decode_v2plus_bits_per_sample_flag(decode_audio_format(self.streams[index].format,
+                                                                   self.header.version).bits_per_sample)
+            for index in indices
+        ]
+        converted_sounds = convert_sound_effects((self.sounds[index] for index in indices), target,
+                                                 big_endian=self.header.big_endian, workers=workers,
+                                                 bits_per_sample=bits_per_sample)
+
+        sounds = list(self.sounds)
+        for index, sound in zip(indices, converted_sounds):
+            sounds[index] = sound
+
+            stream = self.streams[index]
+            stream.format = encode_v2plus_audio_format(MiniFormatTag.Pcm, sound.channels, sound.sample_rate,
+                                                       sound.block_alignment,
+                                                       bits_per_sample=1 if target.bits_per_sample == 16 else 0)
+            stream.file_length = len(sound.audio_data)
+            # The duration is stored in samples, above the entry's flags
+            stream.flags_and_duration = ((stream.flags_and_duration & 0xF)
+                                         | ((len(sound.audio_data) // sound.block_alignment) << 4))
+            stream.loop_start = sound.loop_start
+            stream.loop_length = sound.loop_length
+
+        self.sounds = sounds
+
+    def extract_raw_pcm_sounds(self, extract_dir: Path, workers: int = 1, use_processes: bool = False,
+                               max_bytes_in_flight: int = DEFAULT_MAX_BYTES_IN_FLIGHT) -> list[Path | None]:
+        """
+        Writes each PCM sound to ``extract_dir`` as a WAV file, returning its path (or ``None`` for other codecs).
+
+        With more than one worker, sounds are written concurrently on a thread pool
+        (or a process pool, if ``use_processes`` is set) - see ``run_extraction_jobs``.
+        """
         assert len(self.streams) == len(self.sounds)
 
-        extraction_paths: list[Path | None] = []
+        jobs: list[PcmExtractionJob | None] = []
 
         for count, sound in enumerate(self.sounds):
             if sound.codec == MiniFormatTag.Pcm:
-                sound_path = extract_dir / f'{self.data.bank_name}_sound_{count}.wav'
-
-                with wave.open(str(sound_path), 'wb') as wav_file:
-
-                    wav_file.setnchannels(sound.channels)
-                    wav_file.setframerate(sound.sample_rate)
-                    wav_file.setsampwidth(sound.channels)
-                    wav_file.writeframes(sound.audio_data)
-
-                extraction_paths.append(sound_path)
+                jobs.append(PcmExtractionJob(
+                    sound_path=extract_dir / f'{self.data.bank_name}_sound_{count}.wav',
+                    channels=sound.channels,
+                    sample_rate=sound.sample_rate,
+                    audio_data=sound.audio_data,
+                    # WAV files are always little-endian
+                    swap_byte_order=self.header.big_endian and self._is_pcm16(self.streams[count])
+                ))
             else:
-                extraction_paths.append(None)
+                jobs.append(None)
+
+        if workers == 1:
+            return [None if job is None else write_pcm_wav(job) for job in jobs]
 
-        return extraction_paths
+        return run_extraction_jobs(jobs, workers=workers, use_processes=use_processes,
+                                   max_bytes_in_flight=max_bytes_in_flight)
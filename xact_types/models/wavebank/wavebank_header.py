@@ -6,4 +6,6 @@ from xact_types.models.utils import StrictBaseModel
 
 class WaveBankHeader(StrictBaseModel):
     version: NonNegativeInt = 0
+    # Whether the bank is stored big-endian (as on the Xbox 360), which its magic number is reversed for
+    big_endian: bool = False
     segments: tuple[Segment, Segment, Segment, Segment, Segment] = tuple(Segment(offset=0, length=0) for i in range(5))
@@ -0,0 +1,150 @@
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from typing_extensions import Buffer
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.models.sound_effect.sound_effect import SoundEffect
+
+# XACT stores an ADPCM format's block alignment per channel, offset by this amount
+# (`ADPCM_MINIWAVEFORMAT_BLOCKALIGN_CONVERSION_OFFSET` in xact3wb.h)
+ADPCM_BLOCK_ALIGNMENT_OFFSET = 22
+
+# Each channel's block header is a predictor index (1 byte), then the initial delta and two samples (2 bytes each)
+ADPCM_BLOCK_HEADER_SIZE_PER_CHANNEL = 7
+
+ADPCM_COEFFICIENTS = ((256, 0), (512, -256), (0, 0), (192, 64), (240, 0), (460, -208), (392, -232))
+ADPCM_ADAPTATION_TABLE = (230, 230, 230, 230, 307, 409, 512, 614, 768, 614, 512, 409, 307, 230, 230, 230)
+
+# Nibbles are signed 4-bit values
+_SIGNED_NIBBLES = tuple(nibble - 16 if nibble >= 8 else nibble for nibble in range(16))
+
+# Map each byte to its high or low nibble, for use with `bytes.translate`
+_HIGH_NIBBLES = bytes(byte >> 4 for byte in range(256))
+_LOW_NIBBLES = bytes(byte & 0xF for byte in range(256))
+
+
+def get_adpcm_block_size(alignment: int, channels: int) -> int:
+    """Converts the block alignment stored in an ADPCM entry's packed format into a block size in bytes."""
+    return (alignment + ADPCM_BLOCK_ALIGNMENT_OFFSET) * channels
+
+
+def get_adpcm_samples_per_block(block_size: int, channels: int) -> int:
+    """The number of samples (per channel) decoded from a block of ``block_size`` bytes."""
+    return (((block_size - (ADPCM_BLOCK_HEADER_SIZE_PER_CHANNEL * channels)) * 2) // channels) + 2
+
+
+def _decode_channel_nibbles(nibbles: bytes, coefficient_1: int, coefficient_2: int, delta: int, sample_1: int,
+                            sample_2: int) -> array:
+    """Decodes one channel's nibbles (one per byte of ``nibbles``) from the given initial state."""
+    samples = array('h', bytes(2 * len(nibbles)))
+    adaptation_table = ADPCM_ADAPTATION_TABLE
+    signed_nibbles = _SIGNED_NIBBLES
+
+    for i, nibble in enumerate(nibbles):
+        predictor = (((sample_1 * coefficient_1) + (sample_2 * coefficient_2)) >> 8) + (signed_nibbles[nibble] * delta)
+
+        if predictor > 32767:
+            predictor = 32767
+        elif predictor < -32768:
+            predictor = -32768
+
+        samples[i] = predictor
+        sample_2 = sample_1
+        sample_1 = predictor
+
+        delta = (adaptation_table[nibble] * delta) >> 8
+        if delta < 16:
+            delta = 16
+
+    return samples
+
+
+def decode_ms_adpcm_blocks(data: Buffer, channels: int, block_size: int) -> array:
+    """
+    Decodes MS-ADPCM ``data`` made up of blocks of ``block_size`` bytes, returning interleaved 16-bit samples.
+    A shorter final block is decoded as far as it goes.
+    """
+    data = memoryview(data).cast('B')
+    header_struct = struct.Struct(f'<{channels}B{3 * channels}h')
+    header_size = header_struct.size
+    samples = array('h')
+
+    for block_start in range(0, len(data), block_size):
+        block = data[block_start:block_start + block_size]
+        if len(block) < header_size:
+            break
+
+        header_values = header_struct.unpack_from(block)
+        predictor_indices = header_values[:channels]
+
+        if max(predictor_indices) >= len(ADPCM_COEFFICIENTS):
+            raise ValueError(f'Invalid ADPCM predictor index in block at offset {block_start}. '
+                             f'(got {max(predictor_indices)})')
+
+        # Nibbles are stored high nibble first, alternating between channels for each nibble.
+        # They are split out with C-level `translate` and slicing, so each channel can be decoded in a tight loop.
+        nibble_bytes = block[header_size:].tobytes()
+        nibble_count = (len(nibble_bytes) * 2) - ((len(nibble_bytes) * 2) % channels)
+        nibbles = bytearray(len(nibble_bytes) * 2)
+        nibbles[0::2] = nibble_bytes.translate(_HIGH_NIBBLES)
+        nibbles[1::2] = nibble_bytes.translate(_LOW_NIBBLES)
+
+        # The block's first two samples are stored directly in its header, oldest first
+        block_samples = array('h', bytes(2 * (nibble_count + (2 * channels))))
+        block_samples[0:channels] = array('h', header_values[3 * channels:4 * channels])
+        block_samples[channels:2 * channels] = array('h', header_values[2 * channels:3 * channels])
+
+        for channel in range(channels):
+            coefficient_1, coefficient_2 = ADPCM_COEFFICIENTS[predictor_indices[channel]]
+            block_samples[(2 * channels) + channel::channels] = _decode_channel_nibbles(
+                nibbles[channel:nibble_count:channels], coefficient_1, coefficient_2,
+                delta=header_values[channels + channel],
+                sample_1=header_values[(2 * channels) + channel],
+                sample_2=header_values[(3 * channels) + channel]
+            )
+
+        samples.extend(block_samples)
+
+    return samples
+
+
+def decode_ms_adpcm(data: Buffer, channels: int, block_size: int, workers: int | None = 1,
+                    blocks_per_job: int = 256) -> bytes:
+    """
+    Decodes MS-ADPCM ``data`` into interleaved, little-endian 16-bit PCM.
+
+    Blocks are independent of each other, so with more than one worker (or ``None``, for one per CPU)
+    batches of ``blocks_per_job`` blocks are decoded in parallel on a process pool.
+    """
+    data = memoryview(data).cast('B')
+    job_size = block_size * blocks_per_job
+
+    if workers == 1 or len(data) <= job_size:
+        samples = decode_ms_adpcm_blocks(data, channels, block_size)
+    else:
+        samples = array('h')
+        with ProcessPoolExecutor(workers) as executor:
+            jobs = [bytes(data[start:start + job_size]) for start in range(0, len(data), job_size)]
+            for job_samples in executor.map(decode_ms_adpcm_blocks, jobs, [channels] * len(jobs),
+                                            [block_size] * len(jobs)):
+                samples.extend(job_samples)
+
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def decode_adpcm_sound_effect(sound: SoundEffect, workers: int | None = 1) -> SoundEffect:
+    """Returns a 16-bit PCM copy of an ADPCM ``sound``."""
+    if sound.codec != MiniFormatTag.Adpcm:
+        raise ValueError(f'Sound effect is not ADPCM. (got {sound.codec.name})')
+
+    return sound.model_copy(update=dict(
+        codec=MiniFormatTag.Pcm,
+        audio_data=decode_ms_adpcm(sound.audio_data, sound.channels,
+                                   get_adpcm_block_size(sound.block_alignment, sound.channels), workers=workers),
+        block_alignment=2 * sound.channels
+    ))
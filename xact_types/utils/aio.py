@@ -0,0 +1,61 @@
+import asyncio
+import contextlib
+from typing import AsyncIterator, Callable, TypeVar
+
+T = TypeVar('T')
+
+
+class ByteBudget:
+    """
+    Limits how many bytes concurrent tasks hold at once, e.g. the audio of banks that are being read.
+
+    Tasks ``reserve`` what they need before reading it, and wait while the total would exceed ``max_bytes``.
+    A reservation larger than ``max_bytes`` is granted once nothing else is reserved, so it runs on its own.
+    """
+
+    def __init__(self, max_bytes: int):
+        if max_bytes <= 0:
+            raise ValueError(f'Byte budget must be positive. (got {max_bytes})')
+
+        self.max_bytes = max_bytes
+        self.bytes_in_flight = 0
+        self._condition = asyncio.Condition()
+
+    @contextlib.asynccontextmanager
+    async def reserve(self, size: int) -> AsyncIterator[None]:
+        """Holds ``size`` bytes of the budget for the duration of the block, waiting until they're available."""
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self.bytes_in_flight == 0 or self.bytes_in_flight + size <= self.max_bytes
+            )
+            self.bytes_in_flight += size
+
+        try:
+            yield
+        finally:
+            # Shielded, so a cancelled task still hands its bytes back
+            await asyncio.shield(self._release(size))
+
+    async def _release(self, size: int):
+        async with self._condition:
+            self.bytes_in_flight -= size
+            self._condition.notify_all()
+
+
+async def run_in_thread(function: Callable[..., T], *args, discard: Callable[[T], object] | None = None) -> T:
+    """
+    Runs ``function`` on a worker thread, as ``asyncio.to_thread`` does.
+
+    A call that has started can't be stopped, so if the caller is cancelled, this waits for it to finish
+    before the cancellation continues. Anything the call uses (e.g. an open file) can then be cleaned up safely,
+    and anything it returned is passed to ``discard`` (e.g. to close a file it opened).
+    """
+    future = asyncio.ensure_future(asyncio.to_thread(function, *args))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait([future])
+        # Retrieving any exception stops it from being logged as unhandled
+        if not future.cancelled() and future.exception() is None and discard is not None:
+            discard(future.result())
+        raise
@@ -0,0 +1,4 @@
+from array import array
+
+# `array`'s item sizes are platform dependent, so pick whichever unsigned type is 32 bits wide
+UINT32_ARRAY_TYPECODE = next(typecode for typecode in ('I', 'L') if array(typecode).itemsize == 4)
@@ -0,0 +1,142 @@
+import os
+import sys
+import threading
+from typing import BinaryIO
+
+from typing_extensions import Buffer
+
+# The size of the buffer copies fall back to, when they can't be made by the kernel
+DEFAULT_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def read_at(file: BinaryIO, offset: int, length: int, fallback_lock: threading.Lock) -> bytes:
+    """
+    Reads up to ``length`` bytes at ``offset`` in ``file`` without relying on (or moving) the file's position,
+    so one file can be read from several threads at once. Fewer bytes are only returned at the end of the file.
+
+    On platforms without ``os.pread``, the file is read by seeking while holding ``fallback_lock``,
+    which every reader of ``file`` must share.
+    """
+    if not hasattr(os, 'pread'):
+        with fallback_lock:
+            file.seek(offset)
+            return file.read(length)
+
+    chunks = []
+    while length:
+        chunk = os.pread(file.fileno(), length, offset)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        offset += len(chunk)
+        length -= len(chunk)
+
+    return chunks[0] if len(chunks) == 1 else b''.join(chunks)
+
+
+def write_at(file: BinaryIO, offset: int, data: Buffer, fallback_lock: threading.Lock) -> int:
+    """
+    Writes all of ``data`` at ``offset`` in ``file`` without relying on (or moving) the file's position,
+    returning the number of bytes written. See ``read_at`` for the fallback on platforms without ``os.pwrite``.
+    """
+    data = memoryview(data).cast('B')
+
+    if not hasattr(os, 'pwrite'):
+        with fallback_lock:
+            file.seek(offset)
+            file.write(data)
+            return len(data)
+
+    written = 0
+    while written < len(data):
+        written += os.pwrite(file.fileno(), data[written:], offset + written)
+
+    return written
+
+
+def _get_fileno(file: BinaryIO) -> int | None:
+    try:
+        return file.fileno()
+    except (AttributeError, OSError):
+        # In-memory streams raise `io.UnsupportedOperation`, a subclass of `OSError`
+        return None
+
+
+def _copy_in_kernel(source_fd: int, destination_fd: int, offset: int, length: int, position: int) -> int:
+    """
+    Copies up to ``length`` bytes at ``offset`` of ``source_fd`` to ``position`` of ``destination_fd``
+    without them passing through user space, returning the number copied.
+    Raises ``OSError`` if neither ``os.copy_file_range`` nor ``os.sendfile`` can copy between the two files.
+    """
+    copied = 0
+
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while copied < length:
+                chunk_copied = os.copy_file_range(source_fd, destination_fd, length - copied, offset + copied,
+                                                  position + copied)
+                if not chunk_copied:
+                    return copied
+                copied += chunk_copied
+            return copied
+        except OSError:
+            # e.g. an older kernel, or files on filesystems that don't support it - `sendfile` continues from here
+            pass
+
+    if not hasattr(os, 'sendfile'):
+        raise OSError(f'Files can not be copied in the kernel on {sys.platform}.')
+
+    # `sendfile` writes at the destination's position rather than an explicit offset
+    os.lseek(destination_fd, position + copied, os.SEEK_SET)
+    while copied < length:
+        chunk_copied = os.sendfile(destination_fd, source_fd, offset + copied, length - copied)
+        if not chunk_copied:
+            break
+        copied += chunk_copied
+
+    return copied
+
+
+def copy_file_range(source: BinaryIO, destination: BinaryIO, offset: int, length: int,
+                    copy_buffer: memoryview | None = None) -> int:
+    """
+    Copies ``length`` bytes at ``offset`` of ``source`` to the current position of ``destination``,
+    leaving ``destination`` positioned after them. Returns the number of bytes copied,
+    which is only fewer than ``length`` if ``source`` ends first.
+
+    When both are files, the bytes are copied by the kernel with ``os.copy_file_range`` (or ``os.sendfile``),
+    so never enter user space. Otherwise (or if the kernel can't copy between them) they are read into
+    and written from ``copy_buffer``, one buffer's worth at a time.
+    """
+    source_fd = _get_fileno(source)
+    destination_fd = _get_fileno(destination)
+
+    copied = 0
+    if source_fd is not None and destination_fd is not None:
+        # Anything the destination has buffered must reach the file before copying after it
+        destination.flush()
+        position = destination.tell()
+
+        try:
+            copied = _copy_in_kernel(source_fd, destination_fd, offset, length, position)
+        except OSError:
+            copied = 0
+
+        # Seeking also brings the destination's idea of its position back in line with the file's
+        destination.seek(position + copied)
+        if copied or not length:
+            return copied
+
+    if copy_buffer is None:
+        copy_buffer = memoryview(bytearray(min(length, DEFAULT_COPY_CHUNK_SIZE)))
+
+    source.seek(offset)
+    while copied < length:
+        read = source.readinto(copy_buffer[:min(length - copied, len(copy_buffer))])
+        if not read:
+            break
+
+        destination.write(copy_buffer[:read])
+        copied += read
+
+    return copied
@@ -0,0 +1,138 @@
+import contextlib
+import contextvars
+import io
+import logging
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable, ContextManager, Iterator
+
+_logger = logging.getLogger(__name__)
+
+
+class PhaseStats:
+    """
+    Totals for one phase of parsing or encoding, accumulated over every time the phase ran.
+
+    ``bytes`` counts the data the phase processed, while ``io_bytes`` and ``syscalls`` count what was actually
+    read from or written to files (which differ because of buffering, and are 0 for in-memory banks).
+    """
+    __slots__ = ('seconds', 'bytes', 'items', 'io_bytes', 'syscalls', 'runs')
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.bytes = 0
+        self.items = 0
+        self.io_bytes = 0
+        self.syscalls = 0
+        self.runs = 0
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f'PhaseStats({", ".join(f"{k}={v}" for k, v in self.to_dict().items())})'
+
+
+class Instrumentation:
+    """
+    Records the wall time, data processed, file I/O and item counts of each phase of parsing or encoding a bank.
+
+    Pass an instance as the ``instrumentation`` argument of ``WaveBank.from_xwb``, ``write_xwb`` etc.,
+    then read ``phases``, export them with ``to_dict`` or ``log`` them. ``on_phase_end`` is called with
+    a phase's name and its accumulated stats whenever the phase finishes.
+    The same instance can be reused to accumulate stats over several operations, including concurrent ones
+    (on other threads or asyncio tasks), as each tracks its own current phase.
+    """
+    enabled = True
+
+    def __init__(self, on_phase_end: Callable[[str, PhaseStats], None] | None = None):
+        self.phases: dict[str, PhaseStats] = {}
+        self.on_phase_end = on_phase_end
+        # A context variable, so each thread and asyncio task counts towards the phase it's in itself
+        self._current_phase: contextvars.ContextVar[PhaseStats | None] = contextvars.ContextVar(
+            'current_phase', default=None
+        )
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[PhaseStats]:
+        """Times the enclosed code as part of phase ``name``, which any counts are added to until it ends."""
+        stats = self.phases.setdefault(name, PhaseStats())
+        phase_token = self._current_phase.set(stats)
+
+        start_time = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds += time.perf_counter() - start_time
+            stats.runs += 1
+            self._current_phase.reset(phase_token)
+
+            if self.on_phase_end is not None:
+                self.on_phase_end(name, stats)
+
+    def count(self, bytes: int = 0, items: int = 0):
+        """Adds to the counts of the current phase."""
+        if (stats := self._current_phase.get()) is not None:
+            stats.bytes += bytes
+            stats.items += items
+
+    def count_io(self, io_bytes: int, syscalls: int = 1):
+        """Adds file I/O to the current phase."""
+        if (stats := self._current_phase.get()) is not None:
+            stats.io_bytes += io_bytes
+            stats.syscalls += syscalls
+
+    def open_reader(self, file_path: Path) -> BinaryIO:
+        """Opens a file for buffered reading, as ``open`` would, counting each read towards the current phase."""
+        return io.BufferedReader(_CountingFileIO(file_path, self))
+
+    def to_dict(self) -> dict[str, dict]:
+        return {name: stats.to_dict() for name, stats in self.phases.items()}
+
+    def log(self, logger: logging.Logger = _logger, level: int = logging.INFO):
+        for name, stats in self.phases.items():
+            logger.log(level, '%s: %.3f ms, %d bytes, %d items, %d I/O bytes in %d syscalls (%d runs)',
+                       name, stats.seconds * 1000, stats.bytes, stats.items, stats.io_bytes, stats.syscalls,
+                       stats.runs)
+
+
+class _DisabledInstrumentation(Instrumentation):
+    """Records nothing, so instrumented code costs next to nothing when instrumentation isn't wanted."""
+    enabled = False
+
+    def __init__(self):
+        super().__init__()
+        self._null_phase = contextlib.nullcontext()
+
+    def phase(self, name: str) -> ContextManager:
+        return self._null_phase
+
+    def count(self, bytes: int = 0, items: int = 0):
+        pass
+
+    def count_io(self, io_bytes: int, syscalls: int = 1):
+        pass
+
+    def open_reader(self, file_path: Path) -> BinaryIO:
+        return open(file_path, 'rb')
+
+
+DISABLED_INSTRUMENTATION = _DisabledInstrumentation()
+
+
+class _CountingFileIO(io.FileIO):
+    """An unbuffered, read-only file that counts each read (i.e. each syscall) towards the current phase."""
+
+    def __init__(self, file_path: Path, instrumentation: Instrumentation):
+        super().__init__(file_path, 'rb')
+        self._instrumentation = instrumentation
+
+    def readinto(self, buffer) -> int | None:
+        read = super().readinto(buffer)
+        self._instrumentation.count_io(read or 0)
+        return read
+
+    def readall(self) -> bytes:
+        data = super().readall()
+        self._instrumentation.count_io(len(data))
+        return data
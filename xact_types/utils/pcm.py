@@ -0,0 +1,244 @@
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, NamedTuple
+
+from typing_extensions import Buffer
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.models.sound_effect.sound_effect import SoundEffect
+from xact_types.utils.adpcm import decode_ms_adpcm, get_adpcm_block_size
+
+# 8-bit PCM is unsigned and 16-bit PCM is signed, so converting between them flips the top bit of the high byte
+_TOGGLE_SIGN_BIT = bytes(byte ^ 0x80 for byte in range(256))
+
+# The largest values of the packed format's fields (see `encode_v2plus_audio_format`)
+MAX_CHANNELS = (1 << 3) - 1
+MAX_SAMPLE_RATE = (1 << 18) - 1
+MAX_ALIGNMENT = (1 << 8) - 1
+
+
+class PcmFormat(NamedTuple):
+    """The format to convert sounds to. A sample rate or channel count of ``None`` keeps each sound's own."""
+    bits_per_sample: int = 16
+    sample_rate: int | None = None
+    channels: int | None = None
+
+
+def swap_pcm16_byte_order(audio_data: Buffer) -> bytes:
+    """
+    Swaps the byte order of every 16-bit sample of ``audio_data`` (e.g. between Xbox 360 and PC banks).
+
+    The samples are swapped in bulk by ``array.byteswap``, rather than one at a time.
+    A trailing odd byte (which can't be part of a whole sample) is kept as is.
+    """
+    audio_data = memoryview(audio_data).cast('B')
+    whole_sample_length = len(audio_data) & ~1
+
+    samples = array('h')
+    samples.frombytes(audio_data[:whole_sample_length])
+    samples.byteswap()
+
+    if whole_sample_length == len(audio_data):
+        return samples.tobytes()
+    return samples.tobytes() + bytes(audio_data[whole_sample_length:])
+
+
+def decode_pcm(audio_data: Buffer, bits_per_sample: int, big_endian: bool = False) -> array:
+    """
+    Decodes 8-bit unsigned or 16-bit signed PCM into native 16-bit samples.
+    8-bit samples are scaled up to 16 bits, and a trailing partial sample is dropped.
+    """
+    audio_data = memoryview(audio_data).cast('B')
+    samples = array('h')
+
+    if bits_per_sample == 8:
+        # Each 8-bit sample becomes the high byte of a 16-bit one, with a low byte of 0
+        wide_data = bytearray(2 * len(audio_data))
+        wide_data[0 if sys.byteorder == 'big' else 1::2] = audio_data.tobytes().translate(_TOGGLE_SIGN_BIT)
+        samples.frombytes(wide_data)
+        return samples
+
+    if bits_per_sample != 16:
+        raise ValueError(f'Only 8 and 16-bit PCM is supported. (got {bits_per_sample}-bit)')
+
+    samples.frombytes(audio_data[:len(audio_data) & ~1])
+    if big_endian != (sys.byteorder == 'big'):
+        samples.byteswap()
+    return samples
+
+
+def encode_pcm(samples: array, bits_per_sample: int, big_endian: bool = False) -> bytes:
+    """Encodes native 16-bit samples as 8-bit unsigned or 16-bit signed PCM. 8-bit samples keep only the high byte."""
+    if bits_per_sample == 8:
+        high_bytes = samples.tobytes()[0 if sys.byteorder == 'big' else 1::2]
+        return high_bytes.translate(_TOGGLE_SIGN_BIT)
+
+    if bits_per_sample != 16:
+        raise ValueError(f'Only 8 and 16-bit PCM is supported. (got {bits_per_sample}-bit)')
+
+    if big_endian != (sys.byteorder == 'big'):
+        samples = array('h', samples)
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def convert_channels(samples: array, channels: int, target_channels: int) -> array:
+    """
+    Converts interleaved ``samples`` to ``target_channels`` channels.
+    Sounds are mixed down to mono by averaging their channels, and mono sounds are copied to every channel.
+    """
+    if channels == target_channels:
+        return samples
+
+    if target_channels == 1:
+        channel_samples = [samples[channel::channels] for channel in range(channels)]
+        if channels == 2:
+            return array('h', [(left + right) >> 1 for left, right in zip(*channel_samples)])
+        return array('h', [sum(frame) // channels for frame in zip(*channel_samples)])
+
+    if channels == 1:
+        converted_samples = array('h', bytes(2 * len(samples) * target_channels))
+        for channel in range(target_channels):
+            converted_samples[channel::target_channels] = samples
+        return converted_samples
+
+    raise ValueError(f'Only conversions to or from mono are supported. (got {channels} to {target_channels} channels)')
+
+
+def resample(samples: array, channels: int, sample_rate: int, target_rate: int) -> array:
+    """Resamples interleaved ``samples`` from ``sample_rate`` to ``target_rate`` by linear interpolation."""
+    if sample_rate == target_rate:
+        return samples
+
+    frame_count = len(samples) // channels
+    target_frame_count = (frame_count * target_rate) // sample_rate
+    last_frame = frame_count - 1
+
+    # Every channel is sampled at the same positions, so they're only calculated once
+    positions = [divmod(frame * sample_rate, target_rate) for frame in range(target_frame_count)]
+
+    resampled = array('h', bytes(2 * target_frame_count * channels))
+    for channel in range(channels):
+        channel_samples = samples[channel::channels]
+        resampled[channel::channels] = array('h', [
+            channel_samples[position] + (((channel_samples[position + 1] - channel_samples[position]) * remainder)
+                                         // target_rate)
+            if remainder and position < last_frame else channel_samples[position]
+            for position, remainder in positions
+        ])
+
+    return resampled
+
+
+def convert_samples(samples: array, channels: int, sample_rate: int, target: PcmFormat) -> array:
+    """Converts native 16-bit ``samples`` to the sample rate and channel count of ``target``."""
+    target_rate = target.sample_rate or sample_rate
+    target_channels = target.channels or channels
+
+    # Mixing down first (or resampling before duplicating channels) means fewer samples are resampled
+    if target_channels < channels:
+        return resample(convert_channels(samples, channels, target_channels), target_channels, sample_rate,
+                        target_rate)
+    return convert_channels(resample(samples, channels, sample_rate, target_rate), channels, target_channels)
+
+
+def convert_pcm(audio_data: Buffer, channels: int, sample_rate: int, bits_per_sample: int, target: PcmFormat,
+                big_endian: bool = False) -> bytes:
+    """Converts PCM ``audio_data`` to the bit depth, sample rate and channel count of ``target``."""
+    if (bits_per_sample, sample_rate, channels) == (target.bits_per_sample, target.sample_rate or sample_rate,
+                                                    target.channels or channels):
+        return bytes(audio_data)
+
+    samples = decode_pcm(audio_data, bits_per_sample, big_endian)
+    return encode_pcm(convert_samples(samples, channels, sample_rate, target), target.bits_per_sample, big_endian)
+
+
+def _convert_audio_data(codec: MiniFormatTag, audio_data: Buffer, channels: int, sample_rate: int,
+                        block_alignment: int, bits_per_sample: int | None, target: PcmFormat,
+                        big_endian: bool) -> bytes:
+    if codec == MiniFormatTag.Adpcm:
+        # ADPCM always decodes to little-endian 16-bit PCM, whatever the byte order of the bank
+        samples = decode_pcm(decode_ms_adpcm(audio_data, channels, get_adpcm_block_size(block_alignment, channels)),
+                             16)
+        return encode_pcm(convert_samples(samples, channels, sample_rate, target), target.bits_per_sample,
+                          big_endian)
+
+    if codec != MiniFormatTag.Pcm:
+        raise NotImplementedError(f'Only PCM and ADPCM sounds can be converted. (got {codec.name})')
+
+    if bits_per_sample is None:
+        # Without the entry's format to go by, each frame is assumed to be exactly one sample per channel
+        bits_per_sample = (8 * block_alignment) // channels
+
+    return convert_pcm(audio_data, channels, sample_rate, bits_per_sample, target, big_endian)
+
+
+def _check_target(target: PcmFormat):
+    if target.bits_per_sample not in (8, 16):
+        raise ValueError(f'Only 8 and 16-bit PCM is supported. (got {target.bits_per_sample}-bit)')
+    if target.sample_rate is not None and not 0 < target.sample_rate <= MAX_SAMPLE_RATE:
+        raise ValueError(f'Sample rate must be between 1 and {MAX_SAMPLE_RATE}. (got {target.sample_rate})')
+    if target.channels is not None and not 0 < target.channels <= MAX_CHANNELS:
+        raise ValueError(f'Channel count must be between 1 and {MAX_CHANNELS}. (got {target.channels})')
+
+
+def convert_sound_effects(sounds: Iterable[SoundEffect], target: PcmFormat, big_endian: bool = False,
+                          workers: int | None = 1,
+                          bits_per_sample: Iterable[int | None] | None = None) -> list[SoundEffect]:
+    """
+    Returns a PCM copy of each of ``sounds`` in the format ``target``, with loop regions scaled to the new sample rate.
+    ADPCM sounds are decoded first. ``big_endian`` gives the byte order of 16-bit audio, in and out.
+
+    ``bits_per_sample`` gives the bit depth of each PCM sound, as decoded from its entry's format
+    (see ``decode_v2plus_bits_per_sample_flag``). Sounds without one are assumed to have one sample
+    per channel in each block.
+
+    Sounds are independent of each other, so with more than one worker (or ``None``, for one per CPU)
+    they are converted in parallel on a process pool.
+    """
+    _check_target(target)
+    sounds = list(sounds)
+    bits_per_sample = [None] * len(sounds) if bits_per_sample is None else list(bits_per_sample)
+
+    if len(bits_per_sample) != len(sounds):
+        raise ValueError(f'Every sound needs a bit depth if any are given. '
+                         f'(got {len(bits_per_sample)} bit depths for {len(sounds)} sounds)')
+
+    job_arguments = [
+        (sound.codec, sound.audio_data, sound.channels, sound.sample_rate, sound.block_alignment, sound_bits_per_sample,
+         target, big_endian)
+        for sound, sound_bits_per_sample in zip(sounds, bits_per_sample)
+    ]
+
+    if workers == 1 or len(sounds) <= 1:
+        converted_audio = [_convert_audio_data(*arguments) for arguments in job_arguments]
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            # Views can't be sent to other processes, so are copied as they are submitted
+            converted_audio = list(executor.map(_convert_audio_data, *zip(*(
+                (codec, bytes(audio_data), *fields) for codec, audio_data, *fields in job_arguments
+            ))))
+
+    converted_sounds = []
+    for sound, audio_data in zip(sounds, converted_audio):
+        sample_rate = target.sample_rate or sound.sample_rate
+        channels = target.channels or sound.channels
+
+        converted_sounds.append(sound.model_copy(update=dict(
+            codec=MiniFormatTag.Pcm,
+            audio_data=audio_data,
+            channels=channels,
+            sample_rate=sample_rate,
+            block_alignment=(target.bits_per_sample // 8) * channels,
+            loop_start=(sound.loop_start * sample_rate) // sound.sample_rate,
+            loop_length=(sound.loop_length * sample_rate) // sound.sample_rate
+        )))
+
+    return converted_sounds
+
+
+def convert_sound_effect(sound: SoundEffect, target: PcmFormat, big_endian: bool = False,
+                         bits_per_sample: int | None = None) -> SoundEffect:
+    """Returns a PCM copy of ``sound`` in the format ``target`` (see ``convert_sound_effects``)."""
+    return convert_sound_effects([sound], target, big_endian, bits_per_sample=[bits_per_sample])[0]
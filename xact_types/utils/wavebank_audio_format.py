@@ -1,51 +1,21 @@
+import functools
+from array import array
+from typing import Iterable
+
 from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.models.wavebank.layout import decode_v2plus_bits_per_sample_flag, unpack_audio_format
 from xact_types.models.wavebank.wave_format import WaveFormat
+from xact_types.utils.adpcm import ADPCM_BLOCK_HEADER_SIZE_PER_CHANNEL, get_adpcm_block_size, \
+    get_adpcm_samples_per_block
+from xact_types.utils.arrays import UINT32_ARRAY_TYPECODE
 
 
+# Banks tend to use only a handful of distinct formats, so decoded formats are cached and shared between entries
+@functools.lru_cache(maxsize=4096)
 def decode_audio_format(format_data: int, version: int) -> WaveFormat:
-    # Data descriptions from `unxwb`
-
-    # version 1:
-    # 1 00000000 000101011000100010 0 001 0
-    # | |         |                 | |   |
-    # | |         |                 | |   wFormatTag
-    # | |         |                 | nChannels
-    # | |         |                 ???
-    # | |         nSamplesPerSec
-    # | wBlockAlign
-    # wBitsPerSample
-    if version == 1:
-        codec           = MiniFormatTag(format_data                          & ((1 << 1) - 1))
-        channels        =              (format_data >>  1)                   & ((1 << 3) - 1)
-        rate            =              (format_data >> (1 + 3 + 1))          & ((1 << 18) - 1)
-        alignment       =              (format_data >> (1 + 3 + 1 + 18))     & ((1 << 8) - 1)
-        bits_per_sample =              (format_data >> (1 + 3 + 1 + 18 + 8)) & ((1 << 1) - 1)
-
-    # versions 2, 3, 37, 42, 43, 44 and so on, check WAVEBANKMINIWAVEFORMAT in xact3wb.h
-    # 0 00000000 000111110100000000 010 01
-    # | |        |                  |   |
-    # | |        |                  |   wFormatTag
-    # | |        |                  nChannels
-    # | |        nSamplesPerSec
-    # | wBlockAlign
-    # wBitsPerSample
-    else:
-        codec           = MiniFormatTag(format_data                          & ((1 << 2) - 1))
-        channels        =              (format_data >>  2)                   & ((1 << 3) - 1)
-        rate            =              (format_data >> (2 + 3))              & ((1 << 18) - 1)
-        alignment       =              (format_data >> (2 + 3 + 18))         & ((1 << 8) - 1)
-        bits_per_sample =              (format_data >> (1 + 3 + 1 + 18 + 8)) & ((1 << 1) - 1)
-
+    codec, channels, rate, alignment, bits_per_sample = unpack_audio_format(format_data, version)
     return WaveFormat(codec=codec, channels=channels, rate=rate, alignment=alignment, bits_per_sample=bits_per_sample)
 
-def decode_v2plus_bits_per_sample_flag(bits_per_sample: int):
-    # https://github.com/NeoAxis/SDK/blob/master/Engine/Src/Core/External/DirectX/Include/xact3wb.h#L81
-    if bits_per_sample == 0:
-        return 8
-    elif bits_per_sample == 1:
-        return 16
-    else:
-        raise ValueError('Unknown bits_per_sample value')
 
 # TODO: Treat audio format data as bytes instead of an unsigned int?
 def encode_v2plus_audio_format(codec: MiniFormatTag, channels: int, rate: int, alignment: int, bits_per_sample: int):
@@ -67,3 +37,46 @@ def encode_v2plus_audio_format_from_wave_format(format_fields: WaveFormat):
         alignment=format_fields.alignment,
         bits_per_sample=format_fields.bits_per_sample
     )
+
+
+def decode_audio_formats(format_data: Iterable[int], version: int) -> list[WaveFormat]:
+    """
+    Decodes many packed formats at once, decoding each distinct value only once.
+    Entries with the same packed format share the same (immutable) ``WaveFormat``.
+    """
+    format_data = list(format_data)
+    decoded_formats = {value: decode_audio_format(value, version) for value in set(format_data)}
+    return [decoded_formats[value] for value in format_data]
+
+
+def encode_v2plus_audio_formats(wave_formats: Iterable[WaveFormat]) -> array:
+    """
+    Encodes many formats at once into an array of unsigned 32-bit values, encoding each distinct format only once.
+    """
+    wave_formats = list(wave_formats)
+    encoded_formats = {
+        wave_format: encode_v2plus_audio_format_from_wave_format(wave_format) for wave_format in set(wave_formats)
+    }
+    return array(UINT32_ARRAY_TYPECODE, (encoded_formats[wave_format] for wave_format in wave_formats))
+
+
+def get_sample_count(audio_format: int, version: int, file_length: int) -> int | None:
+    """Returns the length in samples of ``file_length`` bytes of audio, or ``None`` for codecs it can't be derived for."""
+    wave_format = decode_audio_format(audio_format, version)
+    if wave_format.channels == 0:
+        return None
+
+    if wave_format.codec == MiniFormatTag.Pcm:
+        return file_length // ((decode_v2plus_bits_per_sample_flag(wave_format.bits_per_sample) // 8)
+                               * wave_format.channels)
+
+    if wave_format.codec == MiniFormatTag.Adpcm:
+        block_size = get_adpcm_block_size(wave_format.alignment, wave_format.channels)
+        full_blocks, remainder = divmod(file_length, block_size)
+        sample_count = full_blocks * get_adpcm_samples_per_block(block_size, wave_format.channels)
+        # A shorter final block decodes as far as it goes
+        if remainder >= ADPCM_BLOCK_HEADER_SIZE_PER_CHANNEL * wave_format.channels:
+            sample_count += get_adpcm_samples_per_block(remainder, wave_format.channels)
+        return sample_count
+
+    return None
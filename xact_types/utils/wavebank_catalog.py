@@ -0,0 +1,229 @@
+import os
+import sqlite3
+import struct
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from xact_types.enums.mini_format_tag import MiniFormatTag
+from xact_types.models.wavebank.scan import WaveBankScan, scan_xwb
+from xact_types.utils.wavebank_audio_format import decode_audio_format, decode_v2plus_bits_per_sample_flag
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS banks (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    bank_name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    flags INTEGER NOT NULL,
+    entry_count INTEGER NOT NULL,
+    play_region_offset INTEGER NOT NULL,
+    streaming INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS entries (
+    bank_path TEXT NOT NULL REFERENCES banks (path) ON DELETE CASCADE,
+    entry_index INTEGER NOT NULL,
+    format INTEGER NOT NULL,
+    codec INTEGER NOT NULL,
+    channels INTEGER NOT NULL,
+    sample_rate INTEGER NOT NULL,
+    block_alignment INTEGER NOT NULL,
+    bits_per_sample INTEGER NOT NULL,
+    sample_count INTEGER,
+    duration REAL,
+    file_offset INTEGER NOT NULL,
+    file_length INTEGER NOT NULL,
+    loop_start INTEGER NOT NULL,
+    loop_length INTEGER NOT NULL,
+    PRIMARY KEY (bank_path, entry_index)
+);
+
+CREATE TABLE IF NOT EXISTS failed_banks (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    error TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS entries_by_format ON entries (sample_rate, channels, duration);
+'''
+
+
+class CatalogEntry(NamedTuple):
+    bank_path: Path
+    bank_name: str
+    entry_index: int
+    codec: MiniFormatTag
+    channels: int
+    sample_rate: int
+    block_alignment: int
+    bits_per_sample: int
+    sample_count: int | None
+    duration: float | None
+    file_offset: int
+    file_length: int
+    loop_start: int
+    loop_length: int
+
+
+class CatalogFailure(NamedTuple):
+    bank_path: Path
+    error: str
+
+
+def get_entry_sample_count(flags_and_duration: int, file_length: int, codec: MiniFormatTag, channels: int,
+                           bits_per_sample: int) -> int | None:
+    """
+    Returns an entry's length in samples, from its stored duration if it has one,
+    or from the size of its audio data for PCM entries otherwise. Returns ``None`` if it can't be determined.
+    """
+    if (sample_count := flags_and_duration >> 4) != 0:
+        return sample_count
+
+    if codec == MiniFormatTag.Pcm and channels != 0:
+        return file_length // ((decode_v2plus_bits_per_sample_flag(bits_per_sample) // 8) * channels)
+
+    return None
+
+
+class WaveBankCatalog:
+    """
+    A persistent SQLite index of the entries in many wave banks, so they can be queried without opening the banks.
+
+    Each bank is only rescanned when its size or modification time changes.
+    """
+
+    def __init__(self, database_path: Path | str = ':memory:'):
+        self._connection = sqlite3.connect(database_path)
+        self._connection.execute('PRAGMA foreign_keys = ON')
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> 'WaveBankCatalog':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        self._connection.close()
+
+    def update(self, xwb_paths: Iterable[Path], remove_missing: bool = False) -> int:
+        """
+        Brings the catalog up to date with the banks at ``xwb_paths``, returning how many banks were (re)scanned.
+
+        Each bank is stored in its own transaction, so a bank that can't be read doesn't stop the others.
+        It's recorded (see ``failures``) in place of anything catalogued for it before, and is only retried
+        once it changes. If ``remove_missing`` is set, banks in the catalog that aren't in ``xwb_paths``
+        are removed from it.
+        """
+        known_banks = {
+            path: (size, mtime_ns)
+            for table in ('banks', 'failed_banks')
+            for path, size, mtime_ns in self._connection.execute(f'SELECT path, size, mtime_ns FROM {table}')
+        }
+        seen_paths = set()
+        scanned_count = 0
+
+        for xwb_path in xwb_paths:
+            path_key = str(Path(xwb_path).resolve())
+            seen_paths.add(path_key)
+
+            try:
+                stat = os.stat(path_key)
+            except OSError as e:
+                self._store_failure(path_key, None, e)
+                continue
+            if known_banks.get(path_key) == (stat.st_size, stat.st_mtime_ns):
+                continue
+
+            try:
+                xwb_scan = scan_xwb(Path(path_key))
+            except (ValueError, NotImplementedError, OSError, struct.error) as e:
+                self._store_failure(path_key, stat, e)
+                continue
+
+            with self._connection:
+                self._store_scan(path_key, stat, xwb_scan)
+            scanned_count += 1
+
+        if remove_missing:
+            missing_paths = [(path,) for path in known_banks.keys() - seen_paths]
+            with self._connection:
+                self._connection.executemany('DELETE FROM banks WHERE path = ?', missing_paths)
+                self._connection.executemany('DELETE FROM failed_banks WHERE path = ?', missing_paths)
+
+        return scanned_count
+
+    def update_directory(self, directory: Path, pattern: str = '**/*.xwb') -> int:
+        """Brings the catalog up to date with every bank matching ``pattern`` in ``directory``, removing the rest."""
+        return self.update(sorted(Path(directory).glob(pattern)), remove_missing=True)
+
+    def _store_failure(self, path_key: str, stat: os.stat_result | None, error: Exception):
+        # A bank that couldn't be stat'ed is never taken as unchanged, so is retried by the next update
+        size, mtime_ns = (stat.st_size, stat.st_mtime_ns) if stat is not None else (-1, -1)
+        with self._connection:
+            self._connection.execute('DELETE FROM banks WHERE path = ?', (path_key,))
+            self._connection.execute('INSERT OR REPLACE INTO failed_banks VALUES (?, ?, ?, ?)',
+                                     (path_key, size, mtime_ns, str(error)))
+
+    def _store_scan(self, path_key: str, stat: os.stat_result, xwb_scan: WaveBankScan):
+        self._connection.execute('DELETE FROM failed_banks WHERE path = ?', (path_key,))
+        self._connection.execute('DELETE FROM banks WHERE path = ?', (path_key,))
+        self._connection.execute(
+            'INSERT INTO banks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (path_key, stat.st_size, stat.st_mtime_ns, xwb_scan.data.bank_name, xwb_scan.header.version,
+             xwb_scan.data.flags, xwb_scan.data.entry_count, xwb_scan.play_region_offset, xwb_scan.streaming)
+        )
+
+        entry_rows = []
+        for entry_index, info in enumerate(xwb_scan.streams):
+            wave_format = decode_audio_format(info.format, xwb_scan.header.version)
+            sample_count = get_entry_sample_count(info.flags_and_duration, info.file_length, wave_format.codec,
+                                                  wave_format.channels, wave_format.bits_per_sample)
+            duration = sample_count / wave_format.rate if sample_count is not None and wave_format.rate else None
+
+            entry_rows.append((
+                path_key, entry_index, info.format, wave_format.codec, wave_format.channels, wave_format.rate,
+                wave_format.alignment, wave_format.bits_per_sample, sample_count, duration,
+                info.file_offset, info.file_length, info.loop_start, info.loop_length
+            ))
+
+        self._connection.executemany('INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                     entry_rows)
+
+    def find_entries(self, codec: MiniFormatTag | None = None, sample_rate: int | None = None,
+                     channels: int | None = None, min_duration: float | None = None,
+                     max_duration: float | None = None, bank_name: str | None = None) -> list[CatalogEntry]:
+        """Returns every catalogued entry matching all the given criteria (in seconds, for durations)."""
+        conditions = []
+        parameters = []
+
+        for column, operator, value in (('codec', '=', codec), ('sample_rate', '=', sample_rate),
+                                        ('channels', '=', channels), ('duration', '>=', min_duration),
+                                        ('duration', '<=', max_duration), ('bank_name', '=', bank_name)):
+            if value is not None:
+                conditions.append(f'{column} {operator} ?')
+                parameters.append(value)
+
+        query = ('SELECT bank_path, bank_name, entry_index, codec, channels, sample_rate, block_alignment, '
+                 'bits_per_sample, sample_count, duration, file_offset, file_length, loop_start, loop_length '
+                 'FROM entries JOIN banks ON entries.bank_path = banks.path')
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY bank_path, entry_index'
+
+        return [
+            CatalogEntry(Path(row[0]), row[1], row[2], MiniFormatTag(row[3]), *row[4:])
+            for row in self._connection.execute(query, parameters)
+        ]
+
+    def bank_paths(self) -> list[Path]:
+        return [Path(path) for (path,) in self._connection.execute('SELECT path FROM banks ORDER BY path')]
+
+    def failures(self) -> list[CatalogFailure]:
+        """Returns the banks that couldn't be read when they were last scanned, and why."""
+        return [
+            CatalogFailure(Path(path), error)
+            for path, error in self._connection.execute('SELECT path, error FROM failed_banks ORDER BY path')
+        ]